@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 import auth
+import db
+import instrument
 
 # Initialize authentication state first
 auth.initialize_auth_state()
@@ -99,6 +101,14 @@ def login_page():
                             st.error(f"❌ {error_msg}")
 
 
+def count_or_dash(client, table: str, workspace=None):
+    """Cached row count of a table in a workspace, or '-' if it cannot be fetched"""
+    try:
+        return db.count_rows(client, table, workspace=workspace)
+    except Exception:
+        return "-"
+
+
 def dashboard_page():
     """Display main dashboard for authenticated users"""
     # Get user info using helper functions
@@ -120,11 +130,31 @@ def dashboard_page():
     st.markdown(f"### Selamat datang, {user_name}! 👋")
 
     # ---- METRIC BOXES ----
+    client = auth.get_supabase_client()
+    workspace = auth.get_workspace_id()
+    with instrument.phase("metrics"):
+        jumlah_kriteria = count_or_dash(client, "tb_kriteria", workspace)
+        jumlah_alternatif = count_or_dash(client, "tb_alternatif", workspace)
+
     col1, col2, col3 = st.columns(3)
-    col1.metric("Jumlah Kriteria", 5)
-    col2.metric("Jumlah Alternatif", 10)
+    col1.metric("Jumlah Kriteria", jumlah_kriteria)
+    col2.metric("Jumlah Alternatif", jumlah_alternatif)
     col3.metric("Status Sistem", "Aktif")
 
+    # ---- RANKING TERAKHIR ----
+    ringkasan = st.session_state.get("ringkasan_ranking")
+    if ringkasan:
+        berubah = any(db.table_version(t, workspace) != v for t, v in ringkasan["versi"].items())
+        st.markdown(
+            f"**Ranking terakhir** ({ringkasan['waktu']}): "
+            f"🏆 {ringkasan['terbaik']} dengan skor {ringkasan['skor']:.4f} "
+            f"dari {ringkasan['jumlah']} alternatif"
+        )
+        if berubah:
+            st.caption("⚠️ Data kriteria atau alternatif telah berubah sejak ranking ini dihitung.")
+    else:
+        st.caption("Belum ada hasil perhitungan pada sesi ini.")
+
     st.divider()
 
     # ---- MENU ----
@@ -162,11 +192,14 @@ def dashboard_page():
 
 def main():
     """Main application logic"""
+    instrument.start_run("Home")
+
     # Check authentication
     if not auth.is_authenticated():
         login_page()
     else:
         dashboard_page()
+        instrument.render_panel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+"""
+AHP module for AHP-SMART application
+Computes priority weights and consistency of pairwise comparison matrices
+"""
+
+from dataclasses import dataclass
+from typing import Union
+
+import numpy as np
+
+
+# Random Index (Saaty) untuk n = 1..15
+RANDOM_INDEX = {
+    1: 0.0, 2: 0.0, 3: 0.58, 4: 0.90, 5: 1.12,
+    6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49,
+    11: 1.51, 12: 1.48, 13: 1.56, 14: 1.57, 15: 1.59,
+}
+
+CR_THRESHOLD = 0.1
+
+WEIGHT_METHODS = ("eigenvector", "mean")
+
+# Metode bawaan semua halaman dan CLI: rata-rata kolom ternormalisasi
+DEFAULT_METHOD = "mean"
+
+
+@dataclass(frozen=True)
+class AHPResult:
+    """
+    Result of an AHP evaluation
+
+    For a single (n, n) matrix `weights` has shape (n,) and the scalar fields
+    are floats. For a stacked (k, n, n) input every field gains a leading
+    axis of length k.
+    """
+    weights: np.ndarray
+    lambda_max: Union[float, np.ndarray]
+    ci: Union[float, np.ndarray]
+    cr: Union[float, np.ndarray]
+
+    @property
+    def is_consistent(self) -> Union[bool, np.ndarray]:
+        """True where CR is within the accepted threshold (0.1)"""
+        return self.cr <= CR_THRESHOLD
+
+
+def random_index(n: int) -> float:
+    """
+    Get the Random Index for a matrix of order n
+
+    Uses Saaty's table up to n = 15 and the Alonso-Lamata linear fit
+    beyond that.
+
+    Args:
+        n: Matrix order
+
+    Returns:
+        float: Random Index
+    """
+    if n in RANDOM_INDEX:
+        return RANDOM_INDEX[n]
+    if n < 1:
+        raise ValueError(f"Ordo matriks tidak valid: {n}")
+    return (1.7699 * n - 4.3513) / (n - 1)
+
+
+def _as_matrix(matrix) -> np.ndarray:
+    """Validate input and return a float64 array of shape (..., n, n)"""
+    M = np.asarray(matrix, dtype=np.float64)
+    if M.ndim not in (2, 3) or M.shape[-1] != M.shape[-2]:
+        raise ValueError(f"Matriks harus berbentuk (n, n) atau (k, n, n), bukan {M.shape}")
+    if M.shape[-1] == 0:
+        raise ValueError("Matriks kosong")
+    if np.any(M <= 0) or not np.all(np.isfinite(M)):
+        raise ValueError("Semua elemen matriks harus bilangan positif")
+    return M
+
+
+def mean_weights(matrix) -> np.ndarray:
+    """
+    Weights by averaging the rows of the column-normalized matrix
+
+    Args:
+        matrix: Array of shape (n, n) or (k, n, n)
+
+    Returns:
+        np.ndarray: Weights of shape (n,) or (k, n)
+    """
+    M = _as_matrix(matrix)
+    norm = M / M.sum(axis=-2, keepdims=True)
+    return norm.mean(axis=-1)
+
+
+def eigenvector_weights(matrix, tol: float = 1e-12, max_iter: int = 1000) -> np.ndarray:
+    """
+    Weights from the principal eigenvector using power iteration
+
+    All matrices in a stack are iterated together until every one of them
+    has converged.
+
+    Args:
+        matrix: Array of shape (n, n) or (k, n, n)
+        tol: Convergence tolerance on the largest weight change
+        max_iter: Maximum number of iterations
+
+    Returns:
+        np.ndarray: Weights of shape (n,) or (k, n), each summing to 1
+    """
+    M = _as_matrix(matrix)
+    n = M.shape[-1]
+    w = np.full(M.shape[:-1], 1.0 / n)
+
+    for _ in range(max_iter):
+        w_next = np.matmul(M, w[..., None])[..., 0]
+        w_next /= w_next.sum(axis=-1, keepdims=True)
+        # initial=0: tumpukan kosong (0, n, n) langsung selesai
+        delta = np.abs(w_next - w).max(initial=0.0)
+        w = w_next
+        if delta < tol:
+            break
+
+    return w
+
+
+def lambda_max(matrix, weights) -> Union[float, np.ndarray]:
+    """
+    Estimate the principal eigenvalue as the mean of (A·w)_i / w_i
+
+    Args:
+        matrix: Array of shape (n, n) or (k, n, n)
+        weights: Weights of shape (n,) or (k, n)
+
+    Returns:
+        float or np.ndarray: lambda_max per matrix
+    """
+    M = _as_matrix(matrix)
+    w = np.asarray(weights, dtype=np.float64)
+    Aw = np.matmul(M, w[..., None])[..., 0]
+    lam = (Aw / w).mean(axis=-1)
+    return float(lam) if lam.ndim == 0 else lam
+
+
+def evaluate(matrix, method: str = DEFAULT_METHOD) -> AHPResult:
+    """
+    Compute weights, lambda_max, CI and CR of one or many pairwise matrices
+
+    Args:
+        matrix: Array of shape (n, n) or (k, n, n)
+        method: "eigenvector" (power iteration) or "mean" (mean of normalized columns)
+
+    Returns:
+        AHPResult: Weights and consistency measures
+    """
+    M = _as_matrix(matrix)
+    n = M.shape[-1]
+
+    if method == "eigenvector":
+        w = eigenvector_weights(M)
+    elif method == "mean":
+        w = mean_weights(M)
+    else:
+        raise ValueError(f"Metode bobot tidak dikenal: {method}")
+
+    lam = lambda_max(M, w)
+
+    if n <= 2:
+        ci = np.zeros_like(np.asarray(lam))
+        cr = np.zeros_like(ci)
+    else:
+        ci = (np.asarray(lam) - n) / (n - 1)
+        cr = ci / random_index(n)
+
+    if M.ndim == 2:
+        return AHPResult(weights=w, lambda_max=float(lam), ci=float(ci), cr=float(cr))
+    return AHPResult(weights=w, lambda_max=lam, ci=ci, cr=cr)
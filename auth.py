@@ -3,25 +3,39 @@ Authentication module for AHP-SMART application
 Handles Supabase authentication operations
 """
 
+import base64
+import json
+import time
+from contextlib import suppress
+
 import streamlit as st
-from st_supabase_connection import SupabaseConnection
+from supabase import AuthApiError, Client
 from typing import Optional, Dict, Any
 
+import instrument
+import pool
+
+
+# Refresh the access token this many seconds before it expires
+REFRESH_MARGIN_SECONDS = 60
+
+# Session entries kept on logout; everything else belongs to the previous workspace
+SESSION_KEEP_KEYS = ("debug", "instrument")
 
-def get_supabase_client() -> SupabaseConnection:
+
+def get_supabase_client() -> Client:
     """
-    Get or create Supabase connection instance
+    Get the shared Supabase client acting as the current user
+
+    The client is process-wide (see pool.py); the user's access token is
+    attached to each database request made from this script run.
     
     Returns:
-        SupabaseConnection: Supabase client instance
+        Client: Supabase client instance
     """
-    if "supabase_client" not in st.session_state:
-        st.session_state.supabase_client = st.connection(
-            name="supabase_connection",
-            type=SupabaseConnection,
-            ttl=None,
-        )
-    return st.session_state.supabase_client
+    session = st.session_state.get("session")
+    pool.set_access_token(session.get('access_token') if isinstance(session, dict) else None)
+    return instrument.wrap(pool.get_client())
 
 
 def initialize_auth_state():
@@ -79,8 +93,7 @@ def sign_in(email: str, password: str) -> tuple[bool, Optional[str]]:
     try:
         client = get_supabase_client()
         
-        # Use cached sign in for better performance
-        response = client.cached_sign_in_with_password(
+        response = client.auth.sign_in_with_password(
             dict(email=email, password=password)
         )
         
@@ -191,56 +204,193 @@ def sign_up(email: str, password: str, user_metadata: Optional[Dict[str, Any]] =
 def sign_out() -> tuple[bool, Optional[str]]:
     """
     Sign out current user
+
+    The local session is cleared even when revoking the token fails, so
+    the user is never stuck logged in.
     
     Returns:
         tuple: (success: bool, error_message: Optional[str])
     """
     try:
         client = get_supabase_client()
-        client.auth.sign_out()
-        
-        # Clear session state
-        st.session_state.logged_in = False
-        st.session_state.user = None
-        st.session_state.session = None
+        token = pool.current_access_token()
+        if token:
+            # Cabut sesi pengguna ini saja; klien dipakai bersama oleh semua sesi.
+            # Token yang kedaluwarsa atau sudah dicabut ditolak server (seperti
+            # sign_out bawaan supabase-py, ini diabaikan)
+            with suppress(AuthApiError):
+                client.auth.admin.sign_out(token)
         
         return True, None
         
     except Exception as e:
         return False, f"Logout gagal: {str(e)}"
 
+    finally:
+        # Clear session state
+        _clear_auth_state()
 
-def get_current_user() -> Optional[Dict[str, Any]]:
+
+def decode_token_claims(token: Optional[str]) -> Optional[Dict[str, Any]]:
     """
-    Get current authenticated user
-    
+    Decode the claims of a Supabase access token (JWT) without a network call
+
+    The signature is not checked here; Supabase verifies it on every
+    request that carries the token. This only tells whether the token is
+    well-formed, which user it belongs to and when it expires.
+
+    Args:
+        token: Access token
+
     Returns:
-        Optional[Dict]: User data if authenticated, None otherwise
+        Optional[Dict]: Claims, or None if the token is malformed
     """
-    if st.session_state.get("logged_in") and st.session_state.get("user"):
-        return st.session_state.user
-    
+    if not token or not isinstance(token, str):
+        return None
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + '=' * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except Exception:
+        return None
+    if not isinstance(claims, dict) or 'exp' not in claims or 'sub' not in claims:
+        return None
+    return claims
+
+
+def _extract_user_session(response: Any) -> tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Get user and session dictionaries from a Supabase auth response
+
+    Args:
+        response: AuthResponse (Pydantic model or dict)
+
+    Returns:
+        tuple: (user, session)
+    """
+    response_dict = _convert_to_dict(response) or {}
+    user = _convert_to_dict(getattr(response, 'user', None)) or response_dict.get('user')
+    session = _convert_to_dict(getattr(response, 'session', None)) or response_dict.get('session')
+    return user, session
+
+
+def _clear_auth_state():
+    """Forget the current user, the session and the data loaded for their workspace"""
+    for key in list(st.session_state.keys()):
+        if key not in SESSION_KEEP_KEYS:
+            del st.session_state[key]
+    st.session_state.logged_in = False
+    st.session_state.user = None
+    st.session_state.session = None
+    st.session_state.pop("auth_cache", None)
+    pool.set_access_token(None)
+
+
+def _refresh_session(session: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Exchange the refresh token for a new session
+
+    Args:
+        session: Current session with refresh_token
+
+    Returns:
+        Optional[Dict]: New session, or None if the refresh failed
+    """
+    refresh_token = session.get('refresh_token')
+    if not refresh_token:
+        return None
     try:
         client = get_supabase_client()
-        user_response = client.auth.get_user()
-        
-        if user_response:
-            # Convert to dict
-            user = None
-            if hasattr(user_response, 'user'):
-                user = _convert_to_dict(user_response.user)
-            else:
-                user = _convert_to_dict(user_response)
-            
-            if user:
-                st.session_state.logged_in = True
-                st.session_state.user = user
-                return user
-            
+        user, new_session = _extract_user_session(client.auth.refresh_session(refresh_token))
     except Exception:
-        pass
+        return None
+    if not new_session or not new_session.get('access_token'):
+        return None
+
+    st.session_state.session = new_session
+    if user:
+        st.session_state.user = user
+    pool.set_access_token(new_session['access_token'])
+    return new_session
+
+
+def _user_from_claims(claims: Dict[str, Any]) -> Dict[str, Any]:
+    """User dictionary built from access token claims"""
+    return {
+        'id': claims.get('sub'),
+        'email': claims.get('email'),
+        'role': claims.get('role'),
+        'user_metadata': claims.get('user_metadata') or {},
+        'app_metadata': claims.get('app_metadata') or {},
+    }
+
+
+def _resolve_user() -> Optional[Dict[str, Any]]:
+    """
+    Authenticated user from the access token in session state
+
+    The result is memoized per access token, so repeated calls within a
+    rerun (and later reruns) cost one dictionary lookup and an expiry
+    comparison. The token is refreshed once it is within
+    REFRESH_MARGIN_SECONDS of expiring; an expired token that cannot be
+    refreshed logs the user out.
+
+    Returns:
+        Optional[Dict]: User data if authenticated, None otherwise
+    """
+    session = st.session_state.get("session") or {}
+    token = session.get('access_token') if isinstance(session, dict) else None
+
+    if not token:
+        # Session tanpa token (data lama): percayai status login yang tersimpan
+        if st.session_state.get("logged_in") and st.session_state.get("user"):
+            return st.session_state.user
+        return None
+
+    cached = st.session_state.get("auth_cache")
+    now = time.time()
+    if cached and cached["token"] == token and cached["expires_at"] - now > REFRESH_MARGIN_SECONDS:
+        return cached["user"]
+
+    claims = decode_token_claims(token)
+    if claims is None:
+        _clear_auth_state()
+        return None
+
+    if claims['exp'] - now <= REFRESH_MARGIN_SECONDS:
+        refreshed = _refresh_session(session)
+        if refreshed is None:
+            if claims['exp'] <= now:
+                _clear_auth_state()
+                return None
+            # Token masih berlaku sebentar; coba refresh lagi pada rerun berikutnya
+            return st.session_state.get("user") or _user_from_claims(claims)
+        token = refreshed['access_token']
+        claims = decode_token_claims(token) or claims
+
+    user = st.session_state.get("user")
+    if not user or user.get('id') != claims.get('sub'):
+        user = _user_from_claims(claims)
+        st.session_state.user = user
+
+    st.session_state.logged_in = True
+    st.session_state.auth_cache = {"token": token, "expires_at": claims['exp'], "user": user}
+    return user
+
+
+def get_current_user() -> Optional[Dict[str, Any]]:
+    """
+    Get current authenticated user
+
+    Resolved locally from the session's access token; no network call
+    unless the token is about to expire and has to be refreshed.
     
-    return None
+    Returns:
+        Optional[Dict]: User data if authenticated, None otherwise
+    """
+    return _resolve_user()
 
 
 def get_current_session() -> Optional[Dict[str, Any]]:
@@ -250,23 +400,8 @@ def get_current_session() -> Optional[Dict[str, Any]]:
     Returns:
         Optional[Dict]: Session data if exists, None otherwise
     """
-    if st.session_state.get("session"):
-        return st.session_state.session
-    
-    try:
-        client = get_supabase_client()
-        session_response = client.auth.get_session()
-        
-        if session_response:
-            session = _convert_to_dict(session_response)
-            if session:
-                st.session_state.session = session
-                return session
-            
-    except Exception:
-        pass
-    
-    return None
+    session = st.session_state.get("session")
+    return session if isinstance(session, dict) else None
 
 
 def is_authenticated() -> bool:
@@ -276,13 +411,7 @@ def is_authenticated() -> bool:
     Returns:
         bool: True if user is logged in, False otherwise
     """
-    # First check session state
-    if st.session_state.get("logged_in"):
-        return True
-    
-    # Try to get current user from Supabase
-    user = get_current_user()
-    return user is not None
+    return get_current_user() is not None
 
 
 def require_auth():
@@ -325,3 +454,40 @@ def get_user_metadata(key: str, default: Any = None) -> Any:
         if isinstance(user_metadata, dict):
             return user_metadata.get(key, default)
     return default
+
+
+def get_user_id() -> Optional[str]:
+    """
+    Get current user's id
+
+    Returns:
+        Optional[str]: User id (UUID) or None if not authenticated
+    """
+    user = get_current_user()
+    if user and isinstance(user, dict):
+        user_id = user.get('id')
+        return str(user_id) if user_id else None
+    return None
+
+
+def get_workspace_id() -> Optional[str]:
+    """
+    Get the workspace whose data the current user reads and writes
+
+    A workspace shared by several users (e.g. the evaluators of one
+    organization) is set by an administrator in the user's app_metadata
+    as `workspace_id`; users without one work in a personal workspace
+    identified by their own user id. The database derives the same value
+    from the access token (public.current_workspace()), and its row-level
+    security policies enforce it.
+
+    Returns:
+        Optional[str]: Workspace id (UUID) or None if not authenticated
+    """
+    user = get_current_user()
+    if user and isinstance(user, dict):
+        app_metadata = user.get('app_metadata') or {}
+        workspace_id = app_metadata.get('workspace_id') if isinstance(app_metadata, dict) else None
+        if workspace_id:
+            return str(workspace_id)
+    return get_user_id()
@@ -0,0 +1,216 @@
+"""
+In-memory stand-in for the Supabase/PostgREST client used by the benchmarks
+
+Implements the subset of the query-builder API the application uses and
+counts every round-trip (each execute() call), so save paths can be
+checked for request count without a network.
+"""
+
+import copy
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+
+class FakeResponse:
+    def __init__(self, data: List[Dict[str, Any]], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Chainable query; nothing happens until execute()"""
+
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.method = "select"
+        self.payload: Any = None
+        self.on_conflict: Optional[str] = None
+        self.filters: List[Callable[[Dict[str, Any]], bool]] = []
+        self.orders: List[tuple] = []
+        self.limit_n: Optional[int] = None
+        self.offset_n = 0
+        self.count_mode: Optional[str] = None
+        self.head = False
+
+    # ---- verbs ----
+    def select(self, columns: str = "*", count: Optional[str] = None, head: bool = False) -> "FakeQuery":
+        self.method, self.count_mode, self.head = "select", count, head
+        return self
+
+    def insert(self, rows: Any) -> "FakeQuery":
+        self.method, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows: Any, on_conflict: str = "id") -> "FakeQuery":
+        self.method, self.payload, self.on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "FakeQuery":
+        self.method, self.payload = "update", values
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self.method = "delete"
+        return self
+
+    # ---- filters ----
+    def _filter(self, fn: Callable[[Dict[str, Any]], bool]) -> "FakeQuery":
+        self.filters.append(fn)
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(lambda r: r.get(column) == value)
+
+    def neq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(lambda r: r.get(column) != value)
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) > value)
+
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(lambda r: r.get(column) is not None and r.get(column) < value)
+
+    def ilike(self, column: str, pattern: str) -> "FakeQuery":
+        regex = re.compile("^" + re.escape(pattern).replace("%", ".*") + "$", re.IGNORECASE)
+        return self._filter(lambda r: bool(regex.match(str(r.get(column) or ""))))
+
+    def in_(self, column: str, values: List[Any]) -> "FakeQuery":
+        values = set(values)
+        return self._filter(lambda r: r.get(column) in values)
+
+    # ---- modifiers ----
+    def order(self, column: str, desc: bool = False) -> "FakeQuery":
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n: int) -> "FakeQuery":
+        self.limit_n = n
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self.offset_n, self.limit_n = start, end - start + 1
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.client._execute(self)
+
+
+class FakeRPC:
+    def __init__(self, client: "FakeSupabase", name: str, params: Dict[str, Any]):
+        self.client, self.name, self.params = client, name, params
+
+    def execute(self) -> FakeResponse:
+        self.client._record("rpc", self.name, self.params)
+        return FakeResponse(self.client.functions[self.name](self.client, **self.params))
+
+
+def _simpan_kriteria(
+    client: "FakeSupabase",
+    p_kriteria: List[str],
+    p_nilai: List[List[float]],
+    p_workspace: Optional[str] = None,
+) -> list:
+    # tanpa p_workspace: perilaku lama tanpa pemisahan workspace
+    scope = {} if p_workspace is None else {"workspace_id": p_workspace}
+    others = [
+        r for r in client.tables.get("tb_kriteria", [])
+        if p_workspace is not None and r.get("workspace_id") != p_workspace
+    ]
+    client.tables["tb_kriteria"] = others + [
+        {"id": client._next_id("tb_kriteria"), **scope, "kriteria": k, "urutan": i, "nilai": list(nilai)}
+        for i, (k, nilai) in enumerate(zip(p_kriteria, p_nilai), start=1)
+    ]
+    return []
+
+
+class FakeSupabase:
+    """
+    In-memory tables plus a log of every request
+
+    Attributes:
+        requests: One entry per round-trip (method, table, payload bytes)
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = copy.deepcopy(tables or {})
+        self.requests: List[Dict[str, Any]] = []
+        self.functions: Dict[str, Callable[..., list]] = {"simpan_kriteria": _simpan_kriteria}
+        self._ids: Dict[str, int] = {}
+
+    @property
+    def request_count(self) -> int:
+        return len(self.requests)
+
+    def reset_requests(self) -> None:
+        self.requests.clear()
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def from_(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rpc(self, name: str, params: Dict[str, Any]) -> FakeRPC:
+        return FakeRPC(self, name, params)
+
+    def _next_id(self, table: str) -> int:
+        if table not in self._ids:
+            self._ids[table] = max((r.get("id", 0) for r in self.tables.get(table, [])), default=0)
+        self._ids[table] += 1
+        return self._ids[table]
+
+    def _record(self, method: str, table: str, payload: Any) -> None:
+        size = len(json.dumps(payload, default=str)) if payload is not None else 0
+        self.requests.append({"method": method, "table": table, "bytes": size})
+
+    def _execute(self, q: FakeQuery) -> FakeResponse:
+        self._record(q.method, q.table, q.payload)
+        rows = self.tables.setdefault(q.table, [])
+        match = lambda r: all(f(r) for f in q.filters)
+
+        if q.method == "select":
+            out = [r for r in rows if match(r)]
+            for column, desc in reversed(q.orders):
+                out.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+            total = len(out)
+            end = None if q.limit_n is None else q.offset_n + q.limit_n
+            out = out[q.offset_n:end]
+            return FakeResponse([] if q.head else [dict(r) for r in out], total if q.count_mode else None)
+
+        payload = q.payload if isinstance(q.payload, list) else [q.payload]
+
+        if q.method == "insert":
+            new = [{"id": self._next_id(q.table), **r} for r in payload]
+            rows.extend(new)
+            return FakeResponse(new)
+
+        if q.method == "upsert":
+            keys = [k.strip() for k in q.on_conflict.split(",")]
+            index = {tuple(r.get(k) for k in keys): r for r in rows}
+            out = []
+            for r in payload:
+                existing = index.get(tuple(r.get(k) for k in keys))
+                if existing is not None:
+                    existing.update(r)
+                    out.append(existing)
+                else:
+                    new = {"id": self._next_id(q.table), **r}
+                    rows.append(new)
+                    index[tuple(new.get(k) for k in keys)] = new
+                    out.append(new)
+            return FakeResponse(out)
+
+        if q.method == "update":
+            out = [r for r in rows if match(r)]
+            for r in out:
+                r.update(q.payload)
+            return FakeResponse(out)
+
+        if q.method == "delete":
+            out = [r for r in rows if match(r)]
+            self.tables[q.table] = [r for r in rows if not match(r)]
+            return FakeResponse(out)
+
+        raise ValueError(f"Metode tidak dikenal: {q.method}")
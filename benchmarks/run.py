@@ -0,0 +1,259 @@
+"""
+Benchmark suite for the AHP, SMART and persistence hot paths
+
+Usage:
+    python benchmarks/run.py                    # run and compare with baselines.json
+    python benchmarks/run.py --quick            # skip the largest cases
+    python benchmarks/run.py --update-baseline  # store the current results as baseline
+
+Each case reports its latency in milliseconds (best of several repeats)
+and, for save paths, the number of round-trips made to the in-memory
+Supabase stand-in. A case regresses when its request count grows, or
+when its latency exceeds the baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+parent_dir = str(Path(__file__).parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import ahp
+import cache
+import db
+import smart
+from pairwise import PairwiseMatrix
+from fake_supabase import FakeSupabase
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+
+PAIRWISE_SIZES = (3, 5, 10, 15, 20, 30)
+SMART_SIZES = (10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+QUICK_SMART_LIMIT = 10 ** 5
+
+
+def best_ms(fn: Callable[[], Any], repeat: int = 5, min_time: float = 0.02) -> float:
+    """Best per-call time in milliseconds over `repeat` timed loops"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 16:
+            break
+        number *= 2
+
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return min(times) * 1000
+
+
+def random_judgments(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Upper triangle filled with Saaty values, lower triangle empty (0)"""
+    scale = np.array([1 / 9, 1 / 7, 1 / 5, 1 / 3, 1, 3, 5, 7, 9])
+    M = np.eye(n)
+    iu = np.triu_indices(n, 1)
+    M[iu] = rng.choice(scale, size=len(iu[0]))
+    return M
+
+
+# ====================== KASUS: DATA KRITERIA ======================
+def bench_pairwise(n: int, rng: np.random.Generator) -> Dict[str, Any]:
+    labels = [f"K{i + 1}" for i in range(n)]
+    display = PairwiseMatrix(labels, random_judgments(n, rng)).to_display_frame()
+    return {"ms": best_ms(lambda: PairwiseMatrix.from_frame(display, labels).with_reciprocals())}
+
+
+def bench_ahp(n: int, method: str, rng: np.random.Generator) -> Dict[str, Any]:
+    M = PairwiseMatrix([str(i) for i in range(n)], random_judgments(n, rng)).with_reciprocals().values
+    return {"ms": best_ms(lambda: ahp.evaluate(M, method=method))}
+
+
+# ====================== KASUS: PERHITUNGAN SMART ======================
+def bench_smart(size: int, rng: np.random.Generator) -> Dict[str, Dict[str, Any]]:
+    X = rng.integers(1, 6, size=(size, len(smart.DEFAULT_CRITERIA))).astype(np.float64)
+    w = np.array([0.3, 0.25, 0.2, 0.15, 0.1])
+    result = smart.score(X, w, smart.DEFAULT_CRITERIA)
+    repeat = 3 if size >= 10 ** 6 else 5
+    return {
+        "score": {"ms": best_ms(lambda: smart.score(X, w, smart.DEFAULT_CRITERIA), repeat)},
+        "top10": {"ms": best_ms(lambda: smart.top_k(result.scores, 10), repeat)},
+        "rank_full": {"ms": best_ms(lambda: smart.rank_descending(result.scores), repeat)},
+    }
+
+
+# ====================== KASUS: PENYIMPANAN ======================
+def measure_save(setup: Callable[[], Tuple[FakeSupabase, Callable[[], Any]]], repeat: int = 3) -> Dict[str, Any]:
+    """Latency (best of `repeat`) and round-trips of one save on a fresh fake database"""
+    times = []
+    for _ in range(repeat):
+        client, save = setup()
+        client.reset_requests()
+        start = time.perf_counter()
+        save()
+        times.append((time.perf_counter() - start) * 1000)
+    return {
+        "ms": min(times),
+        "requests": client.request_count,
+        "bytes": sum(r["bytes"] for r in client.requests),
+    }
+
+
+# Penyimpanan diukur di dalam satu workspace, dengan data workspace lain di tabel yang sama
+WORKSPACE = "00000000-0000-0000-0000-000000000001"
+OTHER_WORKSPACE = "00000000-0000-0000-0000-000000000002"
+
+
+def penilaian_frame(size: int, rng: np.random.Generator) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        rng.integers(1, 6, size=(size, len(db.PENILAIAN_COLUMNS))).astype(np.float64),
+        columns=list(db.PENILAIAN_COLUMNS.values()),
+    )
+    frame.insert(0, "Alternatif", [f"Supplier {i}" for i in range(size)])
+    return frame
+
+
+def bench_save_kriteria(n: int, rng: np.random.Generator) -> Dict[str, Any]:
+    labels = [f"K{i + 1}" for i in range(n)]
+    M = PairwiseMatrix(labels, random_judgments(n, rng)).with_reciprocals().values
+
+    other = [{"id": i + 1, "workspace_id": OTHER_WORKSPACE, "kriteria": k, "urutan": i + 1} for i, k in enumerate(labels)]
+
+    def setup():
+        client = FakeSupabase({"tb_kriteria": other})
+        return client, lambda: db.save_matrix(client, labels, M, workspace=WORKSPACE)
+
+    return measure_save(setup)
+
+
+def bench_save_alternatif(rng: np.random.Generator) -> Dict[str, Any]:
+    def setup():
+        client = FakeSupabase({"tb_alternatif": [
+            {"id": 1, "workspace_id": WORKSPACE, "Alternatif": "Supplier 0"},
+            {"id": 2, "workspace_id": OTHER_WORKSPACE, "Alternatif": "Supplier 0"},
+        ]})
+        return client, lambda: db.insert_rows(
+            client, "tb_alternatif", [{"Alternatif": "Supplier Baru"}], workspace=WORKSPACE,
+        )
+
+    return measure_save(setup)
+
+
+def bench_save_penilaian(size: int, changed: int, rng: np.random.Generator) -> Dict[str, Any]:
+    snapshot = penilaian_frame(size, rng)
+    edited = snapshot.copy()
+    rows = rng.choice(size, size=changed, replace=False)
+    edited.loc[rows, "Harga"] = edited.loc[rows, "Harga"] + 1
+
+    stored = db.frame_to_records(snapshot, {"Alternatif": "Alternatif", **{v: k for k, v in db.PENILAIAN_COLUMNS.items()}})
+
+    rows = [
+        {"id": i + 1, "workspace_id": workspace, **r}
+        for i, (workspace, r) in enumerate((w, r) for w in (WORKSPACE, OTHER_WORKSPACE) for r in stored)
+    ]
+
+    def setup():
+        client = FakeSupabase({"tb_alternatif": rows})
+        return client, lambda: db.save_penilaian(client, snapshot, edited, workspace=WORKSPACE)
+
+    return measure_save(setup)
+
+
+# ====================== RUNNER ======================
+def run(quick: bool = False) -> Dict[str, Dict[str, Any]]:
+    rng = np.random.default_rng(0)
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for n in PAIRWISE_SIZES:
+        results[f"pairwise_parse_fill/n={n}"] = bench_pairwise(n, rng)
+        for method in ahp.WEIGHT_METHODS:
+            results[f"ahp_{method}/n={n}"] = bench_ahp(n, method, rng)
+
+    for size in SMART_SIZES:
+        if quick and size > QUICK_SMART_LIMIT:
+            continue
+        for name, res in bench_smart(size, rng).items():
+            results[f"smart_{name}/n={size}"] = res
+
+    cache.tables.clear()
+    for n in (2, 5, 30):
+        results[f"save_kriteria/n={n}"] = bench_save_kriteria(n, rng)
+    results["save_alternatif/single"] = bench_save_alternatif(rng)
+    for size, changed in ((1000, 1), (1000, 1000), (5000, 50), (5000, 5000)):
+        results[f"save_penilaian/n={size},changed={changed}"] = bench_save_penilaian(size, changed, rng)
+
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Regression messages for cases that got slower or chattier"""
+    problems = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if "requests" in base and current.get("requests", 0) > base["requests"]:
+            problems.append(f"{name}: {current['requests']} request (baseline {base['requests']})")
+        limit = base["ms"] * (1 + tolerance) + 0.05
+        if current["ms"] > limit:
+            problems.append(f"{name}: {current['ms']:.3f} ms (baseline {base['ms']:.3f} ms, batas {limit:.3f} ms)")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="lewati kasus SMART terbesar")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="file baseline JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="simpan hasil sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="kenaikan latensi yang masih diterima (0.5 = 50%%)")
+    parser.add_argument("--output", type=Path, help="simpan hasil mentah ke file JSON")
+    args = parser.parse_args()
+
+    results = run(quick=args.quick)
+    width = max(len(name) for name in results)
+    for name, res in results.items():
+        extra = f"  {res['requests']:>4} req" if "requests" in res else ""
+        print(f"{name:<{width}}  {res['ms']:>10.3f} ms{extra}")
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"Baseline {args.baseline} belum ada; jalankan dengan --update-baseline")
+        return 0
+
+    problems = compare(results, json.loads(args.baseline.read_text())["results"], args.tolerance)
+    for p in problems:
+        print(f"REGRESI {p}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
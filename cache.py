@@ -0,0 +1,330 @@
+"""
+Caching module for AHP-SMART application
+Process-wide read-through cache for Supabase table loads and computation results
+"""
+
+import dataclasses
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+class TableCache:
+    """
+    LRU cache of query results, shared by every session in the process
+
+    Entries are keyed by (table, query key, table version). Every write to a
+    table bumps its version, so stale entries are never served and are
+    dropped right away. Entries loaded with a `ttl` also expire after that
+    many seconds, for values that writes from other processes can change.
+    Like ResultCache, the cache is bounded by the approximate size of the
+    stored results rather than their number.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, Hashable, int], Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, table: str) -> int:
+        """Current version stamp of a table"""
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def get_or_load(
+        self,
+        table: str,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached result for a query, loading it on a miss
+
+        Cached values are shared between sessions and must be treated as
+        read-only.
+
+        Args:
+            table: Table the query reads from
+            key: Hashable description of the query
+            loader: Function that runs the query
+            ttl: Seconds the result stays valid; None keeps it until a write
+
+        Returns:
+            Query result
+        """
+        with self._lock:
+            entry_key = (table, key, self._versions.get(table, 0))
+            entry = self._entries.get(entry_key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(entry_key)
+                    self.hits += 1
+                    return value
+                self._drop(entry_key)
+            self.misses += 1
+
+        value = loader()
+        size = _nbytes(value)
+
+        with self._lock:
+            # Jangan simpan hasil jika tabel ditulis selama query berjalan
+            if entry_key[2] == self._versions.get(table, 0) and size <= self.max_bytes:
+                if entry_key in self._entries:
+                    self._drop(entry_key)
+                expires_at = None if ttl is None else time.monotonic() + ttl
+                self._entries[entry_key] = (value, expires_at, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, _, old_size) = self._entries.popitem(last=False)
+                    self._bytes -= old_size
+        return value
+
+    def _drop(self, entry_key: Tuple[str, Hashable, int]) -> None:
+        _, _, size = self._entries.pop(entry_key)
+        self._bytes -= size
+
+    def invalidate(self, table: str) -> None:
+        """Bump a table's version and drop its cached entries"""
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+            for entry_key in [k for k in self._entries if k[0] == table]:
+                self._drop(entry_key)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _hash_into(h: "hashlib._Hash", value: Any) -> None:
+    """Feed a value into a hash, tagged by type so different values never collide"""
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            _hash_into(h, value.tolist())
+            return
+        h.update(f"nd{value.dtype.str}{value.shape}".encode())
+        h.update(memoryview(np.ascontiguousarray(value)).cast("B"))
+    elif isinstance(value, (list, tuple)):
+        if value and all(isinstance(v, str) for v in value):
+            # panjang setiap string di depan isinya, agar batas antar string tidak ambigu
+            encoded = [v.encode("utf-8", "surrogatepass") for v in value]
+            h.update(f"strs{len(value)}:".encode())
+            h.update(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)).tobytes())
+            h.update(b"".join(encoded))
+        else:
+            h.update(f"seq{len(value)}(".encode())
+            for item in value:
+                _hash_into(h, item)
+            h.update(b")")
+    elif isinstance(value, str):
+        h.update(f"str{len(value)}:".encode())
+        h.update(value.encode("utf-8", "surrogatepass"))
+    else:
+        # angka, None dan dataclass beku (mis. Criterion) cukup diwakili repr-nya
+        h.update(f"{type(value).__name__}:{value!r};".encode())
+
+
+def _nbytes(value: Any) -> int:
+    """Approximate memory held by a cached value"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(_nbytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        sample = value[:100]
+        per_item = sum(_nbytes(v) for v in sample) / len(sample) if sample else 0
+        return sys.getsizeof(value) + int(per_item * len(value))
+    if hasattr(value, "__dict__"):
+        return sum(_nbytes(v) for v in vars(value).values())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Content-addressed cache of computation results, shared by every session
+
+    Results are stored under a SHA-256 of their exact inputs, so identical
+    inputs from any user are served without recomputation. The memory
+    tier is an LRU bounded by the approximate size of the results; with
+    a `directory`, results are also pickled to disk (bounded by
+    `max_disk_bytes`) and shared with other worker processes and
+    restarts. The directory must only be writable by the application.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 2 ** 20,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 2 * 2 ** 30,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(namespace: str, *parts: Any) -> str:
+        """
+        Content hash of a computation's inputs
+
+        Args:
+            namespace: Name of the computation, e.g. "ahp"
+            *parts: Inputs (arrays, strings, numbers, sequences, frozen dataclasses)
+
+        Returns:
+            str: Hex digest
+        """
+        h = hashlib.sha256(namespace.encode())
+        for part in parts:
+            _hash_into(h, part)
+        return h.hexdigest()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the result stored under `key`, computing it on a miss
+
+        Cached results are shared between sessions and must be treated as
+        read-only.
+
+        Args:
+            key: Content hash from ResultCache.key()
+            compute: Function producing the result
+
+        Returns:
+            Result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        value = self._load(key)
+        if value is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            value = compute()
+            self._dump(key, value)
+
+        self._remember(key, value)
+        return value
+
+    def _remember(self, key: str, value: Any) -> None:
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.directory / f"{key}.pkl" if self.directory else None
+
+    def _load(self, key: str) -> Any:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+            return value
+        except Exception:
+            # file rusak atau dari versi kode lain: hitung ulang
+            path.unlink(missing_ok=True)
+            return None
+
+    def _dump(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        tmp = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._evict_disk()
+        except Exception:
+            # cache disk bersifat opsional; kegagalan tulis tidak menggagalkan perhitungan
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+
+    def _evict_disk(self) -> None:
+        files = [(p, p.stat()) for p in self.directory.glob("*.pkl")]
+        total = sum(info.st_size for _, info in files)
+        for path, info in sorted(files, key=lambda item: item[1].st_mtime):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= info.st_size
+
+    def clear(self) -> None:
+        """Drop every in-memory entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Satu instance per proses, dipakai bersama oleh semua sesi
+tables = TableCache()
+results = ResultCache(directory=os.environ.get("SPK_RESULT_CACHE_DIR"))
@@ -0,0 +1,285 @@
+"""
+Command-line interface for AHP-SMART application
+Runs the AHP consistency check and SMART ranking without Streamlit
+
+Examples:
+    python cli.py --job kriteria.csv alternatif.csv hasil.csv
+    python cli.py --manifest jobs.csv --workers 8
+    python cli.py --supabase --workspace <uuid> --output hasil.csv
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import ahp
+import db
+import smart
+import streaming
+from pairwise import PairwiseMatrix
+
+
+SECRETS_PATH = Path(__file__).parent / ".streamlit" / "secrets.toml"
+
+# Bobot dibulatkan seperti pada halaman Data Perhitungan agar ranking sama
+WEIGHT_DECIMALS = 4
+
+
+@dataclass(frozen=True)
+class Job:
+    """One input set: criteria matrix, alternatives and output file"""
+    criteria: str
+    alternatives: str
+    output: str
+    method: str = ahp.DEFAULT_METHOD
+    cost: Tuple[str, ...] = tuple(sorted(smart.COST_CRITERIA))
+    top: Optional[int] = None
+
+
+def read_table(path: str, **kwargs) -> pd.DataFrame:
+    """Read a CSV or Parquet file based on its extension"""
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        return pd.read_parquet(path, **kwargs)
+    return pd.read_csv(path, **kwargs)
+
+
+def write_table(frame: pd.DataFrame, path: str) -> None:
+    """Write a CSV or Parquet file based on its extension"""
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def read_matrix(path: str) -> PairwiseMatrix:
+    """
+    Read a pairwise matrix with criterion labels as header and first column
+
+    Empty or zero cells are filled with the reciprocal of their mirror.
+    """
+    frame = read_table(path, index_col=0)
+    return PairwiseMatrix.from_frame(frame, [str(c) for c in frame.columns]).with_reciprocals()
+
+
+def ranking_weights(hasil_ahp: ahp.AHPResult) -> List[float]:
+    """AHP weights rounded the way the Streamlit app ranks with them"""
+    return [round(w, WEIGHT_DECIMALS) for w in hasil_ahp.weights]
+
+
+def evaluate(
+    matrix: PairwiseMatrix,
+    alternatives: pd.DataFrame,
+    method: str,
+    cost: Sequence[str],
+    top: Optional[int] = None,
+) -> Tuple[ahp.AHPResult, pd.DataFrame]:
+    """
+    AHP weights of the matrix and SMART ranking of an in-memory table
+
+    Args:
+        matrix: Pairwise matrix; labels select the alternative columns
+        alternatives: Table with an Alternatif column and one column per criterion
+        method: AHP weight method
+        cost: Criteria treated as cost
+        top: Only rank the best `top` alternatives
+
+    Returns:
+        tuple: (AHP result, ranking table)
+    """
+    missing = [c for c in matrix.labels if c not in alternatives.columns]
+    if missing:
+        raise ValueError(f"Kolom kriteria tidak ditemukan pada data alternatif: {', '.join(missing)}")
+
+    hasil_ahp = ahp.evaluate(matrix.values, method=method)
+    criteria = smart.criteria_from_names(matrix.labels, cost)
+    X = alternatives[matrix.labels].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    hasil_smart = smart.score(X, ranking_weights(hasil_ahp), criteria)
+    return hasil_ahp, smart.ranking_frame(alternatives["Alternatif"], hasil_smart.scores, top)
+
+
+def run_job(job: Job) -> Dict[str, Any]:
+    """
+    Run one input set and write its ranking (runs inside a worker process)
+
+    With `top` set the alternatives file is streamed in chunks, so its
+    size is not limited by memory.
+
+    Args:
+        job: Input set
+
+    Returns:
+        dict: Summary with the output path, size and consistency
+    """
+    matrix = read_matrix(job.criteria)
+    if job.top is not None:
+        hasil_ahp = ahp.evaluate(matrix.values, method=job.method)
+        criteria = smart.criteria_from_names(matrix.labels, job.cost)
+        ranking = streaming.rank_stream(job.alternatives, ranking_weights(hasil_ahp), criteria, k=job.top)
+    else:
+        hasil_ahp, ranking = evaluate(matrix, read_table(job.alternatives), job.method, job.cost)
+
+    write_table(ranking, job.output)
+    return {
+        "output": job.output,
+        "alternatives": len(ranking),
+        "cr": hasil_ahp.cr,
+        "consistent": bool(hasil_ahp.is_consistent),
+    }
+
+
+def load_secrets() -> Tuple[str, str]:
+    """Supabase URL and key from the environment or .streamlit/secrets.toml"""
+    url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY")
+    if url and key:
+        return url, key
+
+    import tomllib
+
+    with open(SECRETS_PATH, "rb") as f:
+        conf = tomllib.load(f)["connections"]["supabase_connection"]
+    return conf["SUPABASE_URL"], conf["SUPABASE_KEY"]
+
+
+def run_supabase(
+    output: str,
+    method: str,
+    cost: Sequence[str],
+    top: Optional[int],
+    workspace: str,
+) -> Dict[str, Any]:
+    """
+    Rank the data of one workspace stored in tb_kriteria and tb_alternatif
+
+    Without a user session row-level security only lets a service key read
+    the tables, so the key from the secrets must be one; the workspace
+    filter keeps the data of other workspaces out.
+    """
+    from supabase import create_client
+
+    client = create_client(*load_secrets())
+    rows_k = db.fetch_rows(client, "tb_kriteria", order=("urutan", "id"), workspace=workspace)
+    if not rows_k:
+        raise ValueError(
+            f"Tidak ada data kriteria pada workspace {workspace} "
+            "(tanpa sesi login hanya service key yang dapat membaca data)"
+        )
+    rows_a = db.fetch_rows(client, "tb_alternatif", workspace=workspace)
+
+    matrix = PairwiseMatrix.from_records(rows_k, [row["kriteria"] for row in rows_k]).with_reciprocals()
+    alternatives = pd.DataFrame(rows_a).rename(columns=db.PENILAIAN_COLUMNS)
+
+    hasil_ahp, ranking = evaluate(matrix, alternatives, method, cost, top)
+    write_table(ranking, output)
+    return {
+        "output": output,
+        "alternatives": len(ranking),
+        "cr": hasil_ahp.cr,
+        "consistent": bool(hasil_ahp.is_consistent),
+    }
+
+
+def read_manifest(path: str, defaults: Dict[str, Any]) -> List[Job]:
+    """Jobs from a CSV with columns criteria, alternatives, output"""
+    frame = pd.read_csv(path)
+    return [
+        Job(str(row["criteria"]), str(row["alternatives"]), str(row["output"]), **defaults)
+        for row in frame.to_dict(orient="records")
+    ]
+
+
+def positive_int(text: str) -> int:
+    """argparse type for counts of at least 1"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bukan bilangan bulat: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"harus >= 1, bukan {value}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Perhitungan AHP + SMART tanpa antarmuka Streamlit")
+    source = parser.add_argument_group("sumber data")
+    source.add_argument("--job", nargs=3, action="append", default=[],
+                        metavar=("KRITERIA", "ALTERNATIF", "OUTPUT"),
+                        help="matriks kriteria, data alternatif dan file hasil (CSV/Parquet); boleh diulang")
+    source.add_argument("--manifest", help="CSV berisi kolom criteria, alternatives, output")
+    source.add_argument("--supabase", action="store_true", help="ambil data dari tb_kriteria dan tb_alternatif")
+    parser.add_argument("--output", help="file hasil untuk --supabase")
+    parser.add_argument("--workspace", help="workspace (UUID) yang dihitung; wajib untuk --supabase")
+    parser.add_argument("--method", choices=ahp.WEIGHT_METHODS, default=ahp.DEFAULT_METHOD,
+                        help="metode bobot AHP (default: %(default)s, sama dengan aplikasi)")
+    parser.add_argument("--cost", default=",".join(sorted(smart.COST_CRITERIA)),
+                        help="kriteria cost, dipisah koma (default: %(default)s)")
+    parser.add_argument("--top", type=positive_int, help="hanya simpan N alternatif teratas (data dibaca bertahap)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="jumlah proses paralel")
+    parser.add_argument("--strict", action="store_true", help="keluar dengan kode 2 jika ada matriks tidak konsisten")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    cost = tuple(c.strip() for c in args.cost.split(",") if c.strip())
+    defaults = {"method": args.method, "cost": cost, "top": args.top}
+
+    jobs = [Job(*paths, **defaults) for paths in args.job]
+    if args.manifest:
+        jobs.extend(read_manifest(args.manifest, defaults))
+
+    summaries: List[Dict[str, Any]] = []
+    failed = 0
+
+    if args.supabase:
+        if not args.output or not args.workspace:
+            print("--output dan --workspace wajib diisi bersama --supabase", file=sys.stderr)
+            return 1
+        try:
+            summaries.append(run_supabase(args.output, args.method, cost, args.top, args.workspace))
+        except Exception as e:
+            failed += 1
+            print(f"GAGAL {args.output}: {e}", file=sys.stderr)
+
+    if not jobs and not args.supabase:
+        build_parser().print_usage(sys.stderr)
+        return 1
+
+    if len(jobs) == 1 or args.workers == 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append(run_job(job))
+            except Exception as e:
+                results.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(run_job, job) for job in jobs]
+            results = [f.exception() or f.result() for f in futures]
+
+    for job, result in zip(jobs, results):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"GAGAL {job.output}: {result}", file=sys.stderr)
+        else:
+            summaries.append(result)
+
+    for s in summaries:
+        status = "konsisten" if s["consistent"] else "TIDAK konsisten"
+        print(f"{s['output']}: {s['alternatives']} alternatif, CR = {s['cr']:.4f} ({status})")
+
+    if failed:
+        return 1
+    if args.strict and not all(s["consistent"] for s in summaries):
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
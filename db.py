@@ -0,0 +1,533 @@
+"""
+Database helpers for AHP-SMART application
+Batched reads and writes against Supabase tables
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import cache
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+DEFAULT_PAGE_SIZE = 50
+
+# Tabel bisa ditulis dari proses lain, jadi cache-nya dibatasi waktu
+COUNT_TTL_SECONDS = 30
+ROWS_TTL_SECONDS = 120
+
+# Kolom pemisah data per workspace (lihat migrasi 20261018000004)
+WORKSPACE_COLUMN = "workspace_id"
+
+# Mapping fixed untuk kolom nilai di tb_alternatif
+PENILAIAN_COLUMNS = {
+    "k1": "Harga",
+    "k2": "Kualitas",
+    "k3": "Pengiriman",
+    "k4": "Fleksibilitas",
+    "k5": "Pelayanan"
+}
+
+# Nilai default jika kolom belum ada pada baris tb_alternatif
+PENILAIAN_DEFAULTS = {"k1": 0, "k2": 5, "k3": 0, "k4": 5, "k5": 5}
+
+
+@dataclass(frozen=True)
+class Page:
+    """One page of a keyset-paginated query"""
+    rows: List[Dict[str, Any]]
+    has_next: bool
+
+    @property
+    def last_id(self) -> Optional[int]:
+        return self.rows[-1]["id"] if self.rows else None
+
+
+class InvalidCellsError(ValueError):
+    """Edited cells that are not numbers; `errors` lists them (Baris, Kolom, Nilai)"""
+
+    def __init__(self, errors: pd.DataFrame):
+        self.errors = errors
+        super().__init__(f"{len(errors)} sel penilaian bukan angka; tidak ada data yang disimpan")
+
+
+def response_data(result: Any) -> List[Dict[str, Any]]:
+    """
+    Extract row data from a Supabase/PostgREST response
+
+    Args:
+        result: Response object or dict returned by execute()/execute_query()
+
+    Returns:
+        list: Rows (empty list if none)
+    """
+    if isinstance(result, dict) and "data" in result:
+        return result["data"] or []
+    if hasattr(result, "data"):
+        return result.data or []
+    return []
+
+
+def chunked(rows: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """Yield successive slices of at most `size` rows"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def scoped(table: str, workspace: Optional[str]) -> str:
+    """Name under which a table's cache entries and version are kept for a workspace"""
+    return table if workspace is None else f"{table}@{workspace}"
+
+
+def table_version(table: str, workspace: Optional[str] = None) -> int:
+    """Version stamp of a table within a workspace (bumped by writes through this module)"""
+    return cache.tables.version(scoped(table, workspace))
+
+
+def _scope_filters(
+    filters: Sequence[Tuple[str, str, Any]],
+    workspace: Optional[str],
+) -> Tuple[Tuple[str, str, Any], ...]:
+    # filter workspace di depan agar query memakai indeks komposit (workspace_id, ...)
+    if workspace is None:
+        return tuple(filters)
+    return (("eq", WORKSPACE_COLUMN, workspace), *filters)
+
+
+def _scope_rows(rows: Sequence[Dict[str, Any]], workspace: Optional[str]) -> List[Dict[str, Any]]:
+    if workspace is None:
+        return list(rows)
+    return [{**row, WORKSPACE_COLUMN: workspace} for row in rows]
+
+
+def fetch_rows(
+    client: Any,
+    table: str,
+    columns: str = "*",
+    order: Sequence[str] = ("id",),
+    filters: Sequence[Tuple[str, str, Any]] = (),
+    workspace: Optional[str] = None,
+    ttl: float = ROWS_TTL_SECONDS,
+) -> List[Dict[str, Any]]:
+    """
+    Load rows of a table through the shared table cache
+
+    Writes through this module drop the cached rows right away; writes
+    from other processes become visible after `ttl` seconds.
+
+    Args:
+        client: Supabase connection
+        table: Table name
+        columns: Columns to select
+        order: Columns to order by, in priority
+        filters: (operator, column, value) tuples, e.g. ("eq", "id", 1)
+        workspace: Only rows of this workspace (None reads every visible row)
+        ttl: Seconds the rows stay cached
+
+    Returns:
+        list: Rows (shared between sessions, do not mutate)
+    """
+    filters = _scope_filters(filters, workspace)
+    key = (columns, tuple(order), filters)
+
+    def load() -> List[Dict[str, Any]]:
+        query = client.table(table).select(columns)
+        for op, column, value in filters:
+            query = getattr(query, op)(column, value)
+        for column in order:
+            query = query.order(column)
+        return response_data(query.execute())
+
+    return cache.tables.get_or_load(scoped(table, workspace), key, load, ttl=ttl)
+
+
+def load_concurrently(loaders: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run independent loaders at the same time, one thread each
+
+    Each loader runs in a copy of the caller's context, so the access
+    token set by pool.set_access_token() (and the instrumented run) also
+    applies to its requests. Waiting time is that of the slowest loader
+    instead of the sum.
+
+    Args:
+        loaders: Functions without arguments, by name
+
+    Returns:
+        dict: Result of each loader, by name
+    """
+    if len(loaders) <= 1:
+        return {name: load() for name, load in loaders.items()}
+    with ThreadPoolExecutor(max_workers=len(loaders), thread_name_prefix="load") as executor:
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, load)
+            for name, load in loaders.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def like_pattern(text: str) -> str:
+    """ILIKE pattern matching `text` anywhere, with wildcards escaped"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def fetch_page(
+    client: Any,
+    table: str,
+    columns: str = "*",
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    filters: Sequence[Tuple[str, str, Any]] = (),
+    workspace: Optional[str] = None,
+    ttl: float = ROWS_TTL_SECONDS,
+) -> Page:
+    """
+    Load one page of rows ordered by id, starting after `after_id`
+
+    Keyset pagination: the database seeks straight to the first id after
+    the cursor through the primary key index, so deep pages cost the same
+    as the first one. One extra row is requested to tell whether a next
+    page exists. Pages go through the shared table cache for up to `ttl`
+    seconds.
+
+    Args:
+        client: Supabase connection
+        table: Table name
+        columns: Columns to select (must include id)
+        after_id: Last id of the previous page, None for the first page
+        limit: Rows per page
+        filters: (operator, column, value) tuples, e.g. ("ilike", "Alternatif", "%abc%")
+        workspace: Only rows of this workspace
+        ttl: Seconds the page stays cached
+
+    Returns:
+        Page: Rows of the page and whether more rows follow
+    """
+    filters = _scope_filters(filters, workspace)
+    key = ("page", columns, after_id, limit, filters)
+
+    def load() -> Page:
+        query = client.table(table).select(columns)
+        for op, column, value in filters:
+            query = getattr(query, op)(column, value)
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        rows = response_data(query.order("id").limit(limit + 1).execute())
+        return Page(rows=rows[:limit], has_next=len(rows) > limit)
+
+    return cache.tables.get_or_load(scoped(table, workspace), key, load, ttl=ttl)
+
+
+def count_rows(
+    client: Any,
+    table: str,
+    filters: Sequence[Tuple[str, str, Any]] = (),
+    ttl: float = COUNT_TTL_SECONDS,
+    workspace: Optional[str] = None,
+) -> int:
+    """
+    Number of rows in a table, without transferring any row
+
+    Uses a HEAD request with an exact count. The result is cached for
+    `ttl` seconds and dropped on every write through this module.
+
+    Args:
+        client: Supabase connection
+        table: Table name
+        filters: (operator, column, value) tuples, e.g. ("eq", "id", 1)
+        ttl: Seconds the count stays cached
+        workspace: Only rows of this workspace
+
+    Returns:
+        int: Row count
+    """
+    filters = _scope_filters(filters, workspace)
+    key = ("count", filters)
+
+    def load() -> int:
+        query = client.table(table).select("id", count="exact", head=True)
+        for op, column, value in filters:
+            query = getattr(query, op)(column, value)
+        result = query.execute()
+        count = result.get("count") if isinstance(result, dict) else getattr(result, "count", None)
+        return int(count or 0)
+
+    return cache.tables.get_or_load(scoped(table, workspace), key, load, ttl=ttl)
+
+
+def insert_rows(
+    client: Any,
+    table: str,
+    rows: List[Dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+    workspace: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Insert rows in fixed-size batches, one request per batch
+
+    Args:
+        client: Supabase connection
+        table: Table name
+        rows: Rows to insert
+        chunk_size: Maximum rows per request
+        on_chunk: Optional callback(written, total) after each batch
+        workspace: Workspace the rows belong to (stored in workspace_id)
+
+    Returns:
+        list: Inserted rows as returned by the database
+    """
+    rows = _scope_rows(rows, workspace)
+    inserted: List[Dict[str, Any]] = []
+    written = 0
+    try:
+        for batch in chunked(rows, chunk_size):
+            inserted.extend(response_data(client.table(table).insert(list(batch)).execute()))
+            written += len(batch)
+            if on_chunk:
+                on_chunk(written, len(rows))
+    finally:
+        if written:
+            cache.tables.invalidate(scoped(table, workspace))
+    return inserted
+
+
+def upsert_rows(
+    client: Any,
+    table: str,
+    rows: List[Dict[str, Any]],
+    on_conflict: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+    workspace: Optional[str] = None,
+) -> int:
+    """
+    Upsert rows in fixed-size batches, one request per batch
+
+    Each batch is a single INSERT ... ON CONFLICT statement, so it either
+    lands completely or not at all. Rows of earlier batches stay written
+    if a later batch fails. Within a workspace the unique keys are
+    composite, so workspace_id is prepended to the conflict columns.
+
+    Args:
+        client: Supabase connection
+        table: Table name
+        rows: Rows to write
+        on_conflict: Column(s) of the unique constraint used as upsert key
+        chunk_size: Maximum rows per request
+        on_chunk: Optional callback(written, total) after each batch
+        workspace: Workspace the rows belong to (stored in workspace_id)
+
+    Returns:
+        int: Number of rows written
+    """
+    if workspace is not None:
+        rows = _scope_rows(rows, workspace)
+        on_conflict = f"{WORKSPACE_COLUMN},{on_conflict}"
+    written = 0
+    try:
+        for batch in chunked(rows, chunk_size):
+            client.table(table).upsert(list(batch), on_conflict=on_conflict).execute()
+            written += len(batch)
+            if on_chunk:
+                on_chunk(written, len(rows))
+    finally:
+        if written:
+            cache.tables.invalidate(scoped(table, workspace))
+    return written
+
+
+def save_matrix(
+    client: Any,
+    labels: Sequence[str],
+    values: np.ndarray,
+    workspace: Optional[str] = None,
+) -> None:
+    """
+    Replace the stored pairwise matrix in a single transactional RPC call
+
+    Only the rows of the workspace are replaced; the function locks the
+    workspace so concurrent saves apply one after the other.
+
+    Args:
+        client: Supabase connection
+        labels: Criterion labels, in matrix order
+        values: Square matrix of shape (n, n)
+        workspace: Workspace of the matrix (None: the caller's own, resolved by the database)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape != (len(labels), len(labels)):
+        raise ValueError(f"Ukuran matriks {values.shape} tidak sesuai dengan {len(labels)} kriteria")
+
+    params = {"p_kriteria": [str(k) for k in labels], "p_nilai": values.tolist()}
+    if workspace is not None:
+        params["p_workspace"] = workspace
+    client.rpc("simpan_kriteria", params).execute()
+    cache.tables.invalidate(scoped("tb_kriteria", workspace))
+
+
+def save_user_matrix(
+    client: Any,
+    user_id: str,
+    labels: Sequence[str],
+    values: np.ndarray,
+    cr: Optional[float] = None,
+    email: Optional[str] = None,
+    workspace: Optional[str] = None,
+) -> None:
+    """
+    Store one evaluator's pairwise matrix (one row per user, upserted)
+
+    Args:
+        client: Supabase connection
+        user_id: Authenticated user's id
+        labels: Criterion labels, in matrix order
+        values: Square matrix of shape (n, n)
+        cr: Consistency ratio of the matrix
+        email: User email, kept for display
+        workspace: Workspace whose group consensus the matrix joins
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape != (len(labels), len(labels)):
+        raise ValueError(f"Ukuran matriks {values.shape} tidak sesuai dengan {len(labels)} kriteria")
+
+    row = {
+        "user_id": user_id,
+        "email": email,
+        "kriteria": [str(k) for k in labels],
+        "matriks": values.tolist(),
+        "cr": None if cr is None else float(cr),
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    upsert_rows(client, "tb_kriteria_pengguna", [row], on_conflict="user_id", workspace=workspace)
+
+
+def changed_rows(before: Optional[pd.DataFrame], after: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    Rows of `after` that are new or differ from `before`
+
+    Rows with an empty key are dropped and duplicate keys keep the last
+    occurrence, since an upsert batch cannot touch the same key twice.
+
+    Args:
+        before: Snapshot as loaded from the database
+        after: Edited data
+        key: Column identifying a row
+
+    Returns:
+        pd.DataFrame: Subset of `after` to write
+    """
+    after = after[after[key].notna() & (after[key].astype(str).str.strip() != "")]
+    after = after.drop_duplicates(subset=key, keep="last")
+    if before is None or before.empty:
+        return after
+
+    before = before.drop_duplicates(subset=key, keep="first")
+    merged = after.merge(before, on=key, how="left", suffixes=("", "__lama"), indicator=True)
+
+    changed = (merged["_merge"] == "left_only").to_numpy(copy=True)
+    for col in after.columns:
+        if col == key or f"{col}__lama" not in merged:
+            continue
+        new, old = merged[col], merged[f"{col}__lama"]
+        same = (new == old) | (new.isna() & old.isna())
+        changed |= ~same.to_numpy(dtype=bool)
+
+    return after[changed]
+
+
+def save_penilaian(
+    client: Any,
+    snapshot: Optional[pd.DataFrame],
+    edited: pd.DataFrame,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+    workspace: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Upsert the rows of the Data Penilaian grid that differ from the snapshot
+
+    Args:
+        client: Supabase connection
+        snapshot: Grid as loaded from tb_alternatif
+        edited: Grid after editing (Alternatif + criterion name columns)
+        chunk_size: Maximum rows per request
+        on_chunk: Optional callback(written, total) after each batch
+        workspace: Workspace the rows belong to
+
+    Returns:
+        pd.DataFrame: Rows written, with numeric values (empty if nothing changed)
+
+    Raises:
+        InvalidCellsError: A changed row has an empty or non-numeric rating;
+            nothing is written
+    """
+    kolom_nilai = list(PENILAIAN_COLUMNS.values())
+    raw = edited[kolom_nilai]
+    edited = edited.copy()
+    edited[kolom_nilai] = raw.apply(pd.to_numeric, errors="coerce")
+
+    berubah = changed_rows(snapshot, edited, key="Alternatif")
+    if berubah.empty:
+        return berubah
+
+    # nilai yang tidak bisa dibaca tidak boleh menimpa nilai tersimpan dengan NULL
+    salah = ~np.isfinite(berubah[kolom_nilai].to_numpy(dtype=np.float64))
+    if salah.any():
+        baris, kolom = np.nonzero(salah)
+        raise InvalidCellsError(pd.DataFrame({
+            "Baris": berubah.index[baris],
+            "Kolom": np.asarray(kolom_nilai, dtype=object)[kolom],
+            "Nilai": raw.loc[berubah.index].to_numpy(dtype=object)[baris, kolom],
+        }))
+
+    kolom_db = {"Alternatif": "Alternatif", **{v: k for k, v in PENILAIAN_COLUMNS.items()}}
+    upsert_rows(
+        client, "tb_alternatif", frame_to_records(berubah, kolom_db),
+        on_conflict="Alternatif", chunk_size=chunk_size, on_chunk=on_chunk, workspace=workspace,
+    )
+    return berubah
+
+
+def penilaian_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Data Penilaian grid (Alternatif + criterion name columns) from tb_alternatif rows
+
+    Args:
+        rows: Rows of tb_alternatif
+
+    Returns:
+        pd.DataFrame: One row per alternative
+    """
+    data = {"Alternatif": [row["Alternatif"] for row in rows]}
+    for kolom, nama in PENILAIAN_COLUMNS.items():
+        default = PENILAIAN_DEFAULTS[kolom]
+        data[nama] = [row.get(kolom, default) for row in rows]
+    return pd.DataFrame(data)
+
+
+def frame_to_records(frame: pd.DataFrame, columns: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to JSON-ready rows, renaming columns for the database
+
+    Args:
+        frame: Data to convert
+        columns: Mapping of frame column -> database column
+
+    Returns:
+        list: Rows with native Python values (NaN becomes None)
+    """
+    out = frame[list(columns)].rename(columns=columns)
+    out = out.astype(object).where(out.notna(), None)
+    return [
+        {k: (v.item() if isinstance(v, np.generic) else v) for k, v in row.items()}
+        for row in out.to_dict(orient="records")
+    ]
@@ -0,0 +1,236 @@
+"""
+Export module for AHP-SMART application
+Chunked CSV, Parquet and XLSX export with a content-addressed artifact cache
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+
+FORMATS = ("csv", "parquet", "xlsx")
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Batas baris per sheet Excel (termasuk header)
+XLSX_MAX_ROWS = 1_048_576
+
+EXPORT_DIR = Path(os.environ.get("SPK_EXPORT_DIR", Path(tempfile.gettempdir()) / "spk-ahp-smart-export"))
+MAX_ARTIFACTS = 32
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "zip": "application/zip",
+}
+
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """Generated export file"""
+    path: Path
+    file_name: str
+    mime: str
+    digest: str
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+
+def content_hash(sheets: Dict[str, pd.DataFrame], fmt: str) -> str:
+    """
+    SHA-256 of the format, sheet names, columns, dtypes and values
+
+    Args:
+        sheets: Tables to export, by sheet name
+        fmt: Export format
+
+    Returns:
+        str: Hex digest
+    """
+    h = hashlib.sha256(fmt.encode())
+    for name, frame in sheets.items():
+        h.update(repr((name, list(map(str, frame.columns)), list(map(str, frame.dtypes)))).encode())
+        h.update(np.ascontiguousarray(pd.util.hash_pandas_object(frame, index=False).to_numpy()).tobytes())
+    return h.hexdigest()
+
+
+def _file_stem(name: str) -> str:
+    return re.sub(r"[^0-9A-Za-z]+", "_", name).strip("_").lower() or "data"
+
+
+def iter_csv(frame: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Encode a table as CSV one chunk at a time
+
+    Args:
+        frame: Table to export (index is not written)
+        chunk_rows: Rows per chunk
+
+    Yields:
+        bytes: Header first, then the rows chunk by chunk
+    """
+    yield frame.iloc[:0].to_csv(index=False).encode("utf-8")
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].to_csv(index=False, header=False).encode("utf-8")
+
+
+def write_csv(frame: pd.DataFrame, out: BinaryIO, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """Write a table as CSV to a binary stream"""
+    for block in iter_csv(frame, chunk_rows):
+        out.write(block)
+
+
+def write_parquet(frame: pd.DataFrame, out: BinaryIO, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """
+    Write a table as Parquet, one row group per chunk
+
+    Args:
+        frame: Table to export (index is not written)
+        out: Binary stream
+        chunk_rows: Rows per row group
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Ekspor Parquet membutuhkan paket pyarrow") from e
+
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(sheets: Dict[str, pd.DataFrame], out: BinaryIO, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+    """
+    Write tables to one workbook, one sheet each
+
+    Rows are streamed in constant-memory mode; tables longer than an
+    Excel sheet continue on numbered sheets.
+
+    Args:
+        sheets: Tables by sheet name
+        out: Binary stream
+        chunk_rows: Rows converted per chunk
+    """
+    try:
+        import xlsxwriter
+    except ImportError as e:
+        raise ImportError("Ekspor Excel membutuhkan paket xlsxwriter") from e
+
+    per_sheet = XLSX_MAX_ROWS - 1
+    workbook = xlsxwriter.Workbook(out, {"constant_memory": True, "nan_inf_to_errors": True})
+    try:
+        for name, frame in sheets.items():
+            parts = max(1, -(-len(frame) // per_sheet))
+            for part in range(parts):
+                title = name if part == 0 else f"{name} ({part + 1})"
+                sheet = workbook.add_worksheet(title[:31])
+                sheet.write_row(0, 0, [str(c) for c in frame.columns])
+                row = 1
+                part_end = min(len(frame), (part + 1) * per_sheet)
+                for start in range(part * per_sheet, part_end, chunk_rows):
+                    chunk = frame.iloc[start:min(start + chunk_rows, part_end)]
+                    for values in chunk.itertuples(index=False, name=None):
+                        sheet.write_row(row, 0, [None if v is pd.NA else v for v in values])
+                        row += 1
+    finally:
+        workbook.close()
+
+
+def _write(sheets: Dict[str, pd.DataFrame], fmt: str, out: BinaryIO, chunk_rows: int) -> None:
+    if fmt == "xlsx":
+        write_xlsx(sheets, out, chunk_rows)
+        return
+
+    writer = write_csv if fmt == "csv" else write_parquet
+    if len(sheets) == 1:
+        writer(next(iter(sheets.values())), out, chunk_rows)
+        return
+
+    # Beberapa tabel: satu file per tabel di dalam arsip ZIP
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for name, frame in sheets.items():
+            with zf.open(f"{_file_stem(name)}.{fmt}", "w", force_zip64=True) as member:
+                writer(frame, member, chunk_rows)
+
+
+def _evict(keep: Path) -> None:
+    """Remove the oldest artifacts above MAX_ARTIFACTS"""
+    files = [p for p in EXPORT_DIR.iterdir() if p.suffix != ".part"]
+    files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in files[MAX_ARTIFACTS:]:
+        if old != keep:
+            old.unlink(missing_ok=True)
+
+
+def build(
+    sheets: Dict[str, pd.DataFrame],
+    fmt: str,
+    file_stem: str = "hasil_ahp_smart",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    directory: Optional[Path] = None,
+) -> Artifact:
+    """
+    Export tables to a file, reusing an identical earlier export
+
+    The file is written chunk by chunk to disk and named by the content
+    hash, so the same tables in the same format are generated only once
+    per process (or server, while the file is kept). CSV and Parquet
+    exports with more than one table become a ZIP archive.
+
+    Args:
+        sheets: Tables by sheet name; the first one is the main table
+        fmt: "csv", "parquet" or "xlsx"
+        file_stem: Download file name without extension
+        chunk_rows: Rows written per chunk
+        directory: Artifact directory (default EXPORT_DIR)
+
+    Returns:
+        Artifact: Generated or cached file
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    if not sheets:
+        raise ValueError("Tidak ada tabel untuk diekspor")
+
+    ext = fmt if fmt == "xlsx" or len(sheets) == 1 else "zip"
+    digest = content_hash(sheets, fmt)
+    base = Path(directory) if directory is not None else EXPORT_DIR
+    path = base / f"{digest}.{ext}"
+    artifact = Artifact(path, f"{file_stem}.{ext}", MIME_TYPES[ext], digest)
+
+    with _lock:
+        if path.exists():
+            os.utime(path)
+            return artifact
+
+    base.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=base, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            _write(sheets, fmt, out, chunk_rows)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+    if directory is None:
+        with _lock:
+            _evict(path)
+    return artifact
@@ -0,0 +1,137 @@
+"""
+Group decision module for AHP-SMART application
+Aggregates the pairwise matrices of many evaluators (AIJ and AIP)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import ahp
+
+
+AGGREGATION_METHODS = ("aij", "aip")
+
+
+@dataclass(frozen=True)
+class GroupResult:
+    """
+    Consensus weights with per-evaluator details
+
+    `cr` is the consistency ratio of the aggregated matrix for AIJ; for AIP
+    there is no aggregated matrix and it is the weighted mean of the
+    evaluators' CR.
+    """
+    weights: np.ndarray
+    cr: float
+    evaluator_weights: np.ndarray
+    evaluator_priorities: np.ndarray
+    evaluator_cr: np.ndarray
+
+
+def stack_matrices(records: List[Dict[str, Any]], labels: Sequence[str]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """
+    Stack stored matrices into a (k, n, n) array ordered by `labels`
+
+    Matrices whose criteria differ from `labels` (as a set) are skipped.
+
+    Args:
+        records: Rows with `kriteria` (list of labels) and `matriks` (n x n)
+        labels: Criterion order of the stacked matrices
+
+    Returns:
+        tuple: (stack, records that were used)
+    """
+    labels = list(labels)
+    n = len(labels)
+    used, matrices = [], []
+    for row in records:
+        own = list(row.get("kriteria") or [])
+        if len(own) != n or set(own) != set(labels):
+            continue
+        M = np.asarray(row.get("matriks"), dtype=np.float64)
+        if M.shape != (n, n):
+            continue
+        idx = [own.index(label) for label in labels]
+        matrices.append(M[np.ix_(idx, idx)])
+        used.append(row)
+
+    stack = np.stack(matrices) if matrices else np.empty((0, n, n))
+    return stack, used
+
+
+def consistency_weights(cr: np.ndarray, threshold: float = ahp.CR_THRESHOLD) -> np.ndarray:
+    """
+    Evaluator weights that shrink as CR grows: 1 / (1 + CR / threshold)
+
+    A perfectly consistent evaluator counts twice as much as one exactly
+    at the threshold.
+
+    Args:
+        cr: Consistency ratio per evaluator
+        threshold: CR considered acceptable
+
+    Returns:
+        np.ndarray: Weights summing to 1
+    """
+    w = 1.0 / (1.0 + np.maximum(np.asarray(cr, dtype=np.float64), 0.0) / threshold)
+    return w / w.sum()
+
+
+def aggregate_aij(stack: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Element-wise weighted geometric mean of the matrices (AIJ)
+
+    Args:
+        stack: Matrices of shape (k, n, n)
+        weights: Evaluator weights of shape (k,); equal if omitted
+
+    Returns:
+        np.ndarray: Aggregated reciprocal matrix of shape (n, n)
+    """
+    k = stack.shape[0]
+    w = np.full(k, 1.0 / k) if weights is None else np.asarray(weights, dtype=np.float64) / np.sum(weights)
+    return np.exp(np.tensordot(w, np.log(stack), axes=1))
+
+
+def aggregate(stack: np.ndarray, method: str = "aij", weight_method: str = "eigenvector") -> GroupResult:
+    """
+    Consensus weights from a stack of evaluator matrices
+
+    All evaluators are scored in one vectorized ahp.evaluate call; their
+    CR sets how much each one counts.
+
+    Args:
+        stack: Matrices of shape (k, n, n)
+        method: "aij" (aggregate judgments) or "aip" (aggregate priorities)
+        weight_method: AHP weight method
+
+    Returns:
+        GroupResult: Consensus weights and per-evaluator details
+    """
+    if method not in AGGREGATION_METHODS:
+        raise ValueError(f"Metode agregasi tidak dikenal: {method}")
+    if stack.shape[0] == 0:
+        raise ValueError("Belum ada matriks penilai")
+
+    individual = ahp.evaluate(stack, method=weight_method)
+    evaluator_cr = np.atleast_1d(individual.cr)
+    ew = consistency_weights(evaluator_cr)
+
+    if method == "aij":
+        group = ahp.evaluate(aggregate_aij(stack, ew), method=weight_method)
+        weights, cr = group.weights, group.cr
+    else:
+        # AIP: rata-rata tertimbang dari vektor prioritas masing-masing penilai
+        weights = ew @ individual.weights
+        weights = weights / weights.sum()
+        cr = float(ew @ evaluator_cr)
+
+    return GroupResult(
+        weights=weights,
+        cr=float(cr),
+        evaluator_weights=ew,
+        evaluator_priorities=individual.weights,
+        evaluator_cr=evaluator_cr,
+    )
@@ -0,0 +1,229 @@
+"""
+Import module for AHP-SMART application
+Bulk CSV/XLSX import of alternatives and ratings with batched upserts
+"""
+
+import hashlib
+import io
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import db
+
+
+FORMATS = ("csv", "xlsx")
+
+TABLE = "tb_alternatif"
+
+# Nama header yang diterima per kolom (setelah huruf kecil dan spasi dibuang)
+NAME_HEADERS = ("alternatif", "nama", "nama alternatif")
+
+ERROR_COLUMNS = ["Baris", "Kolom", "Nilai", "Masalah"]
+
+# Baris data pertama pada file berada di bawah header
+FIRST_DATA_ROW = 2
+
+
+@dataclass(frozen=True)
+class Validation:
+    """Result of validating an import file"""
+    rows: pd.DataFrame
+    errors: pd.DataFrame
+    columns: Tuple[str, ...]
+    total: int
+    digest: str
+
+    @property
+    def missing(self) -> Tuple[str, ...]:
+        """Criterion columns absent from the file (left unchanged in the database)"""
+        return tuple(c for c in db.PENILAIAN_COLUMNS.values() if c not in self.columns)
+
+
+def _header(name: Any) -> str:
+    return " ".join(str(name).split()).lower()
+
+
+def _sniff_separator(head: bytes) -> str:
+    # CSV dari Excel berlokal Indonesia memakai titik koma
+    line = head.split(b"\n", 1)[0]
+    return ";" if line.count(b";") > line.count(b",") else ","
+
+
+def read_table(data: BinaryIO, file_name: str) -> pd.DataFrame:
+    """
+    Read an uploaded CSV or XLSX file with every cell as text
+
+    Args:
+        data: File contents
+        file_name: Original file name, used to pick the reader
+
+    Returns:
+        pd.DataFrame: Raw cells ("" for empty ones)
+    """
+    ext = file_name.rsplit(".", 1)[-1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Format file tidak didukung: .{ext} (gunakan CSV atau XLSX)")
+
+    if ext == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError as e:
+            raise ImportError("Membaca file Excel membutuhkan paket openpyxl") from e
+        frame = pd.read_excel(data, dtype=str, engine="openpyxl")
+    else:
+        raw = data.read()
+        frame = pd.read_csv(
+            io.BytesIO(raw), dtype=str, keep_default_na=False,
+            sep=_sniff_separator(raw[:4096]), encoding="utf-8-sig",
+        )
+    return frame.fillna("")
+
+
+def _map_columns(frame: pd.DataFrame) -> Dict[str, str]:
+    """File column -> grid column (Alternatif or criterion name)"""
+    wanted = {h: "Alternatif" for h in NAME_HEADERS}
+    for kolom, nama in db.PENILAIAN_COLUMNS.items():
+        wanted[kolom] = nama
+        wanted[nama.lower()] = nama
+
+    mapping: Dict[str, str] = {}
+    for col in frame.columns:
+        target = wanted.get(_header(col))
+        if target is not None and target not in mapping.values():
+            mapping[col] = target
+    return mapping
+
+
+def _errors(frame: pd.DataFrame, mask: np.ndarray, column: str, message: str) -> pd.DataFrame:
+    hits = frame.loc[mask, column] if column in frame else pd.Series("", index=frame.index[mask])
+    return pd.DataFrame({
+        "Baris": hits.index.to_numpy() + FIRST_DATA_ROW,
+        "Kolom": column,
+        "Nilai": hits.astype(str).to_numpy(),
+        "Masalah": message,
+    })
+
+
+def validate(frame: pd.DataFrame) -> Validation:
+    """
+    Validate and coerce raw import cells in vectorized form
+
+    Names are trimmed and must not be empty. Criterion cells must be
+    finite numbers; empty cells stay NaN and, like a missing column,
+    leave the stored value unchanged. A name that appears more than once
+    keeps its last row. Bad rows are reported and left out, the rest can
+    still be imported.
+
+    Args:
+        frame: Raw cells as returned by read_table
+
+    Returns:
+        Validation: Valid rows (Alternatif + criterion columns present in
+        the file), one error per bad cell, and a digest of the valid rows
+    """
+    mapping = _map_columns(frame)
+    if "Alternatif" not in mapping.values():
+        raise ValueError("Kolom 'Alternatif' tidak ditemukan pada file")
+
+    data = frame[list(mapping)].rename(columns=mapping).reset_index(drop=True)
+    kolom_nilai = [c for c in db.PENILAIAN_COLUMNS.values() if c in data]
+
+    laporan: List[pd.DataFrame] = []
+    bad = np.zeros(len(data), dtype=bool)
+
+    nama = data["Alternatif"].astype(str).str.strip()
+    kosong = (nama == "").to_numpy()
+    laporan.append(_errors(data, kosong, "Alternatif", "Nama alternatif kosong"))
+    bad |= kosong
+
+    out = pd.DataFrame({"Alternatif": nama})
+    for col in kolom_nilai:
+        teks = data[col].astype(str).str.strip()
+        # koma desimal ("4,5") diterima seperti titik
+        angka = pd.to_numeric(teks.str.replace(",", ".", regex=False), errors="coerce").to_numpy(dtype=float)
+        isi = (teks != "").to_numpy()
+        salah = isi & ~np.isfinite(angka)
+        laporan.append(_errors(data, salah, col, "Bukan angka"))
+        bad |= salah
+        # sel kosong tetap NaN: tidak dikirim sehingga nilai tersimpan tidak berubah
+        out[col] = np.where(isi, angka, np.nan)
+
+    # nama yang sama dalam satu file: baris terakhir yang dipakai
+    dobel = ~bad & out["Alternatif"].where(~bad).duplicated(keep="last").to_numpy()
+    laporan.append(_errors(data, dobel, "Alternatif", "Duplikat, diganti baris berikutnya"))
+
+    errors = pd.concat(laporan, ignore_index=True).sort_values("Baris", kind="stable", ignore_index=True)
+    rows = out[~(bad | dobel)].reset_index(drop=True)
+
+    h = hashlib.sha256(repr(list(rows.columns)).encode())
+    h.update(np.ascontiguousarray(pd.util.hash_pandas_object(rows, index=False).to_numpy()).tobytes())
+    return Validation(
+        rows=rows,
+        errors=errors[ERROR_COLUMNS],
+        columns=tuple(rows.columns),
+        total=len(data),
+        digest=h.hexdigest(),
+    )
+
+
+def write(
+    client: Any,
+    validation: Validation,
+    start: int = 0,
+    chunk_size: int = db.DEFAULT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+    workspace: Optional[str] = None,
+) -> int:
+    """
+    Upsert the valid rows into tb_alternatif in fixed-size batches
+
+    Rows are converted one batch at a time. Each batch is upserted on
+    the alternative name, so repeating a batch after a failure writes
+    the same values again; an interrupted import resumes by passing the
+    last reported progress as `start`. Criterion columns missing from
+    the file and empty cells are not sent, which keeps the stored values
+    of existing alternatives: rows of a batch are grouped by their empty
+    cells and each group is upserted with only its filled columns.
+
+    Args:
+        client: Supabase connection
+        validation: Result of validate()
+        start: Rows already written by an earlier attempt
+        chunk_size: Maximum rows per request
+        on_chunk: Optional callback(written, total) after each batch,
+            counting the rows of earlier attempts
+        workspace: Workspace the alternatives belong to
+
+    Returns:
+        int: Total rows written, including `start`
+    """
+    rows = validation.rows
+    kolom_db = {v: k for k, v in db.PENILAIAN_COLUMNS.items() if v in rows}
+    kolom_nilai = list(kolom_db)
+    written = start
+    for begin in range(start, len(rows), chunk_size):
+        batch = rows.iloc[begin:begin + chunk_size]
+        # satu upsert per pola sel kosong; semua baris dalam satu request memiliki kolom yang sama
+        kosong = batch[kolom_nilai].isna().to_numpy()
+        pola = kosong @ (1 << np.arange(len(kolom_nilai), dtype=np.int64))
+        for kode in np.unique(pola):
+            kolom = {"Alternatif": "Alternatif"}
+            kolom.update({c: kolom_db[c] for j, c in enumerate(kolom_nilai) if not (int(kode) >> j) & 1})
+            db.upsert_rows(
+                client, TABLE, db.frame_to_records(batch[pola == kode], kolom),
+                on_conflict="Alternatif", chunk_size=chunk_size, workspace=workspace,
+            )
+        written += len(batch)
+        if on_chunk:
+            on_chunk(written, len(rows))
+    return written
+
+
+def template() -> bytes:
+    """CSV template with the accepted columns"""
+    kolom = ["Alternatif", *db.PENILAIAN_COLUMNS.values()]
+    contoh = {"Alternatif": "Supplier A", **{db.PENILAIAN_COLUMNS[k]: v for k, v in db.PENILAIAN_DEFAULTS.items()}}
+    return pd.DataFrame([contoh], columns=kolom).to_csv(index=False).encode("utf-8")
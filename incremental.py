@@ -0,0 +1,328 @@
+"""
+Incremental scoring module for AHP-SMART application
+Keeps SMART utilities, scores and ranks current under single-row edits
+"""
+
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import memory
+import smart
+
+
+# Jika lebih dari bagian ini yang berubah sekaligus, satu hitung ulang penuh lebih murah
+BULK_FRACTION = 0.05
+
+
+def _label_array(labels: Sequence[Hashable]) -> np.ndarray:
+    # fromiter tidak memecah label tuple menjadi kolom
+    return np.fromiter(labels, dtype=object, count=len(labels))
+
+
+class IncrementalScorer:
+    """
+    SMART scores that are updated row by row
+
+    Holds the raw matrix, the per-criterion minimum/maximum (with the
+    number of rows sitting on each bound), the utilities and the scores.
+    Changing one alternative rescores only that row, unless it moves a
+    column's minimum or maximum; then every utility of the table changes
+    and everything is recomputed.
+
+    Ranks live in an order-statistics array: row ids sorted best first
+    with their negated scores next to them. An edit finds the old and
+    new position by binary search and shifts only the entries in
+    between, instead of re-sorting all rows. Ties are ordered by row
+    and ranks follow `method="min"`, like smart.ranking_frame. Scores
+    after any sequence of edits are bit-identical to a scorer built from
+    scratch on the edited data and to smart.score, since both use
+    smart.weighted_sum.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[Hashable],
+        matrix: np.ndarray,
+        weights: Sequence[float],
+        criteria: Sequence[smart.Criterion],
+    ):
+        X = np.array(matrix, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(criteria):
+            raise ValueError(f"Matriks {X.shape} tidak sesuai dengan {len(criteria)} kriteria")
+        if len(labels) != X.shape[0]:
+            raise ValueError(f"Jumlah label ({len(labels)}) tidak sesuai dengan {X.shape[0]} baris")
+
+        self.criteria = tuple(criteria)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        if self.weights.shape != (len(self.criteria),):
+            raise ValueError(f"Jumlah bobot ({self.weights.size}) tidak sesuai dengan {len(self.criteria)} kriteria")
+
+        self._labels = _label_array(labels)
+        self._rows: Dict[Hashable, int] = {label: i for i, label in enumerate(self._labels)}
+        self._X = X
+        # Batas tetap dari spesifikasi kriteria tidak bergantung pada data
+        self._fixed_lo = np.array([c.lower is not None for c in self.criteria])
+        self._fixed_hi = np.array([c.upper is not None for c in self.criteria])
+
+        self.row_updates = 0
+        self.full_rescores = 0
+        self._rescore_all()
+
+    # ---- read access ----
+    # labels/scores/normalized/score_frame are zero-copy views: a row update
+    # changes them in place, while a full rescore or an appended row replaces
+    # the underlying arrays and leaves earlier views on the old data. Read
+    # them again after every change instead of keeping them.
+    def __len__(self) -> int:
+        return self._X.shape[0]
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Labels in row order (read-only view)"""
+        return memory.readonly(self._labels)
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Scores (read-only view)"""
+        return memory.readonly(self._scores)
+
+    @property
+    def normalized(self) -> np.ndarray:
+        """Utilities (read-only view)"""
+        return memory.readonly(self._U)
+
+    @property
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self._lo.copy(), self._hi.copy()
+
+    def row_of(self, label: Hashable) -> Optional[int]:
+        """Row of an alternative, or None if unknown"""
+        return self._rows.get(label)
+
+    def rank(self, row: int) -> int:
+        """Rank of one row (1 = best)"""
+        key = self._key(self._scores[row])
+        return int(np.searchsorted(self._neg, key, side="left")) + 1
+
+    def top(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Row indices and ranks of the best k alternatives, best first
+
+        Args:
+            k: Number of alternatives
+
+        Returns:
+            tuple: (row indices, ranks); equal to smart.top_k(scores, k)
+        """
+        k = max(0, min(int(k), len(self)))
+        idx = self._order[:k].copy()
+        ranks = np.searchsorted(self._neg, self._neg[:k], side="left") + 1
+        return idx, ranks.astype(np.int64)
+
+    def ranking_frame(self, k: Optional[int] = None) -> pd.DataFrame:
+        """Ranking table like smart.ranking_frame, read from the sorted order"""
+        idx, ranks = self.top(len(self) if k is None else k)
+        return pd.DataFrame(
+            {"Alternatif": self._labels[idx], "Score": self._scores[idx], "Rank": ranks},
+            index=idx,
+        )
+
+    def score_frame(self) -> pd.DataFrame:
+        """
+        Alternatif/Score table in row order over the current arrays
+
+        Returns:
+            pd.DataFrame: Zero-copy columns; valid until the next update
+        """
+        return pd.DataFrame(
+            {"Alternatif": pd.Series(self.labels, dtype=object, copy=False), "Score": self.scores},
+            copy=False,
+        )
+
+    def copy(self) -> "IncrementalScorer":
+        """
+        Independent copy (e.g. of a scorer shared through cache.results)
+
+        The label array is shared: it is never written in place, new
+        labels replace it with a longer array.
+        """
+        other = object.__new__(IncrementalScorer)
+        other.__dict__.update(self.__dict__)
+        other._rows = dict(self._rows)
+        for name in ("_X", "_U", "_scores", "_order", "_neg", "_lo", "_hi", "_lo_count", "_hi_count"):
+            setattr(other, name, getattr(self, name).copy())
+        return other
+
+    # ---- updates ----
+    def update(self, row: int, values: Sequence[float]) -> bool:
+        """
+        Replace the raw values of one alternative
+
+        Args:
+            row: Row to change
+            values: New raw value per criterion
+
+        Returns:
+            bool: True if a bound moved and the whole table was rescored
+        """
+        new = np.asarray(values, dtype=np.float64)
+        if new.shape != (len(self.criteria),):
+            raise ValueError(f"Jumlah nilai ({new.size}) tidak sesuai dengan {len(self.criteria)} kriteria")
+        old = self._X[row].copy()
+        self._X[row] = new
+
+        if self._bounds_change(old, new):
+            self._rescore_all()
+            return True
+
+        self._count_bounds(old, -1)
+        self._count_bounds(new, +1)
+        self._rescore_row(row)
+        return False
+
+    def upsert(self, label: Hashable, values: Sequence[float]) -> bool:
+        """
+        Update an alternative by label, appending it if it is new
+
+        Args:
+            label: Alternative name
+            values: Raw value per criterion
+
+        Returns:
+            bool: True if the whole table was rescored
+        """
+        row = self._rows.get(label)
+        if row is not None:
+            return self.update(row, values)
+
+        new = np.asarray(values, dtype=np.float64).reshape(1, -1)
+        if new.shape[1] != len(self.criteria):
+            raise ValueError(f"Jumlah nilai ({new.shape[1]}) tidak sesuai dengan {len(self.criteria)} kriteria")
+        row = len(self)
+        self._labels = np.concatenate([self._labels, _label_array([label])])
+        self._rows[label] = row
+        self._X = np.concatenate([self._X, new])
+
+        if self._bounds_change(np.full(new.shape[1], np.nan), new[0]):
+            self._rescore_all()
+            return True
+
+        self._count_bounds(new[0], +1)
+        self._U = np.concatenate([self._U, np.zeros((1, len(self.criteria)))])
+        self._scores = np.append(self._scores, np.nan)
+        # Baris baru masuk dari posisi paling akhir lalu digeser ke tempatnya
+        self._neg = np.append(self._neg, np.inf)
+        self._order = np.append(self._order, row)
+        self._rescore_row(row, append=True)
+        return False
+
+    def upsert_many(self, labels: Sequence[Hashable], matrix: np.ndarray) -> bool:
+        """
+        Apply several changed alternatives at once
+
+        Large batches are written into the matrix and rescored once
+        instead of row by row.
+
+        Args:
+            labels: Alternative names
+            matrix: Raw values of shape (k, m), aligned with labels
+
+        Returns:
+            bool: True if the whole table was rescored
+        """
+        X = np.asarray(matrix, dtype=np.float64).reshape(len(labels), len(self.criteria))
+        if len(labels) <= max(1, BULK_FRACTION * len(self)):
+            full = False
+            for label, values in zip(labels, X):
+                full |= self.upsert(label, values)
+            return full
+
+        new_labels, new_rows = [], []
+        n = len(self)
+        for label, values in zip(labels, X):
+            row = self._rows.get(label)
+            if row is None:
+                self._rows[label] = n + len(new_labels)
+                new_labels.append(label)
+                new_rows.append(values)
+            elif row >= n:
+                # label baru yang muncul lagi dalam batch yang sama
+                new_rows[row - n] = values
+            else:
+                self._X[row] = values
+        if new_rows:
+            self._labels = np.concatenate([self._labels, _label_array(new_labels)])
+            self._X = np.concatenate([self._X, np.asarray(new_rows)])
+        self._rescore_all()
+        return True
+
+    # ---- internals ----
+    @staticmethod
+    def _key(score: float) -> float:
+        # kunci urut naik; NaN diperlakukan sebagai -inf (peringkat terakhir)
+        return np.inf if np.isnan(score) else -score
+
+    def _rescore_all(self) -> None:
+        self._lo, self._hi = smart.column_bounds(self._X)
+        self._lo_count = np.sum(self._X == self._lo, axis=0)
+        self._hi_count = np.sum(self._X == self._hi, axis=0)
+        self._U = smart.normalize(self._X, self.criteria, (self._lo, self._hi))
+        self._scores = smart.weighted_sum(self._U, self.weights)
+
+        keys = np.where(np.isnan(self._scores), np.inf, -self._scores)
+        self._order = np.lexsort((np.arange(len(keys)), keys))
+        self._neg = keys[self._order]
+        self.full_rescores += 1
+
+    def _bounds_change(self, old: np.ndarray, new: np.ndarray) -> bool:
+        """Whether replacing `old` with `new` moves an observed, non-fixed bound"""
+        lo, hi = self._lo, self._hi
+        changed = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+        with np.errstate(invalid="ignore"):
+            # batas melebar: nilai baru di luar rentang (atau kolom sebelumnya kosong)
+            below = ~np.isnan(new) & (np.isnan(lo) | (new < lo))
+            above = ~np.isnan(new) & (np.isnan(hi) | (new > hi))
+            # batas menyempit: satu-satunya baris di batas diubah
+            leave_lo = changed & (old == lo) & (self._lo_count <= 1)
+            leave_hi = changed & (old == hi) & (self._hi_count <= 1)
+        move_lo = (below | leave_lo) & ~self._fixed_lo
+        move_hi = (above | leave_hi) & ~self._fixed_hi
+        return bool(np.any(changed & (move_lo | move_hi)))
+
+    def _count_bounds(self, values: np.ndarray, delta: int) -> None:
+        self._lo_count += delta * (values == self._lo)
+        self._hi_count += delta * (values == self._hi)
+
+    def _rescore_row(self, row: int, append: bool = False) -> None:
+        U_row = smart.normalize(self._X[row:row + 1], self.criteria, (self._lo, self._hi))[0]
+        old_key = np.inf if append else self._key(self._scores[row])
+        self._U[row] = U_row
+        self._scores[row] = smart.weighted_sum(self._U[row:row + 1], self.weights)[0]
+        self._move(row, old_key, self._key(self._scores[row]), append)
+        self.row_updates += 1
+
+    def _position(self, key: float, row: int) -> int:
+        """Index of (key, row) in the sorted arrays (insertion point if absent)"""
+        lo = int(np.searchsorted(self._neg, key, side="left"))
+        hi = int(np.searchsorted(self._neg, key, side="right"))
+        return lo + int(np.searchsorted(self._order[lo:hi], row))
+
+    def _move(self, row: int, old_key: float, new_key: float, append: bool) -> None:
+        neg, order = self._neg, self._order
+        p = len(order) - 1 if append else self._position(old_key, row)
+        if not append and old_key == new_key:
+            return
+
+        q = self._position(new_key, row)
+        if q > p:
+            # geser entri di antara posisi lama dan baru satu langkah ke depan
+            q -= 1
+            neg[p:q] = neg[p + 1:q + 1]
+            order[p:q] = order[p + 1:q + 1]
+        elif q < p:
+            neg[q + 1:p + 1] = neg[q:p]
+            order[q + 1:p + 1] = order[q:p]
+        neg[q] = new_key
+        order[q] = row
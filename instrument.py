@@ -0,0 +1,250 @@
+"""
+Instrumentation module for AHP-SMART application
+Opt-in timing of Supabase calls and page phases with a sidebar debug panel
+
+Enable with the query parameter ?debug=1 (remembered for the session)
+or the environment variable SPK_DEBUG=1. When disabled, `wrap()` returns
+the client untouched and `phase()` does nothing.
+"""
+
+import json
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+import cache
+import memory
+
+
+HISTORY_LIMIT = 2000
+
+QUERY_METHODS = frozenset({"select", "insert", "upsert", "update", "delete"})
+
+# Status run yang aktif; ikut tersalin ke thread pemuat (db.load_concurrently)
+# yang tidak dapat mengakses st.session_state
+_active: ContextVar[Optional[Dict[str, Any]]] = ContextVar("instrument_state", default=None)
+
+
+def enabled() -> bool:
+    """Whether instrumentation is on for this session"""
+    if os.environ.get("SPK_DEBUG") == "1":
+        return True
+    if st.session_state.get("debug"):
+        return True
+    try:
+        if st.query_params.get("debug") == "1":
+            st.session_state.debug = True
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def _state() -> Dict[str, Any]:
+    if "instrument" not in st.session_state:
+        st.session_state.instrument = {
+            "run": None,
+            "page": None,
+            "current": [],
+            "history": deque(maxlen=HISTORY_LIMIT),
+        }
+    return st.session_state.instrument
+
+
+def _payload_size(value: Any) -> int:
+    if value is None:
+        return 0
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return 0
+
+
+def _record(kind: str, **fields) -> None:
+    state = _active.get() or _state()
+    entry = {"type": kind, "run": state["run"], "page": state["page"], "ts": time.time(), **fields}
+    state["current"].append(entry)
+    state["history"].append(entry)
+
+
+def start_run(page: str) -> None:
+    """
+    Mark the start of a script rerun
+
+    Args:
+        page: Page name shown in the panel and export
+    """
+    if not enabled():
+        return
+    state = _state()
+    state["run"] = uuid.uuid4().hex[:8]
+    state["page"] = page
+    state["current"] = []
+    state["started"] = time.perf_counter()
+    _active.set(state)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Time a named phase of the page script
+
+    Args:
+        name: Phase name, e.g. "load", "data_editor", "chart"
+    """
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record("phase", name=name, ms=(time.perf_counter() - start) * 1000)
+
+
+class _InstrumentedQuery:
+    """Proxy for a PostgREST request builder that times execute()"""
+
+    def __init__(self, query: Any, table: str, method: str = "select", sent: int = 0):
+        self._query = query
+        self._table = table
+        self._method = method
+        self._sent = sent
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if name in QUERY_METHODS:
+                sent = _payload_size(args[0]) if args and name != "select" else 0
+                return _InstrumentedQuery(result, self._table, name, sent)
+            return _InstrumentedQuery(result, self._table, self._method, self._sent)
+
+        return call
+
+    def execute(self) -> Any:
+        start = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = self._query.execute()
+            return result
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            data = getattr(result, "data", None)
+            _record(
+                "call",
+                table=self._table,
+                method=self._method,
+                ms=(time.perf_counter() - start) * 1000,
+                bytes_out=self._sent,
+                bytes_in=_payload_size(data),
+                rows=len(data) if isinstance(data, list) else None,
+                error=error,
+            )
+
+
+class _InstrumentedClient:
+    """Proxy for a Supabase client; table() and rpc() calls are recorded"""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def table(self, name: str) -> _InstrumentedQuery:
+        return _InstrumentedQuery(self._client.table(name), name)
+
+    def rpc(self, name: str, params: Optional[Dict[str, Any]] = None, *args, **kwargs) -> _InstrumentedQuery:
+        query = self._client.rpc(name, params or {}, *args, **kwargs)
+        return _InstrumentedQuery(query, f"rpc:{name}", "rpc", _payload_size(params))
+
+
+def wrap(client: Any) -> Any:
+    """
+    Wrap a Supabase client so its calls are recorded (no-op when disabled)
+
+    Args:
+        client: Client from st.connection() or auth.get_supabase_client()
+
+    Returns:
+        The instrumented proxy, or the client itself when disabled
+    """
+    if not enabled() or isinstance(client, _InstrumentedClient):
+        return client
+    return _InstrumentedClient(client)
+
+
+def export_jsonl() -> str:
+    """Recorded history as JSON lines"""
+    return "\n".join(json.dumps(entry, default=str) for entry in _state()["history"])
+
+
+def render_panel() -> None:
+    """Show the collapsible debug panel in the sidebar for the current rerun"""
+    if not enabled():
+        return
+
+    state = _state()
+    entries: List[Dict[str, Any]] = state["current"]
+    total = (time.perf_counter() - state.get("started", time.perf_counter())) * 1000
+
+    with st.sidebar.expander("🐞 Debug: waktu eksekusi", expanded=False):
+        calls = [e for e in entries if e["type"] == "call"]
+        phases = [e for e in entries if e["type"] == "phase"]
+
+        st.caption(f"Rerun {state['run']} · {state['page']} · {total:.1f} ms")
+        col1, col2 = st.columns(2)
+        col1.metric("Panggilan Supabase", len(calls))
+        col2.metric("Waktu Supabase", f"{sum(c['ms'] for c in calls):.1f} ms")
+
+        if phases:
+            st.markdown("**Fase**")
+            st.dataframe(pd.DataFrame(phases)[["name", "ms"]].round(2), hide_index=True, use_container_width=True)
+        if calls:
+            st.markdown("**Panggilan**")
+            st.dataframe(
+                pd.DataFrame(calls)[["table", "method", "ms", "rows", "bytes_out", "bytes_in"]].round(2),
+                hide_index=True,
+                use_container_width=True,
+            )
+
+        stats = cache.tables.stats()
+        st.caption(
+            f"Cache tabel: {stats['hits']} hit / {stats['misses']} miss, "
+            f"{stats['entries']} entri ({stats['bytes'] / 2 ** 20:.1f} MB)"
+        )
+        stats = cache.results.stats()
+        st.caption(
+            f"Cache hasil: {stats['hits']} hit / {stats['disk_hits']} hit disk / {stats['misses']} miss, "
+            f"{stats['entries']} entri ({stats['bytes'] / 2 ** 20:.1f} MB)"
+        )
+
+        usage = memory.session_usage(st.session_state.to_dict())
+        used = int(usage["Byte"].sum())
+        budget = memory.SESSION_BUDGET_BYTES
+        st.caption(f"Memori sesi: {used / 2 ** 20:.1f} MB dari {budget / 2 ** 20:.0f} MB")
+        if used > budget:
+            st.warning("Memori sesi melebihi batas.")
+        st.dataframe(usage.head(10), hide_index=True, use_container_width=True)
+
+        st.download_button(
+            "Ekspor JSON Lines",
+            export_jsonl(),
+            "instrumentasi.jsonl",
+            "application/x-ndjson",
+            use_container_width=True,
+        )
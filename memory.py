@@ -0,0 +1,131 @@
+"""
+Memory module for AHP-SMART application
+Per-session memory accounting with shared buffers counted once
+"""
+
+import os
+import sys
+from typing import Any, Dict, Mapping, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+
+# Batas memori per sesi; di atas batas ini panel debug memberi peringatan
+SESSION_BUDGET_BYTES = int(float(os.environ.get("SPK_SESSION_BUDGET_MB", "256")) * 2 ** 20)
+
+# Wadah objek yang lebih panjang dari ini diukur dari sampel elemennya
+SAMPLE_LIMIT = 10_000
+
+
+def readonly(array: np.ndarray) -> np.ndarray:
+    """
+    Read-only view of an array, without copying
+
+    Consumers that need to change the data take their own copy; the
+    original buffer is shared by every table derived from it.
+
+    Args:
+        array: Source array
+
+    Returns:
+        np.ndarray: View with writeable=False
+    """
+    view = np.asarray(array).view()
+    view.flags.writeable = False
+    return view
+
+
+def _root(array: np.ndarray) -> np.ndarray:
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _objects_size(items: Any, seen: Set[int]) -> int:
+    """Size of the elements of an object sequence not counted before"""
+    n = len(items)
+    if n == 0:
+        return 0
+    # Sampel pada posisi yang sama: urutan label yang sama di beberapa tabel
+    # mengenai objek yang sama, sehingga payload bersama tetap dihitung sekali
+    step = max(1, n // SAMPLE_LIMIT)
+    sample = items[::step]
+    total = 0
+    for item in sample:
+        total += deep_size(item, seen)
+    return int(total * n / len(sample))
+
+
+def deep_size(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate bytes held by a value, counting shared objects once
+
+    NumPy views count their base buffer only the first time it is met,
+    so tables derived from the same arrays cost only their own headers.
+    Long object sequences are measured from an evenly spaced sample.
+
+    Args:
+        value: Object to measure
+        seen: Ids already counted (shared between calls to deduplicate)
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    if seen is None:
+        seen = set()
+
+    if isinstance(value, np.ndarray):
+        root = _root(value)
+        size = 0
+        if id(root) not in seen:
+            seen.add(id(root))
+            size += root.nbytes
+        if value.dtype == object:
+            size += _objects_size(value.ravel(), seen)
+        return size
+
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, pd.DataFrame):
+        return sys.getsizeof(object()) + deep_size(value.index, seen) + sum(
+            deep_size(value[col].to_numpy(copy=False), seen) for col in value.columns
+        )
+    if isinstance(value, pd.RangeIndex):
+        return value.memory_usage()
+    if isinstance(value, (pd.Series, pd.Index)):
+        return deep_size(value.to_numpy(copy=False), seen)
+    if isinstance(value, Mapping):
+        size = sys.getsizeof(value)
+        if len(value) > SAMPLE_LIMIT:
+            return size + _objects_size(list(value.keys()), seen) + _objects_size(list(value.values()), seen)
+        return size + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = value if isinstance(value, (list, tuple)) else list(value)
+        return sys.getsizeof(value) + _objects_size(items, seen)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + deep_size(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+def session_usage(state: Mapping[str, Any]) -> pd.DataFrame:
+    """
+    Memory held by each session state entry
+
+    A buffer shared by several entries is attributed to the first one
+    measured, in key order.
+
+    Args:
+        state: Session state (or any mapping of entries)
+
+    Returns:
+        pd.DataFrame: Columns Kunci and Byte, largest first
+    """
+    seen: Set[int] = set()
+    sizes: Dict[str, int] = {str(k): deep_size(v, seen) for k, v in state.items()}
+    frame = pd.DataFrame({"Kunci": list(sizes), "Byte": list(sizes.values())})
+    return frame.sort_values("Byte", ascending=False, ignore_index=True)
@@ -0,0 +1,280 @@
+"""
+Monte Carlo module for AHP-SMART application
+Uncertainty of the final ranking under perturbed pairwise judgments
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+import ahp
+import smart
+
+
+# Skala Saaty: 1/9, 1/8, ..., 1/2, 1, 2, ..., 9
+SAATY_SCALE = np.concatenate([1.0 / np.arange(9, 1, -1), np.arange(1, 10)]).astype(np.float64)
+
+DEFAULT_BATCH_SIZE = 5_000
+DEFAULT_MAX_RANK = 10
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    """
+    Aggregated simulation outcome
+
+    `rank_counts[a, r]` counts the samples in which alternative `a` got
+    rank r + 1; the last column collects every rank beyond `max_rank - 1`
+    when there are more alternatives than tracked ranks. `drawn` counts
+    every generated sample, `samples` only those kept (all of them unless
+    inconsistent samples are discarded).
+    """
+    samples: int
+    drawn: int
+    consistent: int
+    rank_counts: np.ndarray
+    weight_sum: np.ndarray
+    weight_sq_sum: np.ndarray
+    cr_sum: float
+
+    @property
+    def rank_probabilities(self) -> np.ndarray:
+        """rank_counts as probabilities"""
+        return self.rank_counts / max(self.samples, 1)
+
+    @property
+    def weight_mean(self) -> np.ndarray:
+        return self.weight_sum / max(self.samples, 1)
+
+    @property
+    def weight_std(self) -> np.ndarray:
+        mean = self.weight_mean
+        return np.sqrt(np.maximum(self.weight_sq_sum / max(self.samples, 1) - mean ** 2, 0.0))
+
+    @property
+    def cr_mean(self) -> float:
+        return self.cr_sum / max(self.samples, 1)
+
+    @property
+    def consistent_rate(self) -> float:
+        """Share of generated samples with CR within the threshold"""
+        return self.consistent / max(self.drawn, 1)
+
+    def __add__(self, other: "MonteCarloResult") -> "MonteCarloResult":
+        return MonteCarloResult(
+            samples=self.samples + other.samples,
+            drawn=self.drawn + other.drawn,
+            consistent=self.consistent + other.consistent,
+            rank_counts=self.rank_counts + other.rank_counts,
+            weight_sum=self.weight_sum + other.weight_sum,
+            weight_sq_sum=self.weight_sq_sum + other.weight_sq_sum,
+            cr_sum=self.cr_sum + other.cr_sum,
+        )
+
+
+def scale_index(values: np.ndarray) -> np.ndarray:
+    """Index of the nearest Saaty scale value (compared on a log scale)"""
+    v = np.log(np.asarray(values, dtype=np.float64))
+    return np.abs(v[..., None] - np.log(SAATY_SCALE)).argmin(axis=-1)
+
+
+def sample_matrices(matrix: np.ndarray, size: int, steps: int = 1, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Reciprocal matrices with every judgment moved up to `steps` scale steps
+
+    Args:
+        matrix: Entered pairwise matrix of shape (n, n)
+        size: Number of samples
+        steps: Maximum number of Saaty scale steps per judgment
+        rng: Random generator
+
+    Returns:
+        np.ndarray: Samples of shape (size, n, n)
+    """
+    rng = rng or np.random.default_rng()
+    M = np.asarray(matrix, dtype=np.float64)
+    n = M.shape[0]
+    iu, ju = np.triu_indices(n, 1)
+
+    base = scale_index(M[iu, ju])
+    idx = np.clip(base + rng.integers(-steps, steps + 1, size=(size, len(iu))), 0, len(SAATY_SCALE) - 1)
+    values = SAATY_SCALE[idx]
+
+    A = np.ones((size, n, n))
+    A[:, iu, ju] = values
+    A[:, ju, iu] = 1.0 / values
+    return A
+
+
+def rank_rows(scores: np.ndarray) -> np.ndarray:
+    """Row-wise descending ranks with ties sharing the lowest rank"""
+    s, n = scores.shape
+    order = np.argsort(-scores, axis=1)
+    ordered = np.take_along_axis(scores, order, axis=1)
+    new_group = np.ones((s, n), dtype=bool)
+    new_group[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    start = np.maximum.accumulate(np.where(new_group, np.arange(n), 0), axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, start + 1, axis=1)
+    return ranks
+
+
+def simulate_batch(
+    matrix: np.ndarray,
+    utilities: np.ndarray,
+    size: int,
+    steps: int = 1,
+    seed: Optional[int] = None,
+    method: str = "eigenvector",
+    only_consistent: bool = False,
+    max_rank: int = DEFAULT_MAX_RANK,
+) -> MonteCarloResult:
+    """
+    Simulate one batch of samples (runs inside a worker process)
+
+    Args:
+        matrix: Entered pairwise matrix of shape (m, m)
+        utilities: SMART utilities of shape (n, m)
+        size: Number of samples in this batch
+        steps: Maximum Saaty scale steps per judgment
+        seed: Seed for this batch
+        method: AHP weight method
+        only_consistent: Discard samples with CR above 0.1
+        max_rank: Number of rank positions tracked per alternative
+
+    Returns:
+        MonteCarloResult: Counts for this batch
+    """
+    U = np.asarray(utilities, dtype=np.float64)
+    n_alt = U.shape[0]
+    R = max(1, min(max_rank, n_alt))
+
+    result = ahp.evaluate(sample_matrices(matrix, size, steps, np.random.default_rng(seed)), method=method)
+    W = result.weights
+    cr = np.atleast_1d(result.cr)
+    keep = cr <= ahp.CR_THRESHOLD
+    if only_consistent:
+        W, cr = W[keep], cr[keep]
+
+    # dijumlah per kolom seperti skor SMART lainnya: alternatif yang seri tetap seri
+    ranks = rank_rows(smart.weighted_sum(U, W))
+    cells = np.arange(n_alt)[None, :] * R + np.minimum(ranks, R) - 1
+    counts = np.bincount(cells.ravel(), minlength=n_alt * R).reshape(n_alt, R)
+
+    return MonteCarloResult(
+        samples=len(W),
+        drawn=size,
+        consistent=int(keep.sum()),
+        rank_counts=counts,
+        weight_sum=W.sum(axis=0),
+        weight_sq_sum=(W ** 2).sum(axis=0),
+        cr_sum=float(cr.sum()),
+    )
+
+
+def get_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Process pool shared by every session in the process
+
+    Workers are started with "spawn" so they do not inherit the threads
+    of the Streamlit server.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+class MonteCarloJob:
+    """
+    Handle to a simulation running in the process pool
+
+    Polling `done()`/`progress` never blocks, so the Streamlit script can
+    return and check back on the next rerun.
+    """
+
+    def __init__(self, futures: List[Future]):
+        self.futures = futures
+
+    @property
+    def progress(self) -> float:
+        return sum(f.done() for f in self.futures) / max(len(self.futures), 1)
+
+    def done(self) -> bool:
+        return all(f.done() for f in self.futures)
+
+    def cancel(self) -> None:
+        for f in self.futures:
+            f.cancel()
+
+    def result(self) -> MonteCarloResult:
+        """Combine batch results (blocks until every batch is finished)"""
+        results = [f.result() for f in self.futures]
+        total = results[0]
+        for r in results[1:]:
+            total = total + r
+        return total
+
+
+def start(
+    matrix: np.ndarray,
+    utilities: np.ndarray,
+    samples: int,
+    steps: int = 1,
+    method: str = "eigenvector",
+    only_consistent: bool = False,
+    max_rank: int = DEFAULT_MAX_RANK,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    seed: Optional[int] = None,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> MonteCarloJob:
+    """
+    Split a simulation into batches and submit them to the process pool
+
+    Each batch gets an independent seed spawned from `seed`, so results
+    are reproducible regardless of how batches are scheduled.
+
+    Args:
+        matrix: Entered pairwise matrix of shape (m, m)
+        utilities: SMART utilities of shape (n, m)
+        samples: Total number of samples
+        steps: Maximum Saaty scale steps per judgment
+        method: AHP weight method
+        only_consistent: Discard samples with CR above 0.1
+        max_rank: Number of rank positions tracked per alternative
+        batch_size: Samples per batch
+        seed: Base seed
+        executor: Pool to use; defaults to the shared process pool
+
+    Returns:
+        MonteCarloJob: Handle to poll for progress and results
+    """
+    executor = executor or get_executor()
+    matrix = np.asarray(matrix, dtype=np.float64)
+    utilities = np.ascontiguousarray(utilities, dtype=np.float64)
+
+    sizes = [batch_size] * (samples // batch_size)
+    if samples % batch_size:
+        sizes.append(samples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    futures = [
+        executor.submit(
+            simulate_batch, matrix, utilities, size, steps,
+            int(s.generate_state(1)[0]), method, only_consistent, max_rank,
+        )
+        for size, s in zip(sizes, seeds)
+    ]
+    return MonteCarloJob(futures)
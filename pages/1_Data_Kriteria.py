@@ -1,7 +1,5 @@
 import streamlit as st
-from st_supabase_connection import execute_query, SupabaseConnection
 import pandas as pd
-import numpy as np
 import sys
 from pathlib import Path
 
@@ -10,29 +8,26 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 import auth
+import cache
+import instrument
+import ahp
+import db
+from pairwise import PairwiseMatrix
 
 auth.initialize_auth_state()
 
 auth.require_auth()
 
-st_supabase = st.connection(
-    name="supabase_connection",
-    type=SupabaseConnection,
-    ttl=None,
-)
+instrument.start_run("1_Data_Kriteria")
+
+st_supabase = auth.get_supabase_client()
+workspace = auth.get_workspace_id()
 
 st.title("1. Data Kriteria (AHP)")
 
 # ====================== LOAD DATA ======================
-data_supabase = execute_query(
-    st_supabase.table("tb_kriteria").select("*").order("id"),
-    ttl=0
-)
-
-if isinstance(data_supabase, dict) and "data" in data_supabase:
-    data_supabase = data_supabase["data"]
-elif hasattr(data_supabase, "data"):
-    data_supabase = data_supabase.data
+with instrument.phase("load"):
+    data_supabase = db.fetch_rows(st_supabase, "tb_kriteria", order=("urutan", "id"), workspace=workspace)
 
 # ====================== KRITERIA ======================
 if "kriteria" not in st.session_state:
@@ -43,96 +38,53 @@ if "kriteria" not in st.session_state:
 
 st.subheader("Daftar Kriteria")
 df_k = pd.DataFrame({"Kriteria": st.session_state.kriteria})
-edited_k = st.data_editor(df_k, num_rows="dynamic")
+with instrument.phase("data_editor_kriteria"):
+    edited_k = st.data_editor(df_k, num_rows="dynamic")
 st.session_state.kriteria = edited_k["Kriteria"].tolist()
 
 # ====================== INIT MATRIX ======================
 n = len(st.session_state.kriteria)
 
 if "pairwise" not in st.session_state or st.session_state.get("pairwise_shape") != n:
-    M = np.zeros((n, n)).astype(str)
-
-    # default 1 di diagonal
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                M[i][j] = "1"
-
-    # jika ada data dari supabase
-    if data_supabase and n > 0:
-        for i, row in enumerate(data_supabase):
-            for j in range(n):
-                col = f"k{j+1}"
-                if col in row and row[col] is not None:
-                    M[i][j] = str(row[col])
-
-    st.session_state.pairwise = pd.DataFrame(
-        M,
-        index=st.session_state.kriteria,
-        columns=st.session_state.kriteria
-    )
+    # diagonal 1, sisanya diisi dari supabase jika ada
+    st.session_state.pairwise = PairwiseMatrix.from_records(data_supabase, st.session_state.kriteria)
     st.session_state.pairwise_shape = n
+elif st.session_state.pairwise.labels != st.session_state.kriteria:
+    st.session_state.pairwise = PairwiseMatrix(st.session_state.kriteria, st.session_state.pairwise.values)
 
 # ====================== EDIT MATRIX TAMPILAN STRING ======================
 st.subheader("Matriks Perbandingan Berpasangan (AHP)")
 
-pair_str = st.data_editor(
-    st.session_state.pairwise,
-    num_rows="dynamic"
-)
+with instrument.phase("data_editor_matriks"):
+    pair_str = st.data_editor(
+        st.session_state.pairwise.to_display_frame(),
+        num_rows="dynamic"
+    )
 
-# konversi ke float untuk perhitungan
-M = pair_str.copy()
-for i in range(n):
-    for j in range(n):
-        try:
-            M.iat[i, j] = float(M.iat[i, j])
-        except:
-            M.iat[i, j] = 1.0
-
-M = M.astype(float)
-
-# ====================== RECIPROCAL AUTO ======================
-for i in range(n):
-    for j in range(n):
-        if i == j:
-            M.iat[i, j] = 1.0
-        else:
-            a = M.iat[i, j]
-            b = M.iat[j, i]
-
-            if a <= 0 and b > 0:
-                M.iat[i, j] = 1 / b
-            elif b <= 0 and a > 0:
-                M.iat[j, i] = 1 / a
-            elif a <= 0 and b <= 0:
-                M.iat[i, j] = 1.0
-
-# simpan kembali tampilan string tanpa mengubah angka input
-M_display = M.applymap(lambda x: str(int(x)) if x.is_integer() else str(x))
-st.session_state.pairwise = M_display
+# konversi ke float untuk perhitungan + reciprocal otomatis
+with instrument.phase("parse_matriks"):
+    M = PairwiseMatrix.from_frame(pair_str, st.session_state.kriteria).with_reciprocals()
+st.session_state.pairwise = M
 
 # ====================== SIMPAN ======================
 if st.button("💾 Simpan Matriks ke Database"):
     try:
-        st_supabase.table("tb_kriteria").delete().neq("id", 0).execute()
-
-        for i, krit in enumerate(st.session_state.kriteria):
-            row_data = {
-                "kriteria": krit,
-                "k1": float(M.iat[i, 0]),
-                "k2": float(M.iat[i, 1]),
-                "k3": float(M.iat[i, 2]) if n > 2 else 0,
-                "k4": float(M.iat[i, 3]) if n > 3 else 0,
-                "k5": float(M.iat[i, 4]) if n > 4 else 0,
-            }
-            st_supabase.table("tb_kriteria").insert(row_data).execute()
-
+        db.save_matrix(st_supabase, st.session_state.kriteria, M.values, workspace=workspace)
         st.success("✅ Data berhasil disimpan!")
     except Exception as e:
         st.error(f"❌ Error: {e}")
 
 # ====================== HITUNG AHP ======================
+# metode terakhir yang dipilih dipakai juga oleh halaman Perhitungan
+metode = st.radio(
+    "Metode Bobot",
+    options=list(ahp.WEIGHT_METHODS),
+    index=ahp.WEIGHT_METHODS.index(st.session_state.get("metode_bobot", ahp.DEFAULT_METHOD)),
+    format_func=lambda m: "Eigenvector utama" if m == "eigenvector" else "Rata-rata kolom ternormalisasi",
+    horizontal=True,
+)
+st.session_state.metode_bobot = metode
+
 if st.button("Cek Konsistensi AHP"):
     st.session_state.run_ahp = True
 
@@ -140,17 +92,20 @@ st.subheader("Hasil Perhitungan AHP")
 
 if not st.session_state.get("run_ahp", False):
     st.info("Tekan tombol untuk menghitung.")
+elif n == 0:
+    st.warning("Tambahkan kriteria terlebih dahulu.")
 else:
-    col_sum = M.sum(axis=0)
-    norm = M / col_sum
-    priority = norm.mean(axis=1)
-
-    lambda_max = (M.dot(priority)).sum()
-    CI = (lambda_max - n) / (n - 1)
-
-    RI = {1:0.0, 2:0.0, 3:0.58, 4:0.90, 5:1.12}
-    CR = CI / RI.get(n, 1.12)
-
+    # hasil untuk matriks dan metode yang sama dipakai bersama oleh semua pengguna
+    try:
+        with instrument.phase("ahp"):
+            hasil_ahp = cache.results.get_or_compute(
+                cache.results.key("ahp", M.values, metode),
+                lambda: ahp.evaluate(M.values, method=metode),
+            )
+    except ValueError as e:
+        st.error(f"❌ Matriks tidak dapat dihitung: {e}")
+        st.stop()
+    priority = hasil_ahp.weights
 
     df_result = pd.DataFrame({
         "Kriteria": st.session_state.kriteria,
@@ -160,12 +115,31 @@ else:
     st.table(df_result)
 
     st.session_state.bobot_ahp = [round(w, 4) for w in priority]
+    st.session_state.sumber_bobot = "Matriks individu"
 
-    st.write(f"λ Max = {lambda_max:.4f}")
-    st.write(f"CI = {CI:.4f}")
-    st.write(f"CR = {CR:.4f}")
+    st.write(f"λ Max = {hasil_ahp.lambda_max:.4f}")
+    st.write(f"CI = {hasil_ahp.ci:.4f}")
+    st.write(f"CR = {hasil_ahp.cr:.4f}")
 
-    if CR <= 0.1:
+    if hasil_ahp.is_consistent:
         st.success("Konsisten ✔")
     else:
-        st.error("Tidak konsisten ❌")
\ No newline at end of file
+        st.error("Tidak konsisten ❌")
+
+    # ====================== SIMPAN SEBAGAI PENILAI ======================
+    if st.button("👤 Simpan sebagai Penilaian Saya"):
+        try:
+            db.save_user_matrix(
+                st_supabase,
+                auth.get_user_id(),
+                st.session_state.kriteria,
+                M.values,
+                cr=hasil_ahp.cr,
+                email=auth.get_user_email(),
+                workspace=workspace,
+            )
+            st.success("✅ Matriks Anda tersimpan untuk perhitungan konsensus kelompok.")
+        except Exception as e:
+            st.error(f"❌ Error: {e}")
+
+instrument.render_panel()
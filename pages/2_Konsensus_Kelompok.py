@@ -0,0 +1,89 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+parent_dir = str(Path(__file__).parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import auth
+import instrument
+import db
+import group
+
+auth.initialize_auth_state()
+
+auth.require_auth()
+
+instrument.start_run("2_Konsensus_Kelompok")
+
+st_supabase = auth.get_supabase_client()
+workspace = auth.get_workspace_id()
+
+st.title("2. Konsensus Kelompok (AHP)")
+
+# Sidebar
+with st.sidebar:
+    if st.button("Logout", use_container_width=True):
+        success, error_msg = auth.sign_out()
+        if success:
+            st.success("Berhasil logout!")
+            st.rerun()
+        else:
+            st.error(f"Logout gagal: {error_msg}")
+
+# ====================== LOAD DATA ======================
+with instrument.phase("load"):
+    records = db.fetch_rows(st_supabase, "tb_kriteria_pengguna", order=("updated_at",), workspace=workspace)
+
+if not records:
+    st.info("Belum ada penilai yang menyimpan matriks. Simpan matriks Anda pada halaman Data Kriteria.")
+    st.stop()
+
+kriteria = st.session_state.get("kriteria") or list(records[-1]["kriteria"])
+stack, used = group.stack_matrices(records, kriteria)
+
+if len(used) < len(records):
+    st.warning(f"{len(records) - len(used)} matriks dilewati karena kriterianya berbeda dengan: {', '.join(map(str, kriteria))}")
+
+if len(used) == 0:
+    st.error("Tidak ada matriks penilai dengan kriteria yang sama.")
+    st.stop()
+
+# ====================== AGREGASI ======================
+metode = st.radio(
+    "Metode Agregasi",
+    options=list(group.AGGREGATION_METHODS),
+    format_func=lambda m: "AIJ – rata-rata geometrik penilaian" if m == "aij" else "AIP – rata-rata prioritas individu",
+    horizontal=True,
+)
+
+with instrument.phase("agregasi"):
+    hasil = group.aggregate(stack, method=metode)
+
+st.subheader("Penilai")
+st.table(pd.DataFrame({
+    "Penilai": [row.get("email") or row["user_id"] for row in used],
+    "CR": np.round(hasil.evaluator_cr, 4),
+    "Bobot Penilai": np.round(hasil.evaluator_weights, 4),
+}, index=range(1, len(used) + 1)))
+
+st.subheader("Bobot Konsensus")
+df_result = pd.DataFrame({
+    "Kriteria": kriteria,
+    "Bobot": [round(w, 4) for w in hasil.weights],
+})
+df_result.index = df_result.index + 1
+st.table(df_result)
+
+st.write(f"CR = {hasil.cr:.4f}")
+
+if st.button("✅ Gunakan Bobot Konsensus untuk Perhitungan"):
+    st.session_state.kriteria = list(kriteria)
+    st.session_state.bobot_ahp = [round(w, 4) for w in hasil.weights]
+    st.session_state.sumber_bobot = f"Konsensus {metode.upper()} ({len(used)} penilai)"
+    st.success("Bobot konsensus akan dipakai pada halaman Perhitungan.")
+
+instrument.render_panel()
@@ -3,36 +3,27 @@ import pandas as pd
 import numpy as np
 import sys
 from pathlib import Path
-from st_supabase_connection import execute_query, SupabaseConnection
 
 parent_dir = str(Path(__file__).parent.parent)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 import auth
+import instrument
+import db
+import importer
+import paging
 
 auth.initialize_auth_state()
 
 auth.require_auth()
 
-st_supabase = st.connection(
-    name="supabase_connection",
-    type=SupabaseConnection,
-    ttl=None,
-)
+instrument.start_run("3_Data_Alternatif")
 
-st.title("4. Data Penilaian (SMART Input)")
-
-# ====================== LOAD DATA ======================
-data_supabase = execute_query(
-    st_supabase.table("tb_alternatif").select("*").order("id"),
-    ttl=0
-)
+st_supabase = auth.get_supabase_client()
+workspace = auth.get_workspace_id()
 
-if isinstance(data_supabase, dict) and "data" in data_supabase:
-    data_supabase = data_supabase["data"]
-elif hasattr(data_supabase, "data"):
-    data_supabase = data_supabase.data
+st.title("4. Data Penilaian (SMART Input)")
 
 # Sidebar
 with st.sidebar:
@@ -44,20 +35,29 @@ with st.sidebar:
         else:
             st.error(f"Logout gagal: {error_msg}")
 
-df = pd.DataFrame({
-    "Alternatif": [row["Alternatif"] for row in data_supabase],
-})
-
-st.session_state.alternatif = df
-result_table = st.session_state.alternatif.copy()
-
-
 # ============ HEADER + TOMBOL TAMBAH ==============
 col1, col2 = st.columns([3,1])
 
 with col1:
     st.subheader("Daftar Alternatif")
-    st.table(result_table)
+    filters = paging.search_filters("alternatif")
+
+    # ====================== LOAD DATA ======================
+    # hanya halaman yang tampil yang diambil dari database
+    with instrument.phase("load"):
+        page = db.fetch_page(
+            st_supabase, "tb_alternatif", "id,Alternatif", paging.cursor("alternatif"),
+            filters=filters, workspace=workspace,
+        )
+        total = db.count_rows(st_supabase, "tb_alternatif", filters, workspace=workspace)
+
+    result_table = pd.DataFrame({
+        "Alternatif": [row["Alternatif"] for row in page.rows],
+    })
+    result_table.index = result_table.index + (paging.page_number("alternatif") - 1) * db.DEFAULT_PAGE_SIZE + 1
+    with instrument.phase("tabel"):
+        st.table(result_table)
+    paging.keyset_nav("alternatif", page, total)
 
 with col2:
     show_add = st.toggle("➕ Tambah Data")  # ganti modal dengan toggle
@@ -74,17 +74,72 @@ if show_add:
             else:
                 # Insert ke Supabase
                 try:
-                    insert_result = execute_query(
-                        st_supabase.table("tb_alternatif").insert({"Alternatif": new_name}),
-                        ttl=0
-                    )
-                    if (
-                        (isinstance(insert_result, dict) and insert_result.get("status_code", 200) < 300)
-                        or (hasattr(insert_result, "status_code") and insert_result.status_code < 300)
-                    ):
-                        st.success("Alternatif berhasil ditambahkan ke database!")
-                        st.rerun()
-                    else:
-                        st.error(f"Gagal menambah ke database: {insert_result}")
+                    db.insert_rows(st_supabase, "tb_alternatif", [{"Alternatif": new_name}], workspace=workspace)
+                    st.success("Alternatif berhasil ditambahkan ke database!")
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Terjadi error saat insert: {e}")
+
+# ============ IMPOR CSV / EXCEL ===========
+with st.expander("📥 Impor dari CSV / Excel"):
+    st.caption(
+        "Kolom: Alternatif, lalu nilai kriteria (" + ", ".join(db.PENILAIAN_COLUMNS.values()) + "). "
+        "Alternatif yang sudah ada diperbarui."
+    )
+    st.download_button("Unduh template CSV", importer.template(), "template_alternatif.csv", "text/csv")
+    berkas = st.file_uploader("File alternatif dan penilaian", type=list(importer.FORMATS))
+
+    validasi = None
+    if berkas is not None:
+        # file yang sama tidak dibaca dan divalidasi ulang di setiap rerun
+        tersimpan = st.session_state.get("impor_validasi")
+        if tersimpan is not None and tersimpan[0] == berkas.file_id:
+            validasi = tersimpan[1]
+        else:
+            try:
+                with st.spinner("Memeriksa file..."), instrument.phase("impor_validasi"):
+                    validasi = importer.validate(importer.read_table(berkas, berkas.name))
+                st.session_state.impor_validasi = (berkas.file_id, validasi)
+            except (ImportError, ValueError) as e:
+                st.error(f"File tidak dapat dibaca: {e}")
+
+    if validasi is not None:
+        st.write(f"{len(validasi.rows)} dari {validasi.total} baris siap diimpor.")
+        if validasi.missing:
+            st.info("Kolom tidak ada di file, nilai tersimpan tidak diubah: " + ", ".join(validasi.missing))
+        st.caption("Sel penilaian yang kosong tidak mengubah nilai tersimpan.")
+        if not validasi.errors.empty:
+            st.warning(f"{len(validasi.errors)} masalah ditemukan; baris tersebut dilewati.")
+            st.dataframe(validasi.errors.head(1000), hide_index=True)
+            st.download_button(
+                "Unduh laporan baris bermasalah",
+                validasi.errors.to_csv(index=False).encode("utf-8"),
+                "laporan_impor.csv",
+                "text/csv",
+            )
+
+        # jumlah baris yang sudah tertulis disimpan per batch agar impor yang gagal bisa dilanjutkan
+        progres = st.session_state.get("impor_progres") or {}
+        mulai = progres.get("written", 0) if progres.get("digest") == validasi.digest else 0
+        if mulai >= len(validasi.rows):
+            mulai = 0
+        if mulai:
+            st.info(f"Impor sebelumnya berhenti setelah {mulai} baris.")
+
+        label = "Lanjutkan impor" if mulai else "Impor ke database"
+        if st.button(label, type="primary", disabled=validasi.rows.empty):
+            progress = st.progress(mulai / len(validasi.rows))
+
+            def catat(done, total):
+                st.session_state.impor_progres = {"digest": validasi.digest, "written": done}
+                progress.progress(done / total, text=f"{done} / {total} baris")
+
+            try:
+                with instrument.phase("impor"):
+                    ditulis = importer.write(st_supabase, validasi, start=mulai, on_chunk=catat, workspace=workspace)
+                st.success(f"✅ {ditulis} alternatif berhasil diimpor ke database!")
+            except Exception as e:
+                selesai = (st.session_state.get("impor_progres") or {}).get("written", mulai)
+                st.error(f"❌ Impor berhenti setelah {selesai} baris: {e}. Tekan 'Lanjutkan impor' untuk melanjutkan.")
+
+instrument.render_panel()
@@ -2,18 +2,34 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import sys
+from datetime import datetime
 from pathlib import Path
 
 parent_dir = str(Path(__file__).parent.parent)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+import ahp
 import auth
+import cache
+import db
+import instrument
+import paging
+import smart
+from incremental import IncrementalScorer
+from pairwise import PairwiseMatrix
+
+SUMBER_DATABASE = "Matriks tersimpan (database)"
 
 auth.initialize_auth_state()
 
 auth.require_auth()
 
+instrument.start_run("5_Data_Perhitungan")
+
+st_supabase = auth.get_supabase_client()
+workspace = auth.get_workspace_id()
+
 # Sidebar
 with st.sidebar:
     if st.button("Logout", use_container_width=True):
@@ -26,49 +42,134 @@ with st.sidebar:
 
 st.title("5. Perhitungan AHP + SMART")
 
-if "kriteria" not in st.session_state or not st.session_state.kriteria:
-    st.error("Hitung bobot AHP terlebih dahulu pada halaman Data Kriteria.")
-    st.stop()
-
-if "penilaian" not in st.session_state:
-    st.error("Isi Data Penilaian terlebih dahulu.")
-    st.stop()
-
-if "bobot_ahp" not in st.session_state:
-    st.error("Hitung bobot AHP terlebih dahulu pada halaman Data Kriteria.")
-    st.stop()
+# ====================== LOAD DATA ======================
+# Bobot dari halaman Data Kriteria / Konsensus dipakai jika ada; selain itu dihitung
+# dari matriks tersimpan. Kriteria dan alternatif hanya dimuat jika belum ada atau
+# sudah usang, dan keduanya diambil bersamaan karena tidak saling bergantung.
+versi_kriteria = db.table_version("tb_kriteria", workspace)
+versi = db.table_version("tb_alternatif", workspace)
+scorer = st.session_state.get("scorer")
+# metode bobot yang dipilih di halaman Data Kriteria, agar matriks yang sama
+# selalu menghasilkan bobot yang sama di kedua halaman
+metode = st.session_state.get("metode_bobot", ahp.DEFAULT_METHOD)
+
+bobot_usang = "bobot_ahp" not in st.session_state or (
+    st.session_state.get("sumber_bobot") == SUMBER_DATABASE
+    and (st.session_state.get("bobot_versi") != versi_kriteria or st.session_state.get("bobot_metode") != metode)
+)
+
+muat = {}
+if bobot_usang:
+    muat["kriteria"] = lambda: db.fetch_rows(st_supabase, "tb_kriteria", order=("urutan", "id"), workspace=workspace)
+if scorer is None or st.session_state.get("scorer_versi") != versi:
+    muat["alternatif"] = lambda: db.fetch_rows(st_supabase, "tb_alternatif", workspace=workspace)
+
+with instrument.phase("load"):
+    data = db.load_concurrently(muat)
+
+if bobot_usang:
+    rows_kriteria = data["kriteria"]
+    if not rows_kriteria:
+        st.error("Belum ada data kriteria. Isi matriks perbandingan pada halaman Data Kriteria.")
+        st.stop()
+
+    labels_kriteria = [row["kriteria"] for row in rows_kriteria]
+    M = PairwiseMatrix.from_records(rows_kriteria, labels_kriteria).with_reciprocals()
+    with instrument.phase("ahp"):
+        hasil_ahp = cache.results.get_or_compute(
+            cache.results.key("ahp", M.values, metode),
+            lambda: ahp.evaluate(M.values, method=metode),
+        )
+    if not st.session_state.get("kriteria"):
+        st.session_state.kriteria = labels_kriteria
+    st.session_state.bobot_ahp = [round(w, 4) for w in hasil_ahp.weights]
+    st.session_state.sumber_bobot = SUMBER_DATABASE
+    st.session_state.bobot_versi = versi_kriteria
+    st.session_state.bobot_metode = metode
+    if not hasil_ahp.is_consistent:
+        st.warning(f"Matriks perbandingan tersimpan tidak konsisten (CR = {hasil_ahp.cr:.4f}).")
 
 weights = st.session_state.bobot_ahp.copy()
-pen = st.session_state.penilaian.copy()
-
-norm = pen.copy()
-
-# COST → Harga & Pengiriman
-for col in ["Harga", "Pengiriman"]:
-    v = norm[col].astype(float)
-    norm[col] = (v.max() - v) / (v.max() - v.min())
-
-# BENEFIT → 3 Likert
-for col in ["Kualitas","Fleksibilitas","Pelayanan"]:
-    v = norm[col].astype(float)
-    norm[col] = (v - v.min()) / (v.max() - v.min())
-
-criteria = ["Harga","Kualitas","Pengiriman","Fleksibilitas","Pelayanan"]
-w = np.array(weights)
-
-scores = (norm[criteria].values * w).sum(axis=1)
-
-result = pd.DataFrame({
-    "Alternatif": pen["Alternatif"],
-    "Score": scores,
-})
-result["Rank"] = result["Score"].rank(ascending=False, method="min").astype(int)
-result = result.sort_values("Score", ascending=False)
-
-st.subheader("Normalisasi SMART")
-st.table(norm)
-
-st.subheader("Hasil Perhitungan")
-st.table(result)
+st.caption(f"Sumber bobot AHP: {st.session_state.get('sumber_bobot', 'Matriks individu')}")
+
+kolom_kriteria = list(db.PENILAIAN_COLUMNS.values())
+if len(kolom_kriteria) != len(weights):
+    st.error(
+        f"Jumlah bobot AHP ({len(weights)}) tidak sesuai dengan jumlah kolom penilaian "
+        f"({len(kolom_kriteria)}). Periksa kembali Data Kriteria."
+    )
+    st.stop()
 
-st.session_state.hasil = result
+# COST → Harga & Pengiriman, sisanya BENEFIT
+criteria = smart.criteria_from_names(kolom_kriteria)
+
+# ====================== SMART ======================
+# Skor disimpan per sesi dan diperbarui per baris oleh halaman Data Penilaian;
+# hitung ulang penuh hanya jika tabel ditulis dari tempat lain atau bobot berubah
+if scorer is None or st.session_state.get("scorer_versi") != versi or not np.array_equal(scorer.weights, weights):
+    # semua alternatif dibutuhkan untuk normalisasi; hasil query memakai cache tabel bersama
+    if "alternatif" not in data:
+        with instrument.phase("load"):
+            data["alternatif"] = db.fetch_rows(st_supabase, "tb_alternatif", workspace=workspace)
+    pen = db.penilaian_frame(data["alternatif"])
+
+    if pen.empty:
+        st.error("Isi Data Penilaian terlebih dahulu.")
+        st.stop()
+
+    X = pen[kolom_kriteria].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    nama = pen["Alternatif"].astype(str).tolist()
+    # hasil untuk data dan bobot yang sama dipakai bersama oleh semua pengguna;
+    # salinan per sesi karena skor diperbarui per baris oleh halaman Data Penilaian
+    with instrument.phase("smart"):
+        scorer = cache.results.get_or_compute(
+            cache.results.key("smart", nama, X, weights, criteria),
+            lambda: IncrementalScorer(nama, X, weights, criteria),
+        ).copy()
+    st.session_state.scorer = scorer
+    st.session_state.scorer_versi = versi
+
+# Halaman lain membaca skor dan utilitas langsung dari st.session_state.scorer
+# pada setiap rerun (view read-only, tanpa salinan per sesi), sehingga
+# pembaruan dari halaman Data Penilaian selalu terlihat
+labels = scorer.labels
+st.session_state.kolom_kriteria = kolom_kriteria
+
+# Ringkasan untuk dashboard; versi tabel menandai data yang berubah setelah dihitung
+if len(scorer):
+    idx_terbaik, _ = scorer.top(1)
+    ringkasan = {
+        "terbaik": str(labels[idx_terbaik[0]]),
+        "skor": float(scorer.scores[idx_terbaik[0]]),
+        "jumlah": len(scorer),
+        "versi": {t: db.table_version(t, workspace) for t in ("tb_kriteria", "tb_alternatif")},
+    }
+    lama = st.session_state.get("ringkasan_ranking") or {}
+    if any(lama.get(k) != v for k, v in ringkasan.items()):
+        ringkasan["waktu"] = datetime.now().strftime("%d-%m-%Y %H:%M")
+        st.session_state.ringkasan_ranking = ringkasan
+
+# ====================== RANKING ======================
+col1, col2 = st.columns([1, 1])
+with col1:
+    top_n = st.number_input("Tampilkan peringkat teratas", min_value=1, value=10, step=1)
+with col2:
+    semua = st.toggle("Hitung ranking lengkap")
+
+with instrument.phase("ranking"):
+    result = scorer.ranking_frame(None if semua else int(top_n))
+
+# hanya halaman yang tampil yang dirender
+tampil = result.iloc[paging.page_slice("perhitungan", len(result))]
+
+norm = pd.DataFrame(scorer.normalized[tampil.index], columns=kolom_kriteria, index=tampil.index)
+norm.insert(0, "Alternatif", labels[tampil.index])
+
+with instrument.phase("tabel"):
+    st.subheader("Normalisasi SMART")
+    st.table(norm)
+
+    st.subheader("Hasil Perhitungan")
+    st.table(tampil)
+
+instrument.render_panel()
@@ -9,11 +9,17 @@ if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
 import auth
+import export
+import instrument
+import paging
+import smart
 
 auth.initialize_auth_state()
 
 auth.require_auth()
 
+instrument.start_run("6_Data_Hasil_Akhir")
+
 st.title("6. Hasil Akhir & Download")
 
 # Sidebar
@@ -26,22 +32,73 @@ with st.sidebar:
         else:
             st.error(f"Logout gagal: {error_msg}")
 
-if "hasil" not in st.session_state:
+if st.session_state.get("scorer") is None:
     st.error("Belum ada hasil perhitungan.")
     st.stop()
 
-res = st.session_state.hasil.copy()
+scorer = st.session_state.scorer
+skor = scorer.score_frame()
+
+col1, col2 = st.columns([1, 1])
+with col1:
+    top_n = st.number_input("Tampilkan peringkat teratas", min_value=1, value=10, step=1)
+with col2:
+    semua = st.toggle("Tampilkan ranking lengkap")
+
+with instrument.phase("ranking"):
+    res = smart.ranking_frame(skor["Alternatif"], skor["Score"].to_numpy(), None if semua else int(top_n))
 res["Score"] = res["Score"].round(4)
 
 st.subheader("Ranking Akhir")
-st.table(res)
+# hanya halaman yang tampil yang dirender (tabel dan grafik)
+res = res.iloc[paging.page_slice("hasil", len(res))]
+with instrument.phase("tabel"):
+    st.table(res)
+
+with instrument.phase("altair"):
+    chart = alt.Chart(res).mark_bar().encode(
+        x="Score",
+        y=alt.Y("Alternatif", sort="-x")
+    ).properties(height=400)
+
+    st.altair_chart(chart, use_container_width=True)
+
+# ====================== UNDUH ======================
+st.subheader("Unduh Hasil")
+col1, col2 = st.columns([1, 1])
+with col1:
+    format_ekspor = st.selectbox("Format file", export.FORMATS, format_func=str.upper)
+with col2:
+    lampiran = st.checkbox("Sertakan normalisasi dan bobot AHP", value=True)
+
+# file ranking lengkap hanya dibuat saat diminta; isi yang sama dipakai ulang dari cache
+if st.button("Siapkan file ranking lengkap"):
+    lengkap = smart.ranking_frame(skor["Alternatif"], skor["Score"].to_numpy())
+    lengkap["Score"] = lengkap["Score"].round(4)
+    sheets = {"Ranking": lengkap}
+
+    kolom = st.session_state.get("kolom_kriteria")
+    if lampiran and kolom:
+        norm = pd.DataFrame(scorer.normalized, columns=kolom).round(4)
+        norm.insert(0, "Alternatif", skor["Alternatif"].to_numpy())
+        sheets["Normalisasi"] = norm
 
-chart = alt.Chart(res).mark_bar().encode(
-    x="Score",
-    y=alt.Y("Alternatif", sort="-x")
-).properties(height=400)
+        bobot = st.session_state.get("bobot_ahp")
+        if bobot is not None and len(bobot) == len(kolom):
+            sheets["Bobot AHP"] = pd.DataFrame({"Kriteria": kolom, "Bobot": bobot})
 
-st.altair_chart(chart, use_container_width=True)
+    try:
+        with st.spinner("Menyiapkan file..."), instrument.phase("ekspor"):
+            artefak = export.build(sheets, format_ekspor)
+    except ImportError as e:
+        st.error(str(e))
+    else:
+        # isi file baru dibaca saat tombol diklik (read_bytes menutup file sendiri).
+        # Streamlit tetap menyimpan seluruh isi unduhan di memori selama diunduh;
+        # yang dibatasi adalah memori saat file dibuat dan pembuatan ulang file yang sama
+        st.download_button(
+            f"Download {artefak.file_name}", artefak.path.read_bytes, artefak.file_name, artefak.mime,
+            on_click="ignore",
+        )
 
-csv = res.to_csv(index=False).encode("utf-8")
-st.download_button("Download CSV", csv, "hasil_ahp_smart.csv", "text/csv")
+instrument.render_panel()
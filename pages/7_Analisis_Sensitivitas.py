@@ -0,0 +1,84 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+parent_dir = str(Path(__file__).parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import auth
+import instrument
+import sensitivity
+
+auth.initialize_auth_state()
+
+auth.require_auth()
+
+instrument.start_run("7_Analisis_Sensitivitas")
+
+st.title("7. Analisis Sensitivitas Bobot")
+
+# Sidebar
+with st.sidebar:
+    if st.button("Logout", use_container_width=True):
+        success, error_msg = auth.sign_out()
+        if success:
+            st.success("Berhasil logout!")
+            st.rerun()
+        else:
+            st.error(f"Logout gagal: {error_msg}")
+
+if st.session_state.get("scorer") is None:
+    st.error("Belum ada hasil perhitungan.")
+    st.stop()
+
+# bobot dari scorer selalu sesuai dengan kolom utilitasnya, meskipun kriteria
+# diubah di halaman Data Kriteria setelah perhitungan
+U = st.session_state.scorer.normalized
+weights = np.array(st.session_state.scorer.weights)
+names = st.session_state.kolom_kriteria
+alternatif = st.session_state.scorer.labels
+
+top_r = st.number_input(
+    "Jumlah peringkat teratas yang dipantau",
+    min_value=1, max_value=max(1, min(10, len(alternatif))), value=1, step=1,
+)
+
+# ====================== AMBANG PERUBAHAN RANKING ======================
+st.subheader("Ambang Bobot Pembalikan Ranking")
+st.caption(
+    "Setiap bobot digeser dari nilai awalnya (bobot lain disesuaikan proporsional). "
+    "Ambang adalah nilai bobot terdekat di mana urutan peringkat teratas berubah."
+)
+
+langkah = st.select_slider("Resolusi grid", options=[0.05, 0.02, 0.01, 0.005, 0.001], value=0.01)
+grid = np.linspace(0.0, 1.0, int(round(1 / langkah)) + 1)
+
+with instrument.phase("ambang"):
+    ambang = sensitivity.reversal_thresholds(U, weights, names, grid, r=int(top_r))
+st.table(ambang.round(4))
+
+# ====================== SKENARIO ACAK ======================
+st.subheader("Skenario Bobot Acak")
+
+col1, col2 = st.columns(2)
+with col1:
+    jumlah = st.number_input("Jumlah skenario", min_value=100, max_value=200_000, value=10_000, step=1_000)
+with col2:
+    sebaran = st.slider("Perubahan bobot maksimum (±)", min_value=0.05, max_value=0.9, value=0.2, step=0.05)
+
+if st.button("Jalankan Skenario"):
+    with st.spinner("Menghitung skenario..."):
+        scenarios = sensitivity.random_scenarios(weights, int(jumlah), sebaran, seed=0)
+        hasil = sensitivity.analyze(U, weights, scenarios, r=int(top_r))
+
+    st.metric("Skenario dengan urutan teratas berubah", f"{hasil.reversal_rate:.1%}")
+
+    share = hasil.leader_share(len(alternatif))
+    pemimpin = pd.DataFrame({"Alternatif": alternatif, "Peluang Peringkat 1": share})
+    pemimpin = pemimpin[pemimpin["Peluang Peringkat 1"] > 0].sort_values("Peluang Peringkat 1", ascending=False)
+    st.table(pemimpin.head(10))
+
+instrument.render_panel()
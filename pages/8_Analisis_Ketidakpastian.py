@@ -0,0 +1,136 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import sys
+import time
+from pathlib import Path
+
+parent_dir = str(Path(__file__).parent.parent)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+import auth
+import instrument
+import ahp
+import montecarlo
+
+auth.initialize_auth_state()
+
+auth.require_auth()
+
+instrument.start_run("8_Analisis_Ketidakpastian")
+
+st.title("8. Analisis Ketidakpastian (Monte Carlo)")
+
+# Sidebar
+with st.sidebar:
+    if st.button("Logout", use_container_width=True):
+        success, error_msg = auth.sign_out()
+        if success:
+            st.success("Berhasil logout!")
+            st.rerun()
+        else:
+            st.error(f"Logout gagal: {error_msg}")
+
+if "pairwise" not in st.session_state or st.session_state.get("scorer") is None:
+    st.error("Belum ada hasil perhitungan.")
+    st.stop()
+
+M = st.session_state.pairwise.values
+U = st.session_state.scorer.normalized
+alternatif = st.session_state.scorer.labels
+
+if M.shape[0] != U.shape[1]:
+    st.error(
+        f"Jumlah kriteria pada matriks perbandingan ({M.shape[0]}) tidak sesuai dengan "
+        f"jumlah kolom penilaian ({U.shape[1]})."
+    )
+    st.stop()
+
+st.caption(
+    "Setiap penilaian perbandingan berpasangan digeser acak beberapa langkah pada skala Saaty 1–9, "
+    "lalu bobot, CR, dan ranking SMART dihitung ulang untuk setiap sampel."
+)
+
+# ====================== PARAMETER ======================
+col1, col2 = st.columns(2)
+with col1:
+    jumlah = st.number_input("Jumlah sampel", min_value=1_000, max_value=1_000_000, value=100_000, step=10_000)
+    langkah = st.radio("Pergeseran penilaian", options=[1, 2], format_func=lambda s: f"±{s} langkah", horizontal=True)
+with col2:
+    metode = st.radio(
+        "Metode Bobot",
+        options=list(ahp.WEIGHT_METHODS),
+        index=ahp.WEIGHT_METHODS.index(st.session_state.get("metode_bobot", ahp.DEFAULT_METHOD)),
+        format_func=lambda m: "Eigenvector utama" if m == "eigenvector" else "Rata-rata kolom ternormalisasi",
+    )
+    hanya_konsisten = st.checkbox("Abaikan sampel tidak konsisten (CR > 0.1)")
+
+job = st.session_state.get("mc_job")
+
+if st.button("Jalankan Simulasi", disabled=job is not None and not job.done()):
+    # simulasi berjalan melewati rerun: salin utilitas agar pembaruan skor
+    # per baris dari halaman Data Penilaian tidak mengubah data di tengah jalan
+    st.session_state.mc_job = montecarlo.start(
+        M, U.copy(), int(jumlah),
+        steps=langkah,
+        method=metode,
+        only_consistent=hanya_konsisten,
+        seed=0,
+    )
+    st.session_state.mc_alternatif = alternatif
+    st.rerun()
+
+if job is None:
+    st.info("Tekan tombol untuk menjalankan simulasi.")
+    st.stop()
+
+# ====================== PROGRESS (tidak memblokir) ======================
+if not job.done():
+    st.progress(job.progress, text=f"Simulasi berjalan... {job.progress:.0%}")
+    if st.button("Batalkan"):
+        job.cancel()
+        del st.session_state.mc_job
+        st.rerun()
+    time.sleep(0.5)
+    st.rerun()
+
+try:
+    hasil = job.result()
+except Exception as e:
+    st.error(f"❌ Simulasi gagal: {e}")
+    st.stop()
+
+# ====================== HASIL ======================
+col1, col2, col3 = st.columns(3)
+col1.metric("Sampel dihitung", f"{hasil.samples:,}")
+col2.metric("Sampel konsisten", f"{hasil.consistent_rate:.1%}")
+col3.metric("Rata-rata CR", f"{hasil.cr_mean:.4f}")
+
+st.subheader("Sebaran Bobot Kriteria")
+st.table(pd.DataFrame({
+    "Kriteria": st.session_state.pairwise.labels,
+    "Bobot Rata-rata": hasil.weight_mean.round(4),
+    "Simpangan Baku": hasil.weight_std.round(4),
+}))
+
+st.subheader("Peluang Peringkat per Alternatif")
+if hasil.samples == 0:
+    st.warning("Tidak ada sampel yang memenuhi syarat.")
+    st.stop()
+
+prob = hasil.rank_probabilities
+# label yang berlaku saat simulasi dimulai (array label tidak diubah di tempat)
+alternatif = st.session_state.get("mc_alternatif", alternatif)
+R = prob.shape[1]
+kolom = [f"P(Rank {r + 1})" for r in range(R)]
+if R < len(alternatif):
+    kolom[-1] = f"P(Rank ≥ {R})"
+
+tabel = pd.DataFrame(prob, columns=kolom)
+tabel.insert(0, "Alternatif", alternatif)
+# urutkan berdasarkan peluang kumulatif masuk peringkat teratas
+tabel = tabel.iloc[np.lexsort(np.cumsum(prob, axis=1).T[::-1] * -1)]
+st.dataframe(tabel.head(20).style.format({k: "{:.1%}" for k in kolom}), use_container_width=True)
+
+instrument.render_panel()
@@ -0,0 +1,110 @@
+"""
+Pagination module for AHP-SMART application
+Page navigation for keyset-paginated tables and in-memory results
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+import streamlit as st
+
+import db
+
+
+def cursor(key: str) -> Optional[int]:
+    """
+    Keyset cursor (last id of the previous page) for the current page
+
+    Args:
+        key: Session key of the paginated table
+
+    Returns:
+        Optional[int]: None on the first page
+    """
+    return _stack(key)[-1]
+
+
+def page_number(key: str) -> int:
+    """Current page number, starting at 1"""
+    return len(_stack(key))
+
+
+def reset(key: str) -> None:
+    """Go back to the first page (e.g. after the search text changed)"""
+    st.session_state[f"paging_{key}"] = [None]
+
+
+def _stack(key: str) -> List[Optional[int]]:
+    # Kursor setiap halaman yang sudah dibuka; mundur cukup membuang kursor terakhir
+    state_key = f"paging_{key}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = [None]
+    return st.session_state[state_key]
+
+
+def search_filters(key: str, column: str = "Alternatif", label: str = "Cari") -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Search box whose text is pushed down to the database as ILIKE
+
+    Changing the text returns to the first page.
+
+    Args:
+        key: Session key of the paginated table
+        column: Column searched
+        label: Label of the text input
+
+    Returns:
+        tuple: Filters for db.fetch_page / db.count_rows
+    """
+    text = st.text_input(label, key=f"search_{key}", placeholder="Ketik nama...").strip()
+    if st.session_state.get(f"search_last_{key}") != text:
+        st.session_state[f"search_last_{key}"] = text
+        reset(key)
+    return (("ilike", column, db.like_pattern(text)),) if text else ()
+
+
+def keyset_nav(key: str, page: db.Page, total: Optional[int] = None, page_size: int = db.DEFAULT_PAGE_SIZE) -> None:
+    """
+    Previous/next buttons for a keyset-paginated table
+
+    Args:
+        key: Session key of the paginated table
+        page: Page currently shown
+        total: Total matching rows, if known
+        page_size: Rows per page
+    """
+    stack = _stack(key)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ Sebelumnya", key=f"prev_{key}", disabled=len(stack) == 1, use_container_width=True):
+            stack.pop()
+            st.rerun()
+    with col2:
+        info = f"Halaman {len(stack)}"
+        if total is not None:
+            info += f" dari {max(1, math.ceil(total / page_size))} · {total} baris"
+        st.caption(info)
+    with col3:
+        if st.button("Berikutnya ▶", key=f"next_{key}", disabled=not page.has_next, use_container_width=True):
+            stack.append(page.last_id)
+            st.rerun()
+
+
+def page_slice(key: str, rows: int, page_size: int = db.DEFAULT_PAGE_SIZE) -> slice:
+    """
+    Page selector for a table that is already in memory
+
+    Args:
+        key: Widget key
+        rows: Number of rows in the table
+        page_size: Rows per page
+
+    Returns:
+        slice: Row positions of the visible page
+    """
+    pages = max(1, math.ceil(rows / page_size))
+    if pages == 1:
+        return slice(0, rows)
+    halaman = st.number_input(f"Halaman (1-{pages})", min_value=1, max_value=pages, value=1, step=1, key=f"page_{key}")
+    start = (int(halaman) - 1) * page_size
+    return slice(start, min(start + page_size, rows))
@@ -0,0 +1,180 @@
+"""
+Pairwise comparison matrix for AHP-SMART application
+Float-backed storage with bulk parsing and reciprocal filling
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def parse_values(values: Any) -> np.ndarray:
+    """
+    Parse a 2-D block of cells (strings, numbers, None) into floats in bulk
+
+    Cells that cannot be parsed become 1.0, matching the old per-cell
+    fallback.
+
+    Args:
+        values: 2-D array-like of raw cell values
+
+    Returns:
+        np.ndarray: float64 array with the same shape
+    """
+    raw = np.asarray(values, dtype=object)
+    if raw.size == 0:
+        return np.zeros(raw.shape, dtype=np.float64)
+
+    flat = pd.Series(raw.ravel()).astype(str).str.strip().to_numpy(dtype=object)
+    # konversi object -> float memakai float() per sel, sama persis dengan loop lama;
+    # pd.to_numeric bisa meleset 1 ulp pada teks 17 digit dari tampilan matriks
+    try:
+        parsed = flat.astype(np.float64)
+    except ValueError:
+        parsed = np.frompyfunc(_parse_cell, 1, 1)(flat).astype(np.float64)
+    parsed[np.isnan(parsed)] = 1.0
+    return parsed.reshape(raw.shape)
+
+
+def _parse_cell(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return 1.0
+
+
+def fill_reciprocals(values: np.ndarray) -> np.ndarray:
+    """
+    Fill missing (<= 0) cells from their mirrored entry
+
+    For each pair (i, j): if only one side is filled the other becomes its
+    reciprocal, if neither is filled both become 1. The diagonal is always 1.
+
+    Args:
+        values: Square float array
+
+    Returns:
+        np.ndarray: New array with reciprocals filled in
+    """
+    M = np.asarray(values, dtype=np.float64)
+    missing = M <= 0
+    mirrored = M.T
+
+    filled = M.copy()
+    from_mirror = missing & ~missing.T
+    filled[from_mirror] = 1.0 / mirrored[from_mirror]
+    filled[missing & missing.T] = 1.0
+    np.fill_diagonal(filled, 1.0)
+    return filled
+
+
+def format_values(values: np.ndarray) -> np.ndarray:
+    """
+    Format floats for display: integers without decimals, others as-is
+
+    Args:
+        values: Float array
+
+    Returns:
+        np.ndarray: Array of strings with the same shape
+    """
+    v = np.asarray(values, dtype=np.float64)
+    is_int = np.isfinite(v) & (v == np.round(v))
+    as_int = np.where(is_int, v, 0).astype(np.int64).astype(str)
+    return np.where(is_int, as_int, v.astype(str))
+
+
+@dataclass
+class PairwiseMatrix:
+    """
+    Square pairwise comparison matrix with criterion labels
+
+    Values are kept as a float64 array; strings exist only in the display
+    frame handed to the data editor.
+    """
+    labels: List[str]
+    values: np.ndarray
+
+    def __post_init__(self):
+        self.labels = list(self.labels)
+        self.values = np.ascontiguousarray(self.values, dtype=np.float64)
+        n = len(self.labels)
+        if self.values.shape != (n, n):
+            raise ValueError(f"Ukuran matriks {self.values.shape} tidak sesuai dengan {n} kriteria")
+
+    @property
+    def n(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def identity(cls, labels: Sequence[str]) -> "PairwiseMatrix":
+        """Matrix with 1 on the diagonal and empty (0) cells elsewhere"""
+        n = len(labels)
+        return cls(labels, np.eye(n))
+
+    @classmethod
+    def from_records(cls, records: Optional[List[Dict[str, Any]]], labels: Sequence[str]) -> "PairwiseMatrix":
+        """
+        Build a matrix from tb_kriteria rows
+
+        Rows carry their matrix row in the `nilai` array column; rows saved
+        before that column existed fall back to the legacy k1..k5 columns.
+
+        Args:
+            records: Rows as returned by Supabase, one per criterion
+            labels: Criterion labels
+
+        Returns:
+            PairwiseMatrix: Matrix with stored values, identity elsewhere
+        """
+        matrix = cls.identity(labels)
+        n = matrix.n
+        if not records or n == 0:
+            return matrix
+
+        rows = []
+        for row in records[:n]:
+            nilai = row.get("nilai")
+            if nilai is None:
+                nilai = [row.get(f"k{j+1}") for j in range(n)]
+            rows.append((list(nilai) + [None] * n)[:n])
+        stored = (
+            pd.DataFrame(rows, columns=range(n), dtype=object)
+            .apply(pd.to_numeric, errors="coerce")
+            .to_numpy(dtype=np.float64)
+        )
+
+        block = matrix.values[:len(stored)]
+        mask = ~np.isnan(stored)
+        block[mask] = stored[mask]
+        return matrix
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, labels: Optional[Sequence[str]] = None) -> "PairwiseMatrix":
+        """
+        Parse an edited display frame back into floats
+
+        Args:
+            frame: DataFrame of raw cell values (usually strings)
+            labels: Criterion labels; defaults to the frame's columns
+
+        Returns:
+            PairwiseMatrix: Parsed matrix (reciprocals not yet filled)
+        """
+        labels = list(frame.columns) if labels is None else list(labels)
+        n = len(labels)
+        return cls(labels, parse_values(frame.iloc[:n, :n].to_numpy()))
+
+    def with_reciprocals(self) -> "PairwiseMatrix":
+        """Return a copy with reciprocal cells filled in"""
+        return PairwiseMatrix(self.labels, fill_reciprocals(self.values))
+
+    def to_frame(self) -> pd.DataFrame:
+        """Float DataFrame indexed by the criterion labels"""
+        return pd.DataFrame(self.values, index=self.labels, columns=self.labels)
+
+    def to_display_frame(self) -> pd.DataFrame:
+        """String DataFrame for st.data_editor"""
+        return pd.DataFrame(format_values(self.values), index=self.labels, columns=self.labels)
@@ -0,0 +1,120 @@
+"""
+Connection pool module for AHP-SMART application
+One process-wide Supabase client over a shared keep-alive HTTP pool
+
+Every Streamlit session uses the same client. The user's identity travels
+with each request: `set_access_token()` stores the access token in a
+context variable and an httpx request hook puts it in the Authorization
+header of database requests. Auth endpoints keep the headers set by the
+auth client itself.
+"""
+
+import os
+import threading
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+import httpx
+import streamlit as st
+from supabase import Client, ClientOptions, create_client
+
+
+# Batas koneksi HTTP untuk seluruh proses; permintaan di atas batas ini menunggu
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0
+POOL_TIMEOUT = 10.0
+REQUEST_TIMEOUT = 30.0
+
+_access_token: ContextVar[Optional[str]] = ContextVar("supabase_access_token", default=None)
+
+_lock = threading.Lock()
+_client: Optional[Client] = None
+
+
+def load_secrets() -> Tuple[str, str]:
+    """Supabase URL and anon key from the environment or Streamlit secrets"""
+    url, key = os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_KEY")
+    if url and key:
+        return url, key
+    conf = st.secrets["connections"]["supabase_connection"]
+    return conf["SUPABASE_URL"], conf["SUPABASE_KEY"]
+
+
+def set_access_token(token: Optional[str]) -> None:
+    """
+    Set the access token sent with database requests of the current context
+
+    Streamlit runs each script rerun in its own thread, so the token of one
+    session never leaks into another. Worker threads started by a page
+    must be given a copy of the context (contextvars.copy_context()).
+
+    Args:
+        token: User access token, or None to use the anon key
+    """
+    _access_token.set(token)
+
+
+def current_access_token() -> Optional[str]:
+    """Access token of the current context, if any"""
+    return _access_token.get()
+
+
+def _authorize(anon_key: str):
+    """httpx request hook that sets Authorization from the context token"""
+
+    def hook(request: httpx.Request) -> None:
+        if "/auth/v1/" in request.url.path:
+            return
+        token = _access_token.get() or anon_key
+        request.headers["Authorization"] = f"Bearer {token}"
+
+    return hook
+
+
+def create_http_client(anon_key: str) -> httpx.Client:
+    """
+    Shared HTTP client with keep-alive and bounded connections
+
+    Args:
+        anon_key: Key used when no user token is set
+
+    Returns:
+        httpx.Client: Client reused by the database and auth clients
+    """
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, pool=POOL_TIMEOUT),
+        event_hooks={"request": [_authorize(anon_key)]},
+    )
+
+
+def get_client() -> Client:
+    """
+    Process-wide Supabase client, created on first use
+
+    The auth client neither persists nor auto-refreshes sessions; user
+    sessions live in each Streamlit session (see auth.py).
+
+    Returns:
+        Client: Shared Supabase client
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                url, key = load_secrets()
+                _client = create_client(
+                    url,
+                    key,
+                    ClientOptions(
+                        auto_refresh_token=False,
+                        persist_session=False,
+                        httpx_client=create_http_client(key),
+                    ),
+                )
+    return _client
@@ -0,0 +1,241 @@
+"""
+Sensitivity analysis module for AHP-SMART application
+Batch rescoring under perturbed AHP weights and rank-reversal detection
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import smart
+
+
+# Batas elemen matriks skor (skenario x alternatif) per batch; cukup kecil
+# agar skor tetap di cache selama dijumlah per kolom dan diseleksi
+MAX_BATCH_ELEMENTS = 1 << 18
+
+# Selisih skor sampai batas ini dianggap seri, bukan pembalikan ranking
+SCORE_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    """
+    Outcome of rescoring alternatives under many weight scenarios
+
+    `top` holds the row indices of the best `r` alternatives per scenario,
+    `changed` flags scenarios in which some alternative beats the baseline
+    top-r at its position by more than SCORE_TOLERANCE.
+    """
+    scenarios: np.ndarray
+    top: np.ndarray
+    baseline_top: np.ndarray
+    changed: np.ndarray
+
+    @property
+    def reversal_rate(self) -> float:
+        """Share of scenarios with a rank reversal in the top r"""
+        return float(self.changed.mean()) if len(self.changed) else 0.0
+
+    def leader_share(self, n_alternatives: int) -> np.ndarray:
+        """Share of scenarios in which each alternative ranks first"""
+        counts = np.bincount(self.top[:, 0], minlength=n_alternatives)
+        return counts / max(len(self.top), 1)
+
+
+def renormalize(scenarios: np.ndarray) -> np.ndarray:
+    """Scale each row of a (s, m) weight matrix to sum to 1"""
+    W = np.clip(np.asarray(scenarios, dtype=np.float64), 0.0, None)
+    total = W.sum(axis=1, keepdims=True)
+    total[total == 0] = 1.0
+    return W / total
+
+
+def one_at_a_time(weights: Sequence[float], grid: Sequence[float]) -> np.ndarray:
+    """
+    Scenarios that set one weight to each grid value
+
+    The remaining weights are rescaled proportionally so every scenario
+    still sums to 1. Scenarios are ordered criterion by criterion, grid
+    value by grid value.
+
+    Args:
+        weights: Baseline weights of shape (m,)
+        grid: Values in [0, 1] to assign to the varied weight
+
+    Returns:
+        np.ndarray: Scenario weights of shape (m * len(grid), m)
+    """
+    w = np.asarray(weights, dtype=np.float64)
+    w = w / w.sum()
+    t = np.asarray(grid, dtype=np.float64)
+    m = len(w)
+
+    rest = 1.0 - w
+    # bobot lain: w_j * (1 - t) / (1 - w_i); jika w_i = 1, dibagi rata
+    share = np.divide(w[None, :], rest[:, None], out=np.full((m, m), 1.0 / max(m - 1, 1)), where=rest[:, None] > 0)
+    np.fill_diagonal(share, 0.0)
+
+    W = (1.0 - t)[None, :, None] * share[:, None, :]
+    W[np.arange(m), :, np.arange(m)] = t[None, :]
+    return W.reshape(m * len(t), m)
+
+
+def random_scenarios(
+    weights: Sequence[float],
+    count: int,
+    spread: float = 0.2,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Scenarios with every weight scaled by a random factor in [1 - spread, 1 + spread]
+
+    Args:
+        weights: Baseline weights of shape (m,)
+        count: Number of scenarios
+        spread: Maximum relative change per weight
+        seed: Random seed
+
+    Returns:
+        np.ndarray: Renormalized scenario weights of shape (count, m)
+    """
+    w = np.asarray(weights, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    factors = rng.uniform(1.0 - spread, 1.0 + spread, size=(count, len(w)))
+    return renormalize(factors * w)
+
+
+def top_alternatives(scores: np.ndarray, r: int) -> np.ndarray:
+    """
+    Row-wise indices of the r best alternatives, best first
+
+    Selection and order per row equal smart.top_k: ties at the cut-off
+    keep the lowest indices, ties inside the selection are ordered by
+    index and NaN scores come last.
+
+    Args:
+        scores: Array of shape (s, n)
+        r: Number of alternatives per row
+
+    Returns:
+        np.ndarray: Indices of shape (s, r)
+    """
+    s = np.asarray(scores, dtype=np.float64)
+    s = np.where(np.isnan(s), -np.inf, s)
+    n = s.shape[1]
+    r = min(r, n)
+
+    if r < n:
+        part = np.argpartition(-s, r - 1, axis=1)[:, :r]
+        kth = np.take_along_axis(s, part, axis=1).min(axis=1, keepdims=True)
+        ties = s == kth
+        need = r - (s > kth).sum(axis=1, keepdims=True)
+        # baris dengan nilai seri melewati batas: ambil indeks terkecil secukupnya
+        split = np.flatnonzero(ties.sum(axis=1) > need[:, 0])
+        if len(split):
+            t = ties[split]
+            pick = (s[split] > kth[split]) | (t & (np.cumsum(t, axis=1) <= need[split]))
+            part[split] = np.nonzero(pick)[1].reshape(len(split), r)
+    else:
+        part = np.tile(np.arange(n), (len(s), 1))
+    vals = np.take_along_axis(s, part, axis=1)
+    order = np.lexsort((part, -vals), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def analyze(
+    utilities: np.ndarray,
+    weights: Sequence[float],
+    scenarios: np.ndarray,
+    r: int = 1,
+) -> SensitivityResult:
+    """
+    Rescore all alternatives for every scenario and detect rank reversals
+
+    The baseline weights are scored as row 0 of the scenario matrix, with
+    smart.weighted_sum in batches that bound the size of the score matrix,
+    so identical weights always give identical scores and top-r. A
+    scenario counts as a reversal when, at some position of the top r,
+    its own pick scores more than SCORE_TOLERANCE above the baseline
+    pick; swaps between alternatives that are tied within the tolerance
+    are not reversals.
+
+    Args:
+        utilities: SMART utilities of shape (n, m)
+        weights: Baseline weights of shape (m,)
+        scenarios: Scenario weights of shape (s, m)
+        r: Size of the top group whose order is checked
+
+    Returns:
+        SensitivityResult: Top-r per scenario and reversal flags
+    """
+    U = np.asarray(utilities, dtype=np.float64)
+    W = np.asarray(scenarios, dtype=np.float64)
+    n = U.shape[0]
+    r = max(1, min(r, n))
+
+    # baris 0 = bobot awal, dihitung lewat jalur yang sama dengan skenario
+    rows = np.vstack([np.asarray(weights, dtype=np.float64)[None, :], W])
+    batch = max(1, MAX_BATCH_ELEMENTS // max(n, 1))
+    top = np.empty((len(rows), r), dtype=np.int64)
+    changed = np.zeros(len(rows), dtype=bool)
+    baseline_top = None
+    for start in range(0, len(rows), batch):
+        scores = smart.weighted_sum(U, rows[start:start + batch])
+        scores[np.isnan(scores)] = -np.inf
+        block = top_alternatives(scores, r)
+        if baseline_top is None:
+            baseline_top = block[0].copy()
+        picked = np.take_along_axis(scores, block, axis=1)
+        with np.errstate(invalid="ignore"):
+            changed[start:start + batch] = (picked - scores[:, baseline_top] > SCORE_TOLERANCE).any(axis=1)
+        top[start:start + batch] = block
+
+    return SensitivityResult(scenarios=W, top=top[1:], baseline_top=baseline_top, changed=changed[1:])
+
+
+def reversal_thresholds(
+    utilities: np.ndarray,
+    weights: Sequence[float],
+    names: Sequence[str],
+    grid: Optional[Sequence[float]] = None,
+    r: int = 1,
+) -> pd.DataFrame:
+    """
+    Weight values at which the top-r order first changes, per criterion
+
+    Each weight is moved down and up from its baseline along the grid
+    (others rescaled proportionally); the nearest grid value that changes
+    the top-r order on each side is reported, NaN if none does.
+
+    Args:
+        utilities: SMART utilities of shape (n, m)
+        weights: Baseline weights of shape (m,)
+        names: Criterion names
+        grid: Values in [0, 1]; defaults to steps of 0.01
+        r: Size of the top group whose order is checked
+
+    Returns:
+        pd.DataFrame: Kriteria, Bobot, Ambang Turun, Ambang Naik
+    """
+    w = np.asarray(weights, dtype=np.float64)
+    w = w / w.sum()
+    t = np.linspace(0.0, 1.0, 101) if grid is None else np.sort(np.asarray(grid, dtype=np.float64))
+
+    result = analyze(utilities, w, one_at_a_time(w, t), r)
+    changed = result.changed.reshape(len(w), len(t))
+
+    below = changed & (t[None, :] < w[:, None])
+    above = changed & (t[None, :] > w[:, None])
+    # ambang turun: nilai grid terbesar di bawah bobot awal yang mengubah urutan
+    down = np.where(below.any(axis=1), t[len(t) - 1 - np.argmax(below[:, ::-1], axis=1)], np.nan)
+    up = np.where(above.any(axis=1), t[np.argmax(above, axis=1)], np.nan)
+
+    return pd.DataFrame({
+        "Kriteria": list(names),
+        "Bobot": w,
+        "Ambang Turun": down,
+        "Ambang Naik": up,
+    })
@@ -0,0 +1,282 @@
+"""
+SMART module for AHP-SMART application
+Utility normalization, weighted scoring and ranking of alternatives
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Kriteria yang semakin kecil semakin baik
+COST_CRITERIA = frozenset({"Harga", "Pengiriman"})
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """
+    SMART criterion specification
+
+    `lower`/`upper` fix the utility bounds; when omitted the observed
+    minimum/maximum of the column is used.
+    """
+    name: str
+    cost: bool = False
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+
+
+DEFAULT_CRITERIA = (
+    Criterion("Harga", cost=True),
+    Criterion("Kualitas"),
+    Criterion("Pengiriman", cost=True),
+    Criterion("Fleksibilitas"),
+    Criterion("Pelayanan"),
+)
+
+
+@dataclass(frozen=True)
+class SMARTResult:
+    """
+    Normalized utilities (n, m) and scores (n,)
+
+    The full ranking is only computed when `ranks` is first accessed; use
+    `top()` when only the best alternatives are needed.
+    """
+    normalized: np.ndarray
+    scores: np.ndarray
+
+    @cached_property
+    def ranks(self) -> np.ndarray:
+        """Rank of every alternative (1 = best)"""
+        return rank_descending(self.scores)
+
+    def top(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices and ranks of the best k alternatives"""
+        return top_k(self.scores, k)
+
+
+def criteria_from_names(names: Iterable[str], cost_names: Iterable[str] = COST_CRITERIA) -> Tuple[Criterion, ...]:
+    """
+    Build a criteria spec from column names
+
+    Args:
+        names: Criterion names, in matrix column order
+        cost_names: Names treated as cost criteria
+
+    Returns:
+        tuple: Criterion per name
+    """
+    cost_names = set(cost_names)
+    return tuple(Criterion(name, cost=name in cost_names) for name in names)
+
+
+def column_bounds(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-column minimum and maximum, ignoring NaN
+
+    Args:
+        matrix: Float array of shape (n, m)
+
+    Returns:
+        tuple: (lower, upper) arrays of shape (m,)
+    """
+    X = np.asarray(matrix, dtype=np.float64)
+    if X.shape[0] == 0:
+        m = X.shape[1]
+        return np.full(m, np.nan), np.full(m, np.nan)
+    return np.nanmin(X, axis=0), np.nanmax(X, axis=0)
+
+
+def normalize(
+    matrix: np.ndarray,
+    criteria: Sequence[Criterion],
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> np.ndarray:
+    """
+    Convert raw values to utilities in [0, 1] in one broadcasted pass
+
+    Benefit: (x - min) / (max - min). Cost: (max - x) / (max - min).
+    Columns with zero range get utility 1 for every alternative, so they
+    do not affect the ranking.
+
+    Args:
+        matrix: Float array of shape (n, m)
+        criteria: One Criterion per column
+        bounds: Optional precomputed (lower, upper) per column
+
+    Returns:
+        np.ndarray: Utilities of shape (n, m)
+    """
+    X = np.asarray(matrix, dtype=np.float64)
+    if X.ndim != 2 or X.shape[1] != len(criteria):
+        raise ValueError(f"Matriks {X.shape} tidak sesuai dengan {len(criteria)} kriteria")
+
+    lo, hi = column_bounds(X) if bounds is None else (np.asarray(bounds[0], dtype=np.float64),
+                                                       np.asarray(bounds[1], dtype=np.float64))
+    lo, hi = lo.copy(), hi.copy()
+    fixed = np.zeros(len(criteria), dtype=bool)
+    for j, c in enumerate(criteria):
+        if c.lower is not None:
+            lo[j] = c.lower
+            fixed[j] = True
+        if c.upper is not None:
+            hi[j] = c.upper
+            fixed[j] = True
+
+    cost = np.array([c.cost for c in criteria], dtype=bool)
+    span = hi - lo
+    flat = ~(span > 0)
+    span[flat] = 1.0
+
+    # benefit: (x - lo) / span, cost: (x - hi) / -span
+    base = np.where(cost, hi, lo)
+    scale = np.where(cost, -1.0, 1.0) / span
+
+    U = np.subtract(X, base)
+    U *= scale
+    if fixed.any():
+        U[:, fixed] = np.clip(U[:, fixed], 0.0, 1.0)
+    if flat.any():
+        U[:, flat] = 1.0
+    return U
+
+
+def rank_descending(scores: np.ndarray) -> np.ndarray:
+    """
+    Rank scores from high to low, ties sharing the lowest rank
+
+    Equivalent to pandas `rank(ascending=False, method="min")`.
+
+    Args:
+        scores: Array of shape (n,)
+
+    Returns:
+        np.ndarray: int64 ranks starting at 1
+    """
+    s = np.asarray(scores, dtype=np.float64)
+    order = np.argsort(-s)
+    ordered = s[order]
+    new_group = np.empty(len(s), dtype=bool)
+    new_group[:1] = True
+    new_group[1:] = ordered[1:] != ordered[:-1]
+    start = np.maximum.accumulate(np.where(new_group, np.arange(len(s)), 0))
+    ranks = np.empty(len(s), dtype=np.int64)
+    ranks[order] = start + 1
+    return ranks
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Best k alternatives without sorting or ranking all of them
+
+    Uses a partition to find the k-th best score, then sorts only the
+    selected rows. Ties at the cut-off keep the earliest rows, ties inside
+    the selection are ordered by row, and ranks follow `method="min"` so
+    they equal the corresponding entries of `rank_descending`. NaN scores
+    are ranked last.
+
+    Args:
+        scores: Array of shape (n,)
+        k: Number of alternatives to return
+
+    Returns:
+        tuple: (row indices, ranks), both of length min(k, n), best first
+    """
+    s = np.asarray(scores, dtype=np.float64)
+    s = np.where(np.isnan(s), -np.inf, s)
+    n = len(s)
+    k = max(0, min(int(k), n))
+
+    if k == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if k == n:
+        idx = np.arange(n)
+    else:
+        kth = np.partition(s, n - k)[n - k]
+        greater = np.flatnonzero(s > kth)
+        ties = np.flatnonzero(s == kth)[:k - len(greater)]
+        idx = np.concatenate([greater, ties])
+
+    idx = idx[np.lexsort((idx, -s[idx]))]
+    top = s[idx]
+    ranks = np.searchsorted(-top, -top, side="left") + 1
+    return idx, ranks.astype(np.int64)
+
+
+def ranking_frame(labels: Sequence[str], scores: np.ndarray, k: Optional[int] = None) -> pd.DataFrame:
+    """
+    Ranking table (Alternatif, Score, Rank), best first
+
+    Args:
+        labels: Alternative names, aligned with scores
+        scores: Array of shape (n,)
+        k: Only return the best k rows; None for the full ranking
+
+    Returns:
+        pd.DataFrame: Ranking indexed by the original row position
+    """
+    s = np.asarray(scores, dtype=np.float64)
+    idx, ranks = top_k(s, len(s) if k is None else k)
+    return pd.DataFrame(
+        {"Alternatif": np.asarray(labels, dtype=object)[idx], "Score": s[idx], "Rank": ranks},
+        index=idx,
+    )
+
+
+def weighted_sum(utilities: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted sum of utility columns in a fixed order
+
+    Every score is accumulated column by column with elementwise
+    operations, so a row gets the same bits whether it is scored alone,
+    in a chunk or in the whole table (BLAS matrix products do not
+    guarantee this). Equal alternatives therefore stay exactly tied in
+    every entry point that ranks with this function.
+
+    Args:
+        utilities: Array of shape (n, m)
+        weights: Weights of shape (m,), or (s, m) for s weight scenarios
+
+    Returns:
+        np.ndarray: Scores of shape (n,), or (s, n)
+    """
+    U = np.asarray(utilities, dtype=np.float64)
+    w = np.asarray(weights, dtype=np.float64)
+    if U.shape[1] == 0:
+        return np.zeros(w.shape[:-1] + U.shape[:1])
+    # (s, 1) x (n,) -> (s, n) untuk skenario, skalar x (n,) untuk satu bobot
+    w = w[..., None]
+    total = w[..., 0, :] * U[:, 0]
+    for j in range(1, U.shape[1]):
+        total += w[..., j, :] * U[:, j]
+    return total
+
+
+def score(
+    matrix: np.ndarray,
+    weights: Sequence[float],
+    criteria: Sequence[Criterion],
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> SMARTResult:
+    """
+    Normalize and score alternatives
+
+    Args:
+        matrix: Raw values of shape (n, m)
+        weights: Criterion weights of shape (m,), e.g. AHP priorities
+        criteria: One Criterion per column
+        bounds: Optional precomputed (lower, upper) per column
+
+    Returns:
+        SMARTResult: Utilities and scores (ranks on demand)
+    """
+    w = np.asarray(weights, dtype=np.float64)
+    if w.shape != (len(criteria),):
+        raise ValueError(f"Jumlah bobot ({w.size}) tidak sesuai dengan {len(criteria)} kriteria")
+
+    U = normalize(matrix, criteria, bounds)
+    return SMARTResult(normalized=U, scores=weighted_sum(U, w))
@@ -0,0 +1,162 @@
+"""
+Streaming module for AHP-SMART application
+Two-pass chunked SMART ranking for alternative sets larger than memory
+"""
+
+import heapq
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import smart
+
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+PathLike = Union[str, Path]
+
+
+def iter_chunks(path: PathLike, columns: Sequence[str], chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Parquet file in chunks
+
+    Args:
+        path: Input file (.csv, .parquet or .pq)
+        columns: Columns to read
+        chunksize: Rows per chunk
+
+    Yields:
+        pd.DataFrame: Next chunk with the requested columns
+    """
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Membaca file Parquet membutuhkan paket pyarrow") from e
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=list(columns), chunksize=chunksize)
+
+
+def _values(chunk: pd.DataFrame, names: Sequence[str]) -> np.ndarray:
+    return chunk[list(names)].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+
+
+def scan_bounds(
+    path: PathLike,
+    criteria: Sequence[smart.Criterion],
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    First pass: per-criterion minimum/maximum over all chunks
+
+    Args:
+        path: Input file
+        criteria: Criteria spec; names select the columns
+        chunksize: Rows per chunk
+
+    Returns:
+        tuple: (lower, upper, row count)
+    """
+    names = [c.name for c in criteria]
+    lo = np.full(len(names), np.nan)
+    hi = np.full(len(names), np.nan)
+    rows = 0
+
+    for chunk in iter_chunks(path, names, chunksize):
+        if chunk.empty:
+            continue
+        c_lo, c_hi = smart.column_bounds(_values(chunk, names))
+        lo = np.fmin(lo, c_lo)
+        hi = np.fmax(hi, c_hi)
+        rows += len(chunk)
+
+    return lo, hi, rows
+
+
+def rank_stream(
+    path: PathLike,
+    weights: Sequence[float],
+    criteria: Sequence[smart.Criterion],
+    k: int = 10,
+    label_column: str = "Alternatif",
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    bounds: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> pd.DataFrame:
+    """
+    Rank alternatives in a file with flat memory use
+
+    The first pass collects the normalization bounds (skipped when
+    `bounds` is given), the second scores each chunk against those global
+    bounds and keeps only the best `k` rows in a heap. Scores come from
+    smart.weighted_sum, so they do not depend on the chunk size; ties keep
+    the row that appears first in the file, and ranks follow
+    `method="min"`, so the result equals the top of the full in-memory
+    ranking. `k` below 1 gives an empty table.
+
+    Args:
+        path: Input file (.csv, .parquet or .pq)
+        weights: Criterion weights (AHP priorities)
+        criteria: Criteria spec; names select the columns
+        k: Number of top alternatives to keep
+        label_column: Column holding the alternative name
+        chunksize: Rows per chunk
+        bounds: Optional precomputed (lower, upper) per criterion
+
+    Returns:
+        pd.DataFrame: Columns Alternatif, Score, Rank for the top k rows
+    """
+    names = [c.name for c in criteria]
+    w = np.asarray(weights, dtype=np.float64)
+    k = int(k)
+    if k < 1:
+        return pd.DataFrame({
+            "Alternatif": pd.Series(dtype=object),
+            "Score": pd.Series(dtype=np.float64),
+            "Rank": pd.Series(dtype=np.int64),
+        })
+    if bounds is None:
+        lo, hi, _ = scan_bounds(path, criteria, chunksize)
+        bounds = (lo, hi)
+
+    # min-heap of (score, -row, label): the root is the weakest kept row;
+    # on equal scores the later row (smaller -row) is the weaker one
+    heap: List[Tuple[float, int, str]] = []
+    offset = 0
+
+    for chunk in iter_chunks(path, [label_column, *names], chunksize):
+        n = len(chunk)
+        if n == 0:
+            continue
+        scores = smart.weighted_sum(smart.normalize(_values(chunk, names), criteria, bounds), w)
+        scores[np.isnan(scores)] = -np.inf
+
+        # hanya baris yang bisa masuk top-k yang diproses satu per satu
+        threshold = heap[0][0] if len(heap) >= k else -np.inf
+        if n > k:
+            threshold = max(threshold, np.partition(scores, n - k)[n - k])
+        candidates = np.flatnonzero(scores >= threshold)
+
+        labels = chunk[label_column].to_numpy()
+        for i in candidates:
+            item = (float(scores[i]), -(offset + int(i)), labels[i])
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        offset += n
+
+    top = sorted(heap, reverse=True)
+    scores = np.array([t[0] for t in top], dtype=np.float64)
+    result = pd.DataFrame({
+        "Alternatif": [t[2] for t in top],
+        # skor yang tidak bisa dihitung dilaporkan NaN, seperti smart.ranking_frame
+        "Score": np.where(np.isneginf(scores), np.nan, scores),
+    })
+    result["Rank"] = smart.rank_descending(scores)
+    return result
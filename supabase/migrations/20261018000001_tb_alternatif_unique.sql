@@ -0,0 +1,9 @@
+-- Kunci unik untuk upsert data penilaian (on_conflict = "Alternatif").
+-- Hapus duplikat lama terlebih dahulu, simpan baris dengan id terkecil.
+delete from public.tb_alternatif a
+using public.tb_alternatif b
+where a."Alternatif" = b."Alternatif"
+  and a.id > b.id;
+
+alter table public.tb_alternatif
+  add constraint tb_alternatif_alternatif_key unique ("Alternatif");
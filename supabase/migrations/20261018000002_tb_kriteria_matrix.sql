@@ -0,0 +1,45 @@
+-- Matriks perbandingan disimpan per baris sebagai array, sehingga jumlah
+-- kriteria tidak lagi dibatasi kolom k1..k5.
+alter table public.tb_kriteria
+  add column if not exists urutan integer,
+  add column if not exists nilai double precision[];
+
+alter table public.tb_kriteria
+  alter column k1 drop not null,
+  alter column k2 drop not null,
+  alter column k3 drop not null,
+  alter column k4 drop not null,
+  alter column k5 drop not null;
+
+-- Migrasi data lama dari kolom k1..k5
+with ordered as (
+  select id, row_number() over (order by id) as rn
+  from public.tb_kriteria
+)
+update public.tb_kriteria t
+set urutan = o.rn,
+    nilai = array[t.k1, t.k2, t.k3, t.k4, t.k5]::double precision[]
+from ordered o
+where t.id = o.id and t.nilai is null;
+
+-- Ganti seluruh matriks dalam satu transaksi: pembaca lain tetap melihat
+-- matriks lama sampai fungsi selesai, tidak pernah tabel kosong.
+create or replace function public.simpan_kriteria(p_kriteria text[], p_nilai jsonb)
+returns void
+language plpgsql
+as $$
+begin
+  if coalesce(array_length(p_kriteria, 1), 0) <> jsonb_array_length(p_nilai) then
+    raise exception 'Jumlah baris matriks (%) tidak sesuai dengan jumlah kriteria (%)',
+      jsonb_array_length(p_nilai), coalesce(array_length(p_kriteria, 1), 0);
+  end if;
+
+  delete from public.tb_kriteria where true;
+
+  insert into public.tb_kriteria (kriteria, urutan, nilai)
+  select k.kriteria,
+         k.urutan,
+         array(select jsonb_array_elements_text(p_nilai -> (k.urutan::int - 1))::double precision)
+  from unnest(p_kriteria) with ordinality as k(kriteria, urutan);
+end;
+$$;
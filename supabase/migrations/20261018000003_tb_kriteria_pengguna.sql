@@ -0,0 +1,22 @@
+-- Matriks perbandingan berpasangan per pengguna untuk AHP kelompok.
+create table if not exists public.tb_kriteria_pengguna (
+  user_id uuid primary key references auth.users (id) on delete cascade,
+  email text,
+  kriteria text[] not null,
+  matriks jsonb not null,
+  cr double precision,
+  updated_at timestamptz not null default now()
+);
+
+alter table public.tb_kriteria_pengguna enable row level security;
+
+-- Semua pengguna terautentikasi boleh membaca untuk agregasi,
+-- tetapi hanya boleh menulis matriksnya sendiri.
+create policy "baca matriks penilai" on public.tb_kriteria_pengguna
+  for select to authenticated using (true);
+
+create policy "tulis matriks sendiri" on public.tb_kriteria_pengguna
+  for insert to authenticated with check (auth.uid() = user_id);
+
+create policy "ubah matriks sendiri" on public.tb_kriteria_pengguna
+  for update to authenticated using (auth.uid() = user_id) with check (auth.uid() = user_id);
@@ -0,0 +1,115 @@
+-- Data dipisahkan per workspace. Workspace pengguna diambil dari
+-- app_metadata.workspace_id pada token (diisi admin untuk organisasi dengan
+-- beberapa penilai); tanpa itu setiap pengguna memakai workspace pribadi
+-- dengan id = user id.
+create or replace function public.current_workspace()
+returns uuid
+language sql
+stable
+as $$
+  select coalesce(
+    nullif(auth.jwt() -> 'app_metadata' ->> 'workspace_id', '')::uuid,
+    auth.uid()
+  );
+$$;
+
+alter table public.tb_kriteria
+  add column if not exists workspace_id uuid default public.current_workspace();
+alter table public.tb_alternatif
+  add column if not exists workspace_id uuid default public.current_workspace();
+alter table public.tb_kriteria_pengguna
+  add column if not exists workspace_id uuid default public.current_workspace();
+
+-- Baris lama tidak memiliki pemilik dan tidak terlihat oleh siapa pun sampai
+-- diklaim, misalnya:
+--   update public.tb_kriteria set workspace_id = '<uuid>' where workspace_id is null;
+--   update public.tb_alternatif set workspace_id = '<uuid>' where workspace_id is null;
+update public.tb_kriteria_pengguna set workspace_id = user_id where workspace_id is null;
+
+-- Indeks komposit diawali workspace_id: setiap query (keyset per id, urutan
+-- kriteria, hitung baris, upsert per nama) hanya menyentuh baris workspace-nya.
+create index if not exists tb_kriteria_workspace_urutan_idx
+  on public.tb_kriteria (workspace_id, urutan, id);
+
+create index if not exists tb_alternatif_workspace_id_idx
+  on public.tb_alternatif (workspace_id, id);
+
+-- Nama alternatif unik per workspace (on_conflict = "workspace_id,Alternatif")
+alter table public.tb_alternatif
+  drop constraint if exists tb_alternatif_alternatif_key;
+alter table public.tb_alternatif
+  add constraint tb_alternatif_workspace_alternatif_key unique (workspace_id, "Alternatif");
+
+-- Satu matriks per pengguna per workspace (on_conflict = "workspace_id,user_id")
+alter table public.tb_kriteria_pengguna
+  drop constraint if exists tb_kriteria_pengguna_pkey;
+alter table public.tb_kriteria_pengguna
+  alter column workspace_id set not null,
+  add constraint tb_kriteria_pengguna_pkey primary key (workspace_id, user_id);
+
+-- Row-level security: hanya baris workspace sendiri yang dapat dibaca dan ditulis
+alter table public.tb_kriteria enable row level security;
+alter table public.tb_alternatif enable row level security;
+
+create policy "data kriteria workspace" on public.tb_kriteria
+  for all to authenticated
+  using (workspace_id = public.current_workspace())
+  with check (workspace_id = public.current_workspace());
+
+create policy "data alternatif workspace" on public.tb_alternatif
+  for all to authenticated
+  using (workspace_id = public.current_workspace())
+  with check (workspace_id = public.current_workspace());
+
+drop policy if exists "baca matriks penilai" on public.tb_kriteria_pengguna;
+drop policy if exists "tulis matriks sendiri" on public.tb_kriteria_pengguna;
+drop policy if exists "ubah matriks sendiri" on public.tb_kriteria_pengguna;
+
+create policy "baca matriks penilai workspace" on public.tb_kriteria_pengguna
+  for select to authenticated using (workspace_id = public.current_workspace());
+
+create policy "tulis matriks sendiri" on public.tb_kriteria_pengguna
+  for insert to authenticated
+  with check (auth.uid() = user_id and workspace_id = public.current_workspace());
+
+create policy "ubah matriks sendiri" on public.tb_kriteria_pengguna
+  for update to authenticated
+  using (auth.uid() = user_id and workspace_id = public.current_workspace())
+  with check (auth.uid() = user_id and workspace_id = public.current_workspace());
+
+-- Simpan matriks hanya untuk workspace pemanggil. Kunci per workspace membuat
+-- penyimpanan bersamaan berjalan berurutan alih-alih saling menimpa sebagian.
+drop function if exists public.simpan_kriteria(text[], jsonb);
+
+create or replace function public.simpan_kriteria(
+  p_kriteria text[],
+  p_nilai jsonb,
+  p_workspace uuid default null
+)
+returns void
+language plpgsql
+as $$
+declare
+  v_workspace uuid := coalesce(p_workspace, public.current_workspace());
+begin
+  if v_workspace is null or v_workspace is distinct from public.current_workspace() then
+    raise exception 'Workspace % tidak dapat diakses', v_workspace;
+  end if;
+
+  if coalesce(array_length(p_kriteria, 1), 0) <> jsonb_array_length(p_nilai) then
+    raise exception 'Jumlah baris matriks (%) tidak sesuai dengan jumlah kriteria (%)',
+      jsonb_array_length(p_nilai), coalesce(array_length(p_kriteria, 1), 0);
+  end if;
+
+  perform pg_advisory_xact_lock(hashtextextended(v_workspace::text, 0));
+
+  delete from public.tb_kriteria where workspace_id = v_workspace;
+
+  insert into public.tb_kriteria (workspace_id, kriteria, urutan, nilai)
+  select v_workspace,
+         k.kriteria,
+         k.urutan,
+         array(select jsonb_array_elements_text(p_nilai -> (k.urutan::int - 1))::double precision)
+  from unnest(p_kriteria) with ordinality as k(kriteria, urutan);
+end;
+$$;
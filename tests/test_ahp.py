@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+import ahp
+
+# contoh klasik Saaty: bobot dan CR sudah diketahui
+SAATY = np.array([
+    [1.0, 3.0, 5.0],
+    [1 / 3, 1.0, 3.0],
+    [1 / 5, 1 / 3, 1.0],
+])
+
+
+def _consistent(w):
+    w = np.asarray(w, dtype=float)
+    return w[:, None] / w[None, :]
+
+
+def _old_mean_weights(M):
+    # perhitungan halaman Data Kriteria sebelum modul ahp
+    norm = M / M.sum(axis=0)
+    return norm.mean(axis=1)
+
+
+def test_consistent_matrix_recovers_weights():
+    w = np.array([0.41, 0.2, 0.07, 0.16, 0.16])
+    for method in ahp.WEIGHT_METHODS:
+        result = ahp.evaluate(_consistent(w), method=method)
+        np.testing.assert_allclose(result.weights, w, rtol=1e-12)
+        assert result.lambda_max == pytest.approx(5.0)
+        assert result.cr == pytest.approx(0.0, abs=1e-12)
+        assert result.is_consistent
+
+
+def test_saaty_example():
+    result = ahp.evaluate(SAATY, method="eigenvector")
+    np.testing.assert_allclose(result.weights, [0.6370, 0.2583, 0.1047], atol=5e-5)
+    assert result.lambda_max == pytest.approx(3.0385, abs=5e-5)
+    assert result.ci == pytest.approx(0.0193, abs=5e-5)
+    assert result.cr == pytest.approx(0.0332, abs=5e-5)
+
+
+def test_eigenvector_matches_numpy():
+    rng = np.random.default_rng(3)
+    A = rng.choice([1, 2, 3, 5, 7, 9, 1 / 3, 1 / 5], size=(6, 6))
+    M = np.triu(A, 1) + np.triu(1.0 / A, 1).T + np.eye(6)
+
+    vals, vecs = np.linalg.eig(M)
+    principal = np.abs(vecs[:, np.argmax(vals.real)].real)
+    result = ahp.evaluate(M, method="eigenvector")
+    np.testing.assert_allclose(result.weights, principal / principal.sum(), rtol=1e-9)
+    assert result.lambda_max == pytest.approx(vals.real.max(), rel=1e-9)
+    assert result.cr == pytest.approx((vals.real.max() - 6) / 5 / ahp.random_index(6), rel=1e-8)
+
+
+def test_mean_method_matches_old_page():
+    rng = np.random.default_rng(11)
+    for n in (2, 3, 5, 8):
+        M = np.exp(rng.normal(size=(n, n)))
+        np.testing.assert_allclose(ahp.evaluate(M, method="mean").weights, _old_mean_weights(M), rtol=1e-14)
+
+
+def test_default_method_is_mean():
+    assert ahp.DEFAULT_METHOD == "mean"
+    np.testing.assert_array_equal(ahp.evaluate(SAATY).weights, ahp.evaluate(SAATY, method="mean").weights)
+
+
+def test_stack_matches_single_matrices():
+    rng = np.random.default_rng(5)
+    stack = np.exp(rng.normal(size=(20, 4, 4)))
+    for method in ahp.WEIGHT_METHODS:
+        batch = ahp.evaluate(stack, method=method)
+        for i, M in enumerate(stack):
+            single = ahp.evaluate(M, method=method)
+            # tumpukan diiterasi sampai semua matriks konvergen: beda hanya di bawah toleransi
+            np.testing.assert_allclose(batch.weights[i], single.weights, rtol=1e-9)
+            assert batch.cr[i] == pytest.approx(single.cr, rel=1e-9, abs=1e-12)
+
+
+def test_empty_stack():
+    result = ahp.evaluate(np.ones((0, 4, 4)), method="eigenvector")
+    assert result.weights.shape == (0, 4)
+    assert result.cr.shape == (0,)
+
+
+def test_small_matrices_are_consistent():
+    result = ahp.evaluate([[1.0, 4.0], [0.25, 1.0]])
+    assert result.cr == 0.0
+    np.testing.assert_allclose(result.weights, [0.8, 0.2])
+
+
+@pytest.mark.parametrize("matrix", [np.ones((2, 3)), np.ones((0, 0)), [[1.0, 0.0], [1.0, 1.0]], [[1.0, np.nan], [1.0, 1.0]]])
+def test_invalid_matrix(matrix):
+    with pytest.raises(ValueError):
+        ahp.evaluate(matrix)
+
+
+def test_random_index():
+    assert ahp.random_index(3) == 0.58
+    assert ahp.random_index(5) == 1.12
+    assert ahp.random_index(20) == pytest.approx((1.7699 * 20 - 4.3513) / 19)
+    with pytest.raises(ValueError):
+        ahp.random_index(0)
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import smart
+from cache import ResultCache, TableCache
+
+key = ResultCache.key
+
+
+@pytest.mark.parametrize("a, b", [
+    # batas antar string tidak boleh bisa digeser
+    ((["ab", "c"],), (["a", "bc"],)),
+    ((["a\x1fb"],), (["a", "b"],)),
+    (("a\x1fb",), ("a", "b")),
+    (("ab", "c"), ("a", "bc")),
+    # tipe yang berbeda dengan repr yang mirip
+    ((1,), ("1",)),
+    ((1,), (1.0,)),
+    ((None,), ("None",)),
+    ((["1", "2"],), ([1, 2],)),
+    # array: dtype dan bentuk ikut dalam kunci
+    ((np.zeros(4),), (np.zeros((2, 2)),)),
+    ((np.zeros(2, dtype=np.float64),), (np.zeros(4, dtype=np.float32),)),
+    ((np.array(["ab", "c"], dtype=object),), (np.array(["a", "bc"], dtype=object),)),
+    # bagian yang berbeda jumlahnya
+    (([1, 2], 3), ([1, 2, 3],)),
+    ((smart.Criterion("Harga", cost=True),), (smart.Criterion("Harga"),)),
+])
+def test_different_inputs_never_collide(a, b):
+    assert key("ns", *a) != key("ns", *b)
+
+
+def test_equal_inputs_share_a_key():
+    U = np.arange(12.0).reshape(3, 4)
+    assert key("smart", U, ["a", "b"], 0.5) == key("smart", U.copy(), ("a", "b"), 0.5)
+    # urutan memori tidak berpengaruh, hanya isi
+    assert key("x", np.asfortranarray(U)) == key("x", U)
+    assert key("ahp", U) != key("smart", U)
+
+
+def test_result_cache_computes_once():
+    results = ResultCache(max_bytes=10_000)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.ones(10)
+
+    k = key("t", 1)
+    first = results.get_or_compute(k, compute)
+    assert results.get_or_compute(k, compute) is first
+    assert len(calls) == 1
+    assert (results.hits, results.misses) == (1, 1)
+
+
+def test_result_cache_is_bounded_by_size():
+    results = ResultCache(max_bytes=8 * 100)
+    for i in range(5):
+        results.get_or_compute(key("t", i), lambda: np.zeros(40))
+    assert results.stats()["bytes"] <= 8 * 100
+    # hasil yang lebih besar dari batas tidak disimpan sama sekali
+    results.get_or_compute(key("besar"), lambda: np.zeros(1_000))
+    assert results.stats()["bytes"] <= 8 * 100
+
+
+def test_result_cache_directory_is_shared(tmp_path):
+    k = key("t", "disk")
+    ResultCache(directory=str(tmp_path)).get_or_compute(k, lambda: np.arange(3))
+    other = ResultCache(directory=str(tmp_path))
+    np.testing.assert_array_equal(other.get_or_compute(k, lambda: pytest.fail("dihitung ulang")), np.arange(3))
+    assert other.disk_hits == 1
+
+
+def test_table_cache_invalidation_and_ttl(monkeypatch):
+    tables = TableCache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [{"id": len(loads)}]
+
+    assert tables.get_or_load("tb", "q", loader) == [{"id": 1}]
+    assert tables.get_or_load("tb", "q", loader) == [{"id": 1}]
+    tables.invalidate("tb")
+    assert tables.get_or_load("tb", "q", loader) == [{"id": 2}]
+
+    now = [1_000.0]
+    monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+    tables.get_or_load("tb", "ttl", loader, ttl=30)
+    now[0] += 10
+    assert tables.get_or_load("tb", "ttl", loader, ttl=30) == [{"id": 3}]
+    now[0] += 30
+    assert tables.get_or_load("tb", "ttl", loader, ttl=30) == [{"id": 4}]
+
+
+def test_table_cache_skips_results_written_during_load():
+    tables = TableCache()
+
+    def loader():
+        # tulisan lain selama query berjalan: hasilnya sudah usang
+        tables.invalidate("tb")
+        return "lama"
+
+    tables.get_or_load("tb", "q", loader)
+    assert tables.get_or_load("tb", "q", lambda: "baru") == "baru"
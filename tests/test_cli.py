@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ahp
+import cli
+import smart
+
+LABELS = ["Harga", "Kualitas", "Pengiriman", "Fleksibilitas", "Pelayanan"]
+MATRIX = [
+    [1, 3, 5, 3, 3],
+    [1 / 3, 1, 3, 1, 1],
+    [1 / 5, 1 / 3, 1, 1 / 3, 1 / 3],
+    [1 / 3, 1, 3, 1, 1],
+    [1 / 3, 1, 3, 1, 1],
+]
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    kriteria = pd.DataFrame(MATRIX, index=LABELS, columns=LABELS)
+    # hanya segitiga atas yang diisi: sisanya diisi kebalikannya
+    kriteria = kriteria.where(np.triu(np.ones((5, 5), dtype=bool)), 0)
+    kriteria.to_csv(tmp_path / "kriteria.csv")
+
+    rng = np.random.default_rng(6)
+    alternatif = pd.DataFrame({"Alternatif": [f"A{i}" for i in range(400)]})
+    for name in LABELS:
+        alternatif[name] = rng.integers(1, 6, 400)
+    alternatif.to_csv(tmp_path / "alternatif.csv", index=False)
+    return tmp_path
+
+
+def test_read_matrix_fills_reciprocals(inputs):
+    matrix = cli.read_matrix(str(inputs / "kriteria.csv"))
+    assert matrix.labels == LABELS
+    np.testing.assert_allclose(matrix.values, MATRIX, rtol=1e-15)
+
+
+def test_ranking_uses_app_weights(inputs):
+    matrix = cli.read_matrix(str(inputs / "kriteria.csv"))
+    alternatif = pd.read_csv(inputs / "alternatif.csv")
+    hasil_ahp, ranking = cli.evaluate(matrix, alternatif, ahp.DEFAULT_METHOD, sorted(smart.COST_CRITERIA))
+
+    weights = [round(w, cli.WEIGHT_DECIMALS) for w in ahp.evaluate(MATRIX, method="mean").weights]
+    scores = smart.score(alternatif[LABELS].to_numpy(dtype=float), weights, smart.DEFAULT_CRITERIA).scores
+    pd.testing.assert_frame_equal(ranking, smart.ranking_frame(alternatif["Alternatif"], scores))
+    assert hasil_ahp.is_consistent
+
+
+@pytest.mark.parametrize("method", ahp.WEIGHT_METHODS)
+def test_top_streams_the_head_of_the_full_ranking(inputs, method):
+    full, top = inputs / "full.csv", inputs / "top.csv"
+    args = ["--method", method, "--workers", "1"]
+    assert cli.main(["--job", str(inputs / "kriteria.csv"), str(inputs / "alternatif.csv"), str(full), *args]) == 0
+    assert cli.main(["--job", str(inputs / "kriteria.csv"), str(inputs / "alternatif.csv"), str(top), "--top", "25", *args]) == 0
+    pd.testing.assert_frame_equal(pd.read_csv(top), pd.read_csv(full).head(25))
+
+
+@pytest.mark.parametrize("value", ["0", "-3", "x"])
+def test_top_must_be_positive(value, capsys):
+    with pytest.raises(SystemExit) as e:
+        cli.main(["--job", "a.csv", "b.csv", "c.csv", "--top", value])
+    assert e.value.code == 2
+    assert "--top" in capsys.readouterr().err
+
+
+def test_failed_job_is_reported(inputs, capsys):
+    rc = cli.main(["--job", str(inputs / "tidak_ada.csv"), str(inputs / "alternatif.csv"), str(inputs / "out.csv")])
+    assert rc == 1
+    assert "GAGAL" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import db
+import importer
+from benchmarks.fake_supabase import FakeSupabase
+
+CSV = """Nama Alternatif;Harga;Kualitas;K3;Pelayanan
+Toko A;12000;4;2;5
+Toko B;9,5;abc;3;4
+  ;1;1;1;1
+Toko C;15000;;1;
+Toko A;11000;5;2;5
+"""
+
+
+def _validation():
+    return importer.validate(importer.read_table(io.BytesIO(CSV.encode()), "data.csv"))
+
+
+def test_validate_reports_bad_cells():
+    v = _validation()
+    assert v.total == 5
+    assert v.columns == ("Alternatif", "Harga", "Kualitas", "Pengiriman", "Pelayanan")
+    assert v.missing == ("Fleksibilitas",)
+    assert v.rows["Alternatif"].tolist() == ["Toko C", "Toko A"]
+
+    # baris file dihitung dari 2 (baris 1 adalah header)
+    errors = v.errors[["Baris", "Kolom", "Masalah"]].values.tolist()
+    assert errors == [
+        [2, "Alternatif", "Duplikat, diganti baris berikutnya"],
+        [3, "Kualitas", "Bukan angka"],
+        [4, "Alternatif", "Nama alternatif kosong"],
+    ]
+
+
+def test_validate_keeps_blank_cells_empty():
+    rows = _validation().rows.set_index("Alternatif")
+    assert np.isnan(rows.loc["Toko C", "Kualitas"])
+    assert np.isnan(rows.loc["Toko C", "Pelayanan"])
+    assert rows.loc["Toko A", "Harga"] == 11000
+
+
+def test_write_leaves_blank_and_missing_columns_unchanged():
+    client = FakeSupabase({"tb_alternatif": [
+        {"id": 1, "Alternatif": "Toko C", "k1": 1, "k2": 3, "k3": 3, "k4": 2, "k5": 4},
+    ]})
+    written = importer.write(client, _validation(), chunk_size=1)
+    assert written == 2
+
+    stored = {r["Alternatif"]: r for r in client.tables["tb_alternatif"]}
+    assert stored["Toko C"] == {"id": 1, "Alternatif": "Toko C", "k1": 15000, "k2": 3, "k3": 1, "k4": 2, "k5": 4}
+    assert stored["Toko A"]["k2"] == 5
+    assert "k4" not in stored["Toko A"]
+
+
+def test_write_resumes_from_start():
+    client = FakeSupabase()
+    progress = []
+    importer.write(client, _validation(), start=1, chunk_size=1, on_chunk=lambda n, total: progress.append((n, total)))
+    assert [r["Alternatif"] for r in client.tables["tb_alternatif"]] == ["Toko A"]
+    assert progress == [(2, 2)]
+
+
+def test_unknown_format_and_missing_name_column():
+    with pytest.raises(ValueError):
+        importer.read_table(io.BytesIO(b""), "data.txt")
+    with pytest.raises(ValueError):
+        importer.validate(pd.DataFrame({"Harga": ["1"]}))
+
+
+def test_save_penilaian_rejects_non_numeric_ratings():
+    snapshot = pd.DataFrame({
+        "Alternatif": ["A", "B"],
+        "Harga": [1.0, 2.0], "Kualitas": [3.0, 3.0], "Pengiriman": [1.0, 1.0],
+        "Fleksibilitas": [2.0, 2.0], "Pelayanan": [4.0, 4.0],
+    })
+    edited = snapshot.astype(object)
+    edited.loc[0, "Kualitas"] = "abc"
+    edited.loc[1, "Pelayanan"] = None
+    client = FakeSupabase()
+
+    with pytest.raises(db.InvalidCellsError) as e:
+        db.save_penilaian(client, snapshot, edited)
+    assert e.value.errors[["Baris", "Kolom"]].values.tolist() == [[0, "Kualitas"], [1, "Pelayanan"]]
+    assert client.request_count == 0
+
+    edited.loc[0, "Kualitas"] = "5"
+    edited.loc[1, "Pelayanan"] = 4.0
+    assert db.save_penilaian(client, snapshot, edited)["Alternatif"].tolist() == ["A"]
+    assert client.tables["tb_alternatif"][0]["k2"] == 5
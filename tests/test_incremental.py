@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import smart
+from incremental import IncrementalScorer
+
+CRITERIA = smart.DEFAULT_CRITERIA
+WEIGHTS = np.array([0.41, 0.2, 0.07, 0.16, 0.16])
+
+
+def _data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = [f"A{i}" for i in range(n)]
+    return labels, rng.integers(1, 6, (n, len(CRITERIA))).astype(float)
+
+
+def _assert_same_as_rebuild(scorer):
+    labels = list(scorer.labels)
+    X = scorer._X
+    rebuilt = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+    expected = smart.score(X, WEIGHTS, CRITERIA)
+
+    # skor identik per bit, bukan sekadar mendekati
+    np.testing.assert_array_equal(scorer.scores, rebuilt.scores)
+    np.testing.assert_array_equal(scorer.scores, expected.scores)
+    np.testing.assert_array_equal(scorer.normalized, expected.normalized)
+    pd.testing.assert_frame_equal(scorer.ranking_frame(), rebuilt.ranking_frame())
+    pd.testing.assert_frame_equal(scorer.ranking_frame(), smart.ranking_frame(labels, expected.scores))
+    for k in (1, 10, len(labels)):
+        idx, ranks = scorer.top(k)
+        expected_idx, expected_ranks = smart.top_k(expected.scores, k)
+        np.testing.assert_array_equal(idx, expected_idx)
+        np.testing.assert_array_equal(ranks, expected_ranks)
+    assert [scorer.rank(r) for r in range(len(labels))] == list(expected.ranks)
+
+
+def test_random_edits_match_rebuild():
+    labels, X = _data()
+    scorer = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+    rng = np.random.default_rng(1)
+
+    for step in range(300):
+        row = int(rng.integers(len(scorer)))
+        values = scorer._X[row].copy()
+        values[rng.integers(len(CRITERIA))] = rng.integers(0, 7)
+        scorer.update(row, values)
+        if step % 50 == 0:
+            _assert_same_as_rebuild(scorer)
+
+    _assert_same_as_rebuild(scorer)
+    # sebagian besar perubahan tidak menggeser batas: hanya satu baris yang dihitung ulang
+    assert scorer.row_updates > 0
+
+
+def test_upsert_appends_new_labels():
+    labels, X = _data(50)
+    scorer = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+
+    assert scorer.upsert("Baru", [3, 3, 3, 3, 3]) is False
+    scorer.upsert("A3", [1, 5, 1, 5, 5])
+    scorer.upsert("Ekstrem", [0, 9, 0, 9, 9])
+    assert scorer.row_of("Baru") == 50
+    assert len(scorer) == 52
+    _assert_same_as_rebuild(scorer)
+
+
+def test_upsert_many_small_and_bulk():
+    labels, X = _data(100)
+    small = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+    bulk = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+    rng = np.random.default_rng(2)
+
+    names = ["A1", "A2", "Baru"]
+    values = rng.integers(1, 6, (3, len(CRITERIA)))
+    small.upsert_many(names, values)
+    _assert_same_as_rebuild(small)
+
+    # batch besar, dengan label baru yang muncul dua kali: baris terakhir yang dipakai
+    names = [f"A{i}" for i in range(0, 100, 3)] + ["Baru", "Baru"]
+    values = rng.integers(1, 6, (len(names), len(CRITERIA)))
+    assert bulk.upsert_many(names, values) is True
+    np.testing.assert_array_equal(bulk._X[bulk.row_of("Baru")], values[-1])
+    assert len(bulk) == 101
+    _assert_same_as_rebuild(bulk)
+
+
+def test_copy_is_independent():
+    labels, X = _data(30)
+    scorer = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+    before = scorer.scores.copy()
+
+    other = scorer.copy()
+    other.update(0, [5, 1, 5, 1, 1])
+    other.upsert("Baru", [2, 2, 2, 2, 2])
+    np.testing.assert_array_equal(scorer.scores, before)
+    assert scorer.row_of("Baru") is None
+
+
+def test_wrong_shapes_are_rejected():
+    labels, X = _data(5)
+    with pytest.raises(ValueError):
+        IncrementalScorer(labels[:4], X, WEIGHTS, CRITERIA)
+    scorer = IncrementalScorer(labels, X, WEIGHTS, CRITERIA)
+    with pytest.raises(ValueError):
+        scorer.update(0, [1, 2])
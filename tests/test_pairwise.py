@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from pairwise import PairwiseMatrix, fill_reciprocals, format_values, parse_values
+
+LABELS = ["Harga", "Kualitas", "Pengiriman"]
+
+
+def _old_reciprocals(M):
+    # loop halaman Data Kriteria sebelum modul pairwise
+    M = M.copy()
+    n = len(M)
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                M[i, j] = 1.0
+            else:
+                a, b = M[i, j], M[j, i]
+                if a <= 0 and b > 0:
+                    M[i, j] = 1 / b
+                elif b <= 0 and a > 0:
+                    M[j, i] = 1 / a
+                elif a <= 0 and b <= 0:
+                    M[i, j] = 1.0
+    return M
+
+
+def test_reciprocals_fill_from_mirror():
+    M = np.array([
+        [1.0, 3.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [5.0, 0.0, 1.0],
+    ])
+    np.testing.assert_array_equal(fill_reciprocals(M), [
+        [1.0, 3.0, 0.2],
+        [1 / 3, 1.0, 1.0],
+        [5.0, 1.0, 1.0],
+    ])
+
+
+def test_reciprocals_match_old_loop():
+    rng = np.random.default_rng(2)
+    for n in (1, 2, 5, 9):
+        M = rng.choice([0.0, -1.0, 0.5, 1.0, 3.0, 7.0], size=(n, n))
+        np.testing.assert_array_equal(fill_reciprocals(M), _old_reciprocals(M))
+
+
+def test_filled_cells_are_kept():
+    M = np.array([[2.0, 3.0], [0.5, 4.0]])
+    # keduanya terisi: tidak ada yang ditimpa, kecuali diagonal
+    np.testing.assert_array_equal(fill_reciprocals(M), [[1.0, 3.0], [0.5, 1.0]])
+
+
+def test_parse_values_falls_back_to_one():
+    cells = [[" 3", "1/3", None], ["abc", 0.5, ""], ["2.5", "7", 4]]
+    np.testing.assert_array_equal(parse_values(cells), [[3.0, 1.0, 1.0], [1.0, 0.5, 1.0], [2.5, 7.0, 4.0]])
+
+
+def test_display_frame_round_trip():
+    M = PairwiseMatrix(LABELS, [[1, 3, 0.2], [1 / 3, 1, 7], [5, 1 / 7, 1]])
+    parsed = PairwiseMatrix.from_frame(M.to_display_frame())
+    assert parsed.labels == LABELS
+    np.testing.assert_array_equal(parsed.values, M.values)
+    np.testing.assert_array_equal(format_values(np.array([1.0, 2.5, 3.0])), ["1", "2.5", "3"])
+
+
+def test_from_records_nilai_and_legacy_columns():
+    records = [
+        {"nilai": [1, 3, 5]},
+        {"k1": None, "k2": 1, "k3": "abc"},
+    ]
+    M = PairwiseMatrix.from_records(records, LABELS)
+    # sel yang tidak tersimpan tetap kosong (0), diagonal tetap 1
+    np.testing.assert_array_equal(M.values, [[1, 3, 5], [0, 1, 0], [0, 0, 1]])
+    np.testing.assert_array_equal(PairwiseMatrix.from_records(None, LABELS).values, np.eye(3))
+
+
+def test_from_frame_ignores_extra_rows():
+    frame = pd.DataFrame([["1", "2"], ["0.5", "1"], ["9", "9"]], columns=["A", "B"])
+    np.testing.assert_array_equal(PairwiseMatrix.from_frame(frame).values, [[1, 2], [0.5, 1]])
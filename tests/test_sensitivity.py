@@ -0,0 +1,41 @@
+import numpy as np
+
+import sensitivity
+import smart
+
+
+def _tied_utilities():
+    # setiap pasangan baris identik: skor seri pada semua skenario
+    rng = np.random.default_rng(7)
+    U = rng.random((60, 5))
+    return np.repeat(U, 2, axis=0)
+
+
+def test_identical_scenarios_have_no_reversals():
+    U = _tied_utilities()
+    w = np.array([0.41, 0.2, 0.07, 0.16, 0.16])
+
+    for r in (1, 3, 10):
+        result = sensitivity.analyze(U, w, np.tile(w, (500, 1)), r=r)
+        assert not result.changed.any()
+        assert (result.top == result.baseline_top).all()
+
+
+def test_baseline_matches_smart_top_k():
+    U = _tied_utilities()
+    w = np.array([0.41, 0.2, 0.07, 0.16, 0.16])
+
+    result = sensitivity.analyze(U, w, w[None, :], r=5)
+    expected, _ = smart.top_k(smart.weighted_sum(U, w), 5)
+    np.testing.assert_array_equal(result.baseline_top, expected)
+
+
+def test_ties_at_cutoff_keep_lowest_index():
+    scores = np.array([[0.5, 0.9, 0.5, 0.5, np.nan, 0.9]])
+    np.testing.assert_array_equal(sensitivity.top_alternatives(scores, 3), [[1, 5, 0]])
+
+
+def test_reversal_detected():
+    U = np.array([[1.0, 0.0], [0.0, 1.0]])
+    result = sensitivity.analyze(U, [0.6, 0.4], np.array([[0.6, 0.4], [0.4, 0.6]]))
+    np.testing.assert_array_equal(result.changed, [False, True])
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import smart
+
+CRITERIA = [c.name for c in smart.DEFAULT_CRITERIA]
+WEIGHTS = np.array([0.41, 0.2, 0.07, 0.16, 0.16])
+
+
+def _alternatives(n=300, seed=1):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "Alternatif": [f"A{i}" for i in range(n)],
+        "Harga": rng.uniform(1_000, 50_000, n),
+        "Kualitas": rng.integers(1, 6, n).astype(float),
+        "Pengiriman": rng.uniform(1, 14, n),
+        "Fleksibilitas": rng.integers(1, 6, n).astype(float),
+        "Pelayanan": rng.integers(1, 6, n).astype(float),
+    })
+    # alternatif kembar harus tetap seri
+    return pd.concat([frame, frame.iloc[:20].assign(Alternatif=lambda f: f["Alternatif"] + "b")], ignore_index=True)
+
+
+def _old_pipeline(pen, weights):
+    # perhitungan halaman Data Perhitungan sebelum modul smart
+    norm = pen.copy()
+    for col in ["Harga", "Pengiriman"]:
+        v = norm[col].astype(float)
+        norm[col] = (v.max() - v) / (v.max() - v.min())
+    for col in ["Kualitas", "Fleksibilitas", "Pelayanan"]:
+        v = norm[col].astype(float)
+        norm[col] = (v - v.min()) / (v.max() - v.min())
+    scores = (norm[CRITERIA].values * np.array(weights)).sum(axis=1)
+    result = pd.DataFrame({"Alternatif": pen["Alternatif"], "Score": scores})
+    result["Rank"] = result["Score"].rank(ascending=False, method="min").astype(int)
+    return norm, result.sort_values("Score", ascending=False)
+
+
+def test_matches_old_pandas_pipeline():
+    pen = _alternatives()
+    norm, old = _old_pipeline(pen, WEIGHTS)
+
+    result = smart.score(pen[CRITERIA].to_numpy(), WEIGHTS, smart.DEFAULT_CRITERIA)
+    np.testing.assert_allclose(result.normalized, norm[CRITERIA].to_numpy(), rtol=0, atol=1e-15)
+    np.testing.assert_allclose(result.scores, pen.index.map(old["Score"]).to_numpy(), rtol=1e-14)
+
+    # sort_values lama tidak stabil; kini alternatif seri berurutan menurut baris
+    new = smart.ranking_frame(pen["Alternatif"], result.scores)
+    old = old.sort_index().sort_values("Score", ascending=False, kind="stable")
+    assert new["Alternatif"].tolist() == old["Alternatif"].tolist()
+    np.testing.assert_array_equal(new["Rank"].to_numpy(), old["Rank"].to_numpy())
+
+
+def test_rank_descending_matches_pandas():
+    rng = np.random.default_rng(4)
+    scores = rng.integers(0, 30, 500) / 7
+    expected = pd.Series(scores).rank(ascending=False, method="min").astype(int).to_numpy()
+    np.testing.assert_array_equal(smart.rank_descending(scores), expected)
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 37, 499, 500, 900])
+def test_top_k_matches_full_ranking(k):
+    rng = np.random.default_rng(k)
+    scores = rng.integers(0, 40, 500) / 3
+    scores[rng.choice(500, 10, replace=False)] = np.nan
+
+    idx, ranks = smart.top_k(scores, k)
+    full_idx, full_ranks = smart.top_k(scores, len(scores))
+    np.testing.assert_array_equal(idx, full_idx[:k])
+    np.testing.assert_array_equal(ranks, full_ranks[:k])
+
+    # urutan penuh: skor menurun, seri menurut baris, NaN di akhir
+    s = np.where(np.isnan(scores), -np.inf, scores)
+    np.testing.assert_array_equal(full_idx, np.lexsort((np.arange(500), -s)))
+    finite = ~np.isnan(scores[full_idx])
+    np.testing.assert_array_equal(full_ranks[finite], smart.rank_descending(scores)[full_idx][finite])
+
+
+def test_ranking_frame_top_is_head_of_full():
+    pen = _alternatives()
+    scores = smart.score(pen[CRITERIA].to_numpy(), WEIGHTS, smart.DEFAULT_CRITERIA).scores
+    full = smart.ranking_frame(pen["Alternatif"], scores)
+    pd.testing.assert_frame_equal(smart.ranking_frame(pen["Alternatif"], scores, 25), full.head(25))
+
+
+def test_weighted_sum_does_not_depend_on_slicing():
+    rng = np.random.default_rng(9)
+    U = rng.random((1000, 5))
+    full = smart.weighted_sum(U, WEIGHTS)
+    parts = np.concatenate([smart.weighted_sum(U[i:i + 77], WEIGHTS) for i in range(0, 1000, 77)])
+    np.testing.assert_array_equal(parts, full)
+    np.testing.assert_array_equal(smart.weighted_sum(U[[3]], WEIGHTS), full[[3]])
+
+    scenarios = np.vstack([WEIGHTS, WEIGHTS[::-1]])
+    np.testing.assert_array_equal(smart.weighted_sum(U, scenarios)[0], full)
+    np.testing.assert_array_equal(smart.weighted_sum(U, scenarios)[1], smart.weighted_sum(U, WEIGHTS[::-1]))
+
+
+def test_constant_column_and_fixed_bounds():
+    X = np.array([[1.0, 3.0], [2.0, 3.0], [4.0, 3.0]])
+    criteria = (smart.Criterion("Harga", cost=True), smart.Criterion("Kualitas"))
+    np.testing.assert_array_equal(smart.normalize(X, criteria), [[1.0, 1.0], [2 / 3, 1.0], [0.0, 1.0]])
+
+    likert = (smart.Criterion("Kualitas", lower=1, upper=5),)
+    np.testing.assert_array_equal(smart.normalize([[0.0], [3.0], [9.0]], likert), [[0.0], [0.5], [1.0]])
+
+
+def test_weight_count_must_match():
+    with pytest.raises(ValueError):
+        smart.score(np.ones((3, 5)), [0.5, 0.5], smart.DEFAULT_CRITERIA)
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import smart
+import streaming
+
+CRITERIA = smart.DEFAULT_CRITERIA
+NAMES = [c.name for c in CRITERIA]
+WEIGHTS = np.array([0.41, 0.2, 0.07, 0.16, 0.16])
+
+
+@pytest.fixture
+def alternatives_csv(tmp_path):
+    rng = np.random.default_rng(8)
+    n = 1_000
+    frame = pd.DataFrame({"Alternatif": [f"A{i}" for i in range(n)]})
+    for name in NAMES:
+        # nilai Likert: banyak skor seri, juga di batas top-k
+        frame[name] = rng.integers(1, 6, n)
+    frame.loc[rng.choice(n, 5, replace=False), "Kualitas"] = np.nan
+    path = tmp_path / "alternatif.csv"
+    frame.to_csv(path, index=False)
+    return path
+
+
+def _full_ranking(path, k):
+    # peringkat dalam memori dari isi file yang sama
+    frame = pd.read_csv(path)
+    scores = smart.score(frame[NAMES].to_numpy(dtype=float), WEIGHTS, CRITERIA).scores
+    return smart.ranking_frame(frame["Alternatif"], scores, k).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("chunksize", [13, 128, 1_000, 5_000])
+@pytest.mark.parametrize("k", [1, 10, 333, 1_000, 2_000])
+def test_stream_equals_full_ranking(alternatives_csv, chunksize, k):
+    result = streaming.rank_stream(alternatives_csv, WEIGHTS, CRITERIA, k=k, chunksize=chunksize)
+    pd.testing.assert_frame_equal(result, _full_ranking(alternatives_csv, k))
+
+
+def test_scan_bounds(alternatives_csv):
+    frame = pd.read_csv(alternatives_csv)
+    lo, hi, rows = streaming.scan_bounds(alternatives_csv, CRITERIA, chunksize=64)
+    np.testing.assert_array_equal(lo, frame[NAMES].min().to_numpy())
+    np.testing.assert_array_equal(hi, frame[NAMES].max().to_numpy())
+    assert rows == len(frame)
+
+
+@pytest.mark.parametrize("k", [0, -3])
+def test_non_positive_k_is_empty(alternatives_csv, k):
+    result = streaming.rank_stream(alternatives_csv, WEIGHTS, CRITERIA, k=k)
+    assert result.empty
+    assert list(result.columns) == ["Alternatif", "Score", "Rank"]